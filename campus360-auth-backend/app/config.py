@@ -11,11 +11,110 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     
+    # Storage behind auth, QR scans and history: "prisma" or "memory"
+    # (no database; data is lost on restart, other endpoints are unavailable)
+    STORAGE_BACKEND: str = "prisma"
+    
+    # Prisma pool: connections per process, seconds a query may wait for a
+    # connection and server-side statement timeout (0: Prisma/Postgres default)
+    DATABASE_CONNECTION_LIMIT: int = 0
+    DATABASE_POOL_TIMEOUT: int = 0
+    DATABASE_STATEMENT_TIMEOUT_MS: int = 0
+    
+    # Optional read replica for history, user listing and reports (falls
+    # back to DATABASE_URL while unreachable)
+    DATABASE_READ_URL: str = ""
+    DATABASE_READ_CONNECTION_LIMIT: int = 0
+    
     # JWT Configuration
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Access log partitioning and retention
+    # Enable only after migrations/005_partition_access_logs.sql has been applied
+    ACCESS_LOG_PARTITIONING: bool = False
+    ACCESS_LOG_PARTITION_MONTHS_AHEAD: int = 2
+    ACCESS_LOG_RETENTION_MONTHS: int = 12
+    ACCESS_LOG_ARCHIVE_DIR: str = "archives/access_logs"
+    
+    # Shared state for throttles, dedup windows and cache invalidation:
+    # "memory" (single worker), "shm" (workers on one host) or "redis"
+    STATE_BACKEND: str = "memory"
+    STATE_SHM_PATH: str = "/dev/shm/campus360-state.db"
+    STATE_REDIS_URL: str = "redis://localhost:6379/0"
+    
+    # Failed logins allowed per email and IP within the window (0: disabled).
+    # Behind a proxy, start uvicorn with --proxy-headers so the IP is the client's
+    LOGIN_MAX_FAILURES: int = 0
+    LOGIN_FAILURE_WINDOW_SECONDS: int = 900
+    
+    # Reject repeated scans of the same location by a user (0: disabled)
+    SCAN_DEDUP_SECONDS: int = 0
+    
+    # Seconds between refreshes of the "active now" locations cache
+    ACTIVE_LOCATIONS_REFRESH_SECONDS: int = 30
+    
+    # Write one delta row per scan instead of upserting the shared
+    # (day, location, status) rollup row, and fold the deltas into the
+    # rollups every ROLLUP_COMPACT_SECONDS (needs migrations/011_attendance_rollup_deltas.sql)
+    ROLLUP_DELTAS: bool = False
+    ROLLUP_COMPACT_SECONDS: float = 5.0
+    
+    # Background purge of deleted users: rows per statement and pause between statements
+    USER_PURGE_CHUNK_SIZE: int = 1000
+    USER_PURGE_PAUSE_SECONDS: float = 0.25
+    
+    # Serialize hot endpoints (/qr/scan-advanced, /qr/history) without
+    # revalidating their response models
+    FAST_JSON: bool = False
+    
+    # Per-request query accounting: log requests issuing more than
+    # QUERY_BUDGET queries (0: never) or one query shape QUERY_REPEAT_THRESHOLD
+    # times (N+1); QUERY_STATS_HEADER adds X-Query-Count/X-Query-Time-Ms
+    QUERY_BUDGET_ENABLED: bool = True
+    QUERY_BUDGET: int = 8
+    QUERY_REPEAT_THRESHOLD: int = 3
+    QUERY_STATS_HEADER: bool = False
+    
+    # Event outbox: scans and user changes are written to outbox_events with
+    # the change and POSTed in batches to the webhook URLs (comma-separated),
+    # signed with HMAC-SHA256 when a secret is set; failed batches are retried
+    # with exponential backoff until OUTBOX_MAX_ATTEMPTS
+    OUTBOX_ENABLED: bool = False
+    OUTBOX_WEBHOOK_URLS: str = ""
+    OUTBOX_WEBHOOK_SECRET: str = ""
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_SECONDS: float = 1.0
+    OUTBOX_TIMEOUT_SECONDS: float = 10.0
+    OUTBOX_BACKOFF_SECONDS: float = 2.0
+    OUTBOX_MAX_BACKOFF_SECONDS: float = 600.0
+    OUTBOX_MAX_ATTEMPTS: int = 20
+    OUTBOX_RETENTION_DAYS: int = 7
+    
+    # Bearer token required by /metrics (empty: no authentication)
+    METRICS_TOKEN: str = ""
+    
+    # On-demand profiling: admins send "X-Profile: 1", or a fraction of
+    # requests is sampled; profiles are saved as speedscope JSON files
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL: float = 0.001
+    PROFILING_DIR: str = "profiles"
+    PROFILING_KEEP: int = 200
+    
+    # Serve /health immediately and connect to the database in the background;
+    # other endpoints answer 503 until the connection and warm-up finish
+    BACKGROUND_STARTUP: bool = False
+    
+    # /health/ready: database probe timeout and queries allowed to wait for
+    # a pooled connection before the instance reports itself as not ready
+    READINESS_DB_TIMEOUT_SECONDS: float = 2.0
+    READINESS_MAX_WAITING_QUERIES: int = 20
+    
+    # Prefill caches and run the hot queries once before serving traffic
+    STARTUP_WARMUP: bool = True
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1 +1,45 @@
-# Dependencias (ej. get_db) irán aquí
+"""
+FastAPI dependencies for CAMPUS360
+Provides the storage repositories selected by STORAGE_BACKEND; tests and
+benchmarks swap them through app.dependency_overrides[get_storage]
+"""
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.repositories import Storage, create_memory_storage
+from app.repositories.prisma import create_prisma_storage
+from app.utils.database import prisma, prisma_read
+
+_storage: Optional[Storage] = None
+
+
+def get_storage() -> Storage:
+    """
+    Repositories for users, locations and access logs
+
+    "prisma" (default) uses the database clients; "memory" keeps
+    everything in process memory and loses it on restart.
+    """
+    global _storage
+    if _storage is None:
+        if settings.STORAGE_BACKEND == "memory":
+            _storage = create_memory_storage()
+        else:
+            _storage = create_prisma_storage(prisma, prisma_read)
+    return _storage
+
+
+def require_database() -> None:
+    """
+    Guard for routers that query Prisma directly instead of the repositories
+
+    Raises:
+        HTTPException: 503 with STORAGE_BACKEND=memory, where no database is connected
+    """
+    if settings.STORAGE_BACKEND == "memory":
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Not available with STORAGE_BACKEND=memory (requires the database)"
+        )
@@ -3,13 +3,98 @@ CAMPUS360 Authentication Module
 Main FastAPI application with Prisma ORM integration
 """
 from contextlib import asynccontextmanager
+import asyncio
 import os
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import admin, admin_users, auth, health, qr_access
-from app.utils.auth_utils import prisma
+from app.config import settings
+from app.routers import (
+    access_logs, admin, admin_users, attendance, auth, enrollments, health, locations,
+    metrics, profiles, qr_access, security
+)
+from app.services.attendance_rollup import run_compactor
+from app.services.locations import active_locations_cache
+from app.services.log_partitions import maintain_partitions
+from app.services.outbox import run_dispatcher
+from app.services.readiness import warm_up
+from app.services.user_import import shutdown_hash_pool
+from app.services.user_purge import resume_purge_jobs, stop_purge_jobs
+from app.utils.auth_utils import prisma, prisma_read
+from app.utils.cache import listen_for_invalidations
+from app.utils.metrics import MetricsMiddleware
+from app.utils.query_budget import QueryBudgetMiddleware
+from app.utils.startup import StartupGateMiddleware, startup_state
+from app.utils.state import close_state
+
+
+STARTUP_RETRY_SECONDS = 5
+
+
+async def start_services() -> list[asyncio.Task]:
+    """
+    Connect to the database and start background work
+
+    Returns:
+        Background tasks to cancel on shutdown (partition maintenance,
+        rollup compaction, outbox dispatcher)
+    """
+    # In-memory storage needs no database (endpoints outside the storage
+    # layer, such as reports and exports, are unavailable in this mode)
+    if settings.STORAGE_BACKEND == "memory":
+        print("⚠️ STORAGE_BACKEND=memory: data is kept in process memory and lost on restart")
+        startup_state.mark_ready()
+        return []
+    
+    await prisma.connect()
+    print("✅ Connected to database")
+    
+    # Read replica (if configured); falls back to the primary when unreachable
+    if prisma_read is not prisma:
+        await prisma_read.connect()
+    
+    # Pick up user purges interrupted by the previous shutdown
+    await resume_purge_jobs(prisma)
+    
+    # Prefill caches so the first requests after a deploy are not cold
+    if settings.STARTUP_WARMUP:
+        await warm_up(prisma)
+    
+    # Keep monthly access_logs partitions created ahead of time (background
+    # tasks are started last so a retried startup never duplicates them)
+    tasks = []
+    if settings.ACCESS_LOG_PARTITIONING:
+        tasks.append(asyncio.create_task(
+            maintain_partitions(prisma, settings.ACCESS_LOG_PARTITION_MONTHS_AHEAD)
+        ))
+    
+    # Fold per-scan rollup deltas into the daily rollups
+    if settings.ROLLUP_DELTAS:
+        tasks.append(asyncio.create_task(run_compactor(prisma, settings.ROLLUP_COMPACT_SECONDS)))
+    
+    # Deliver outbox events to the other CAMPUS360 modules
+    if settings.OUTBOX_ENABLED:
+        tasks.append(asyncio.create_task(run_dispatcher(prisma)))
+    
+    # Refresh the "active now" locations in the background
+    active_locations_cache.start()
+    
+    startup_state.mark_ready()
+    return tasks
+
+
+async def start_services_in_background() -> list[asyncio.Task]:
+    """Run start_services, retrying while the database is unreachable"""
+    while True:
+        try:
+            return await start_services()
+        except Exception as e:
+            startup_state.mark_failed(e)
+            print(f"⚠️ Startup failed, retrying in {STARTUP_RETRY_SECONDS}s: {e}")
+            if prisma.is_connected():
+                await prisma.disconnect()
+            await asyncio.sleep(STARTUP_RETRY_SECONDS)
 
 
 @asynccontextmanager
@@ -18,14 +103,36 @@ async def lifespan(app: FastAPI):
     Lifespan context manager for FastAPI application
     Handles Prisma client connection on startup and disconnection on shutdown
     """
-    # Startup: Connect to database
-    await prisma.connect()
-    print("✅ Connected to database")
+    # Apply cache invalidations made by other workers
+    invalidation_task = asyncio.create_task(listen_for_invalidations())
+    
+    # Startup: Connect to database (in the background with BACKGROUND_STARTUP)
+    startup_task = None
+    if settings.BACKGROUND_STARTUP:
+        startup_task = asyncio.create_task(start_services_in_background())
+    else:
+        background_tasks = await start_services()
     
     yield
     
-    # Shutdown: Disconnect from database
-    await prisma.disconnect()
+    # Shutdown: Stop background work and disconnect from database
+    if startup_task:
+        background_tasks = []
+        if startup_task.done():
+            background_tasks = startup_task.result()
+        else:
+            startup_task.cancel()
+    for task in background_tasks:
+        task.cancel()
+    invalidation_task.cancel()
+    active_locations_cache.stop()
+    await stop_purge_jobs()
+    shutdown_hash_pool()
+    await close_state()
+    if prisma_read is not prisma:
+        await prisma_read.disconnect()
+    if prisma.is_connected():
+        await prisma.disconnect()
     print("✅ Disconnected from database")
 
 
@@ -51,14 +158,39 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Response headers browsers must let the frontend read
+    expose_headers=["X-Next-Cursor", "X-Prev-Cursor", "X-Total-Count", "X-Cache-Age", "X-Purge-Job-Id"],
 )
 
+# Request latency and in-flight metrics (served at /metrics)
+app.add_middleware(MetricsMiddleware)
+
+# Count the queries of each request and log budget overruns and N+1 patterns
+if settings.QUERY_BUDGET_ENABLED:
+    app.add_middleware(QueryBudgetMiddleware)
+
+# Answer 503 (except /health) until the background startup has finished
+if settings.BACKGROUND_STARTUP:
+    app.add_middleware(StartupGateMiddleware)
+
+# On-demand request profiling (not installed at all when disabled)
+if settings.PROFILING_ENABLED:
+    from app.utils.profiling import ProfilerMiddleware
+    app.add_middleware(ProfilerMiddleware)
+
 # Include routers
 app.include_router(health.router)
+app.include_router(metrics.router)  # Prometheus metrics
+app.include_router(profiles.router)  # Saved request profiles
 app.include_router(auth.router)
 app.include_router(qr_access.router)
 app.include_router(admin.router)
+app.include_router(locations.router)  # Location catalogue
 app.include_router(admin_users.router)  # Admin user management
+app.include_router(attendance.router)  # Attendance reports
+app.include_router(access_logs.router)  # Access log exports
+app.include_router(security.router)  # GPS spoofing review
+app.include_router(enrollments.router)  # Enrollments and rosters
 
 
 @app.get("/", tags=["Root"])
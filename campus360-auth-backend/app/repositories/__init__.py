@@ -0,0 +1,17 @@
+"""
+Storage repositories for CAMPUS360
+Interfaces plus Prisma and in-memory implementations
+"""
+from app.repositories.base import (
+    AccessLogRepository, DuplicateKeyError, LocationRepository, Storage, UserRepository
+)
+from app.repositories.memory import create_memory_storage
+
+__all__ = [
+    "AccessLogRepository",
+    "DuplicateKeyError",
+    "LocationRepository",
+    "Storage",
+    "UserRepository",
+    "create_memory_storage",
+]
@@ -0,0 +1,147 @@
+"""
+Repository interfaces for CAMPUS360
+Storage-independent access to users, locations and access logs, so routers
+can run on Prisma or on the in-memory engine
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+# (timestamp, id) of an access log, as decoded from a history cursor
+LogKey = tuple[datetime, int]
+
+
+class DuplicateKeyError(Exception):
+    """A unique column (e.g., email, location_code) already holds the value"""
+
+
+class UserRepository(ABC):
+    """Users, including soft-deleted ones (callers check deleted_at)"""
+
+    @abstractmethod
+    async def get(self, user_id: str) -> Optional[Any]:
+        """User by ID, or None"""
+
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Optional[Any]:
+        """User by email, or None"""
+
+    @abstractmethod
+    async def create(self, data: dict) -> Any:
+        """
+        Insert a user
+
+        Raises:
+            DuplicateKeyError: If the email is taken
+        """
+
+
+class LocationRepository(ABC):
+    """Scannable locations"""
+
+    @abstractmethod
+    async def get(self, location_id: str) -> Optional[Any]:
+        """Location by ID, or None"""
+
+    @abstractmethod
+    async def create(self, data: dict) -> Any:
+        """
+        Insert a location
+
+        Raises:
+            DuplicateKeyError: If the location_code is taken
+        """
+
+    @abstractmethod
+    async def list_page(
+        self,
+        limit: int,
+        created_by: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        code_prefix: Optional[str] = None,
+        after: Optional[tuple[datetime, str]] = None
+    ) -> list:
+        """
+        A page of the location catalogue, ordered by (class_start, id)
+
+        Args:
+            limit: Maximum locations to return
+            created_by: Optional creator filter
+            date_from: Optional inclusive lower bound on class_start
+            date_to: Optional exclusive upper bound on class_start
+            code_prefix: Optional location_code prefix (case-sensitive)
+            after: Only locations after this (class_start, id)
+        """
+
+    @abstractmethod
+    async def list_running(self, since: datetime, until: datetime) -> list:
+        """Locations whose class ends after since and starts by until, ordered by (class_start, id)"""
+
+    @abstractmethod
+    async def update(self, location_id: str, data: dict) -> Optional[Any]:
+        """
+        Change some fields of a location
+
+        Returns:
+            The updated location, or None if it does not exist
+
+        Raises:
+            DuplicateKeyError: If the new location_code is taken
+        """
+
+    @abstractmethod
+    async def delete(self, location_id: str) -> None:
+        """Delete a location; its access logs are kept with location_id set to None"""
+
+
+class AccessLogRepository(ABC):
+    """Access logs and the attendance rollups derived from them"""
+
+    @abstractmethod
+    async def create(self, data: dict) -> Any:
+        """Insert a plain access log (legacy scans, not rolled up)"""
+
+    @abstractmethod
+    async def record_scan(self, data: dict) -> Any:
+        """Insert a validated scan and bump its daily rollup atomically"""
+
+    @abstractmethod
+    async def list_for_user(
+        self,
+        user_id: str,
+        limit: int,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        status: Optional[str] = None,
+        before: Optional[LogKey] = None,
+        after: Optional[LogKey] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> list:
+        """
+        A page of a user's access logs, newest first
+
+        Args:
+            user_id: Owner of the logs
+            limit: Maximum logs to return
+            date_from: Optional inclusive lower bound on timestamp
+            date_to: Optional exclusive upper bound on timestamp
+            status: Optional status filter
+            before: Only logs older than this (timestamp, id)
+            after: Only logs newer than this (timestamp, id); the page
+                holds the oldest such logs
+            fields: Columns the caller needs (others may be missing);
+                id and timestamp are always present
+
+        Returns:
+            Access logs ordered by (timestamp, id) descending
+        """
+
+
+@dataclass
+class Storage:
+    """The repositories used by the routers"""
+    users: UserRepository
+    locations: LocationRepository
+    access_logs: AccessLogRepository
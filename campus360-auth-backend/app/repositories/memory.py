@@ -0,0 +1,212 @@
+"""
+In-memory repositories for CAMPUS360
+Indexed, database-free storage with the same semantics as the Prisma
+repositories, for hermetic tests, benchmarks and offline kiosks
+"""
+import itertools
+import uuid
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.repositories.base import (
+    AccessLogRepository, DuplicateKeyError, LocationRepository, Storage, UserRepository
+)
+from app.utils.attendance import to_utc_naive
+
+
+class Record(SimpleNamespace):
+    """A stored row; attributes mirror the Prisma model's fields"""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class MemoryUserRepository(UserRepository):
+    """Users hashed by id and by email"""
+
+    def __init__(self):
+        self.by_id: dict[str, Record] = {}
+        self.by_email: dict[str, Record] = {}
+
+    async def get(self, user_id):
+        return self.by_id.get(user_id)
+
+    async def get_by_email(self, email):
+        return self.by_email.get(email)
+
+    async def create(self, data):
+        if data["email"] in self.by_email:
+            raise DuplicateKeyError(f"email {data['email']} already exists")
+        user = Record(**{
+            "id": str(uuid.uuid4()), "role": "student", "created_at": _now(), "deleted_at": None,
+            **data,
+        })
+        self.by_id[user.id] = user
+        self.by_email[user.email] = user
+        return user
+
+
+class MemoryLocationRepository(LocationRepository):
+    """
+    Locations hashed by id and by location_code
+
+    Catalogue pages scan every location: there are few of them next to
+    the access logs. Deleting a location detaches its logs and drops its
+    rollups, like the database's foreign keys.
+    """
+
+    def __init__(self, access_logs: "MemoryAccessLogRepository"):
+        self.by_id: dict[str, Record] = {}
+        self.by_code: dict[str, Record] = {}
+        self.access_logs = access_logs
+
+    async def get(self, location_id):
+        return self.by_id.get(location_id)
+
+    async def create(self, data):
+        if data["location_code"] in self.by_code:
+            raise DuplicateKeyError(f"location_code {data['location_code']} already exists")
+        location = Record(**{
+            "id": str(uuid.uuid4()), "location_name": None, "grace_period": 15, "created_at": _now(),
+            **data,
+        })
+        self.by_id[location.id] = location
+        self.by_code[location.location_code] = location
+        return location
+
+    async def list_page(
+        self, limit, created_by=None, date_from=None, date_to=None, code_prefix=None, after=None
+    ):
+        low = to_utc_naive(date_from)
+        high = to_utc_naive(date_to)
+        cursor = (to_utc_naive(after[0]), after[1]) if after else None
+        matches = []
+        for location in self.by_id.values():
+            key = (to_utc_naive(location.class_start), location.id)
+            if created_by and location.created_by != created_by:
+                continue
+            if low is not None and key[0] < low:
+                continue
+            if high is not None and key[0] >= high:
+                continue
+            if code_prefix and not location.location_code.startswith(code_prefix):
+                continue
+            if cursor and key <= cursor:
+                continue
+            matches.append((key, location))
+        matches.sort(key=lambda match: match[0])
+        return [location for _, location in matches[:limit]]
+
+    async def list_running(self, since, until):
+        since, until = to_utc_naive(since), to_utc_naive(until)
+        return sorted(
+            (
+                location for location in self.by_id.values()
+                if to_utc_naive(location.class_start) <= until and to_utc_naive(location.class_end) > since
+            ),
+            key=lambda location: (to_utc_naive(location.class_start), location.id)
+        )
+
+    async def update(self, location_id, data):
+        location = self.by_id.get(location_id)
+        if location is None:
+            return None
+        code = data.get("location_code", location.location_code)
+        if code != location.location_code:
+            if code in self.by_code:
+                raise DuplicateKeyError(f"location_code {code} already exists")
+            del self.by_code[location.location_code]
+            self.by_code[code] = location
+        for key, value in data.items():
+            setattr(location, key, value)
+        return location
+
+    async def delete(self, location_id):
+        location = self.by_id.pop(location_id, None)
+        if location is None:
+            return
+        del self.by_code[location.location_code]
+        self.access_logs.detach_location(location_id)
+
+
+class MemoryAccessLogRepository(AccessLogRepository):
+    """
+    Access logs with a sorted (timestamp, id) index per user
+
+    Keys are naive UTC like the database column, so range filters and
+    cursors are binary searches. Daily rollups are kept as counters.
+    """
+
+    def __init__(self):
+        self.by_id: dict[int, Record] = {}
+        self.user_index: dict[str, list[tuple[datetime, int]]] = defaultdict(list)
+        self.rollups: dict[tuple, int] = defaultdict(int)
+        self._ids = itertools.count(1)
+
+    async def create(self, data):
+        log = Record(**{
+            "id": next(self._ids), "timestamp": _now(), "location_id": None, "status": None,
+            "user_latitude": None, "user_longitude": None, "distance_meters": None,
+            **data,
+        })
+        # Stored as text, like the database column
+        log.status = getattr(log.status, "value", log.status)
+        self.by_id[log.id] = log
+        insort(self.user_index[log.user_id], (to_utc_naive(log.timestamp), log.id))
+        return log
+
+    def detach_location(self, location_id: str) -> None:
+        """Set location_id to None on a deleted location's logs and drop its rollups"""
+        for log in self.by_id.values():
+            if log.location_id == location_id:
+                log.location_id = None
+        for key in [key for key in self.rollups if key[1] == location_id]:
+            del self.rollups[key]
+
+    async def record_scan(self, data):
+        log = await self.create(data)
+        if log.location_id is not None and log.status is not None:
+            day = to_utc_naive(log.timestamp).date()
+            self.rollups[(day, log.location_id, log.status)] += 1
+        return log
+
+    async def list_for_user(
+        self, user_id, limit, date_from=None, date_to=None, status=None,
+        before=None, after=None, fields=None
+    ):
+        keys = self.user_index.get(user_id, [])
+        low, high = 0, len(keys)
+        # (t,) sorts before every (t, id), so it bounds on the timestamp alone
+        if date_from is not None:
+            low = bisect_left(keys, (to_utc_naive(date_from),))
+        if date_to is not None:
+            high = bisect_left(keys, (to_utc_naive(date_to),))
+        if before:
+            high = min(high, bisect_left(keys, (to_utc_naive(before[0]), before[1])))
+        if after:
+            low = max(low, bisect_right(keys, (to_utc_naive(after[0]), after[1])))
+
+        positions = range(low, high) if after else range(high - 1, low - 1, -1)
+        page = []
+        for position in positions:
+            log = self.by_id[keys[position][1]]
+            if status is None or log.status == status:
+                page.append(log)
+                if len(page) == limit:
+                    break
+        if after:
+            page.reverse()
+        return page
+
+
+def create_memory_storage() -> Storage:
+    """Empty in-memory repositories"""
+    access_logs = MemoryAccessLogRepository()
+    return Storage(
+        users=MemoryUserRepository(),
+        locations=MemoryLocationRepository(access_logs),
+        access_logs=access_logs,
+    )
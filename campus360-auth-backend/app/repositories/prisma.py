@@ -0,0 +1,155 @@
+"""
+Prisma repositories for CAMPUS360
+The production storage: PostgreSQL through the Prisma client, with history
+reads on the read client (replica when configured)
+"""
+from typing import Optional, Sequence
+
+from prisma.bases import BaseAccessLog
+from prisma.errors import UniqueViolationError
+
+from app.repositories.base import (
+    AccessLogRepository, DuplicateKeyError, LocationRepository, Storage, UserRepository
+)
+from app.schemas.schemas import AccessLogResponseAdvanced
+from app.services import attendance_rollup, outbox
+from app.services.access_log_export import build_export_filter
+from app.services.locations import build_location_filter
+from app.utils.attendance import to_utc_naive
+from app.utils.pagination import combine_where, keyset_where
+from app.utils.projection import partial_model
+
+
+class PrismaUserRepository(UserRepository):
+    def __init__(self, db):
+        self.db = db
+
+    async def get(self, user_id):
+        return await self.db.user.find_unique(where={"id": user_id})
+
+    async def get_by_email(self, email):
+        return await self.db.user.find_unique(where={"email": email})
+
+    async def create(self, data):
+        try:
+            return await self.db.user.create(data=data)
+        except UniqueViolationError as e:
+            raise DuplicateKeyError(str(e)) from e
+
+
+class PrismaLocationRepository(LocationRepository):
+    def __init__(self, db):
+        self.db = db
+
+    async def get(self, location_id):
+        return await self.db.location.find_unique(where={"id": location_id})
+
+    async def create(self, data):
+        try:
+            return await self.db.location.create(data=data)
+        except UniqueViolationError as e:
+            raise DuplicateKeyError(str(e)) from e
+
+    async def list_page(
+        self, limit, created_by=None, date_from=None, date_to=None, code_prefix=None, after=None
+    ):
+        where = build_location_filter(
+            created_by=created_by, date_from=date_from, date_to=date_to, code_prefix=code_prefix
+        )
+        if after:
+            where = combine_where(where, keyset_where("class_start", *after))
+        return await self.db.location.find_many(
+            where=where,
+            take=limit,
+            order=[{"class_start": "asc"}, {"id": "asc"}]
+        )
+
+    async def list_running(self, since, until):
+        return await self.db.location.find_many(
+            where={
+                "class_start": {"lte": to_utc_naive(until)},
+                "class_end": {"gt": to_utc_naive(since)},
+            },
+            order=[{"class_start": "asc"}, {"id": "asc"}]
+        )
+
+    async def update(self, location_id, data):
+        try:
+            return await self.db.location.update(where={"id": location_id}, data=data)
+        except UniqueViolationError as e:
+            raise DuplicateKeyError(str(e)) from e
+
+    async def delete(self, location_id):
+        await self.db.location.delete_many(where={"id": location_id})
+
+
+class PrismaAccessLogRepository(AccessLogRepository):
+    def __init__(self, db, read_db):
+        self.db = db
+        self.read_db = read_db
+
+    async def create(self, data):
+        async with outbox.transaction(self.db) as tx:
+            access_log = await tx.accesslog.create(data=data)
+            await self._publish(tx, access_log)
+        outbox.notify()
+        return access_log
+
+    async def record_scan(self, data):
+        async with self.db.tx() as tx:
+            access_log = await tx.accesslog.create(data=data)
+            await attendance_rollup.record_scan(tx, access_log)
+            await self._publish(tx, access_log)
+        outbox.notify()
+        return access_log
+
+    async def _publish(self, tx, access_log):
+        await outbox.enqueue(
+            tx, outbox.ACCESS_LOG_CREATED, access_log.user_id, outbox.access_log_payload(access_log)
+        )
+
+    async def list_for_user(
+        self, user_id, limit, date_from=None, date_to=None, status=None,
+        before=None, after=None, fields: Optional[Sequence[str]] = None
+    ):
+        logs = self.read_db.accesslog
+        if fields:
+            # Select only the requested columns, plus the cursor keys
+            logs = partial_model(
+                BaseAccessLog, AccessLogResponseAdvanced, tuple(fields), always=("id", "timestamp")
+            ).prisma(self.read_db)
+
+        where = build_export_filter(date_from=date_from, date_to=date_to, status=status, user_id=user_id)
+
+        if after:
+            # Walk forward from the cursor, then flip back to newest-first
+            page = await logs.find_many(
+                where=combine_where(where, keyset_where("timestamp", *after)),
+                order=[{"timestamp": "asc"}, {"id": "asc"}],
+                take=limit
+            )
+            page.reverse()
+            return page
+
+        if before:
+            where = combine_where(where, keyset_where("timestamp", *before, descending=True))
+        return await logs.find_many(
+            where=where,
+            order=[{"timestamp": "desc"}, {"id": "desc"}],
+            take=limit
+        )
+
+
+def create_prisma_storage(db, read_db=None) -> Storage:
+    """
+    Repositories on Prisma clients
+
+    Args:
+        db: Primary client (writes and consistent reads)
+        read_db: Client for history reads (defaults to db)
+    """
+    return Storage(
+        users=PrismaUserRepository(db),
+        locations=PrismaLocationRepository(db),
+        access_logs=PrismaAccessLogRepository(db, read_db or db),
+    )
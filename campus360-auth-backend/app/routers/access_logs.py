@@ -0,0 +1,67 @@
+"""
+Access log administration endpoints for CAMPUS360
+Handles bulk exports of access logs for auditing
+"""
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.dependencies import require_database
+from app.services.access_log_export import EXPORT_FORMATS, build_export_filter, stream_export
+from app.utils.attendance import AttendanceStatus
+from app.utils.auth_utils import get_current_user, prisma_read
+from app.utils.authorization import require_admin
+
+router = APIRouter(
+    prefix="/admin/access-logs",
+    tags=["Admin - Access Logs"],
+    dependencies=[Depends(require_database)]
+)
+
+
+@router.get("/export")
+async def export_access_logs(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    location_id: Optional[str] = None,
+    status: Optional[AttendanceStatus] = None,
+    user_id: Optional[str] = None,
+    current_user = Depends(get_current_user)
+):
+    """
+    Export access logs as CSV or NDJSON
+
+    **Only accessible by admin users**
+
+    Rows are streamed in (timestamp, id) order while they are read from
+    the database, so full-semester exports use constant memory.
+
+    - **format**: "csv" (default) or "ndjson"
+    - **from**: Optional inclusive start of the export window
+    - **to**: Optional exclusive end of the export window
+    - **location_id**: Optional location filter
+    - **status**: Optional status filter (ON_TIME, LATE, ABSENT, INVALID_LOCATION, EXPIRED)
+    - **user_id**: Optional user filter
+    """
+    require_admin(current_user)
+
+    where = build_export_filter(
+        date_from=date_from,
+        date_to=date_to,
+        location_id=location_id,
+        status=status.value if status else None,
+        user_id=user_id
+    )
+
+    filename = f"access_logs_{datetime.now(timezone.utc):%Y%m%d_%H%M%S}.{export_format}"
+
+    return StreamingResponse(
+        stream_export(prisma_read, where, export_format),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}"
+        }
+    )
@@ -2,16 +2,18 @@
 Admin endpoints for CAMPUS360
 Handles administrative tasks like generating location QR codes
 """
-from io import BytesIO
-
-import qrcode
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from app.utils.auth_utils import get_current_user, prisma
+from app.dependencies import get_storage
+from app.repositories import DuplicateKeyError, Storage
+from app.services.locations import active_locations_cache
+from app.utils.cache import broadcast_invalidation
+from app.utils.auth_utils import get_current_user
 from app.utils.authorization import require_admin_or_teacher
 from app.schemas.schemas import LocationQRCreate, LocationResponse
+from app.utils.qr_generator import render_qr_png
 
 router = APIRouter(
     prefix="/admin",
@@ -48,25 +50,8 @@ async def generate_location_qr(
     require_admin_or_teacher(current_user)
     
     try:
-        # Create QR code instance
-        qr = qrcode.QRCode(
-            version=1,  # Size of QR code (1-40)
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        
-        # Add data to QR code (just the location code)
-        qr.add_data(request.location_code)
-        qr.make(fit=True)
-        
-        # Create image
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Save to BytesIO buffer
-        buf = BytesIO()
-        img.save(buf, format='PNG')
-        buf.seek(0)
+        # Render QR with just the location code
+        buf = render_qr_png(request.location_code, kind="location")
         
         # Return as streaming response
         return StreamingResponse(
@@ -97,25 +82,8 @@ async def generate_user_credential_qr(user_id: str):
     Returns a PNG image of the QR code
     """
     try:
-        # Create QR code instance
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_M,
-            box_size=10,
-            border=4,
-        )
-        
-        # Add user ID to QR code
-        qr.add_data(user_id)
-        qr.make(fit=True)
-        
-        # Create image
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Save to BytesIO buffer
-        buf = BytesIO()
-        img.save(buf, format='PNG')
-        buf.seek(0)
+        # Render QR with the user ID
+        buf = render_qr_png(user_id, kind="credential", error_correction="M")
         
         # Return as streaming response
         return StreamingResponse(
@@ -136,7 +104,8 @@ async def generate_user_credential_qr(user_id: str):
 @router.post("/qr/generate-location-advanced", response_model=LocationResponse)
 async def generate_location_qr_advanced(
     request: LocationQRCreate,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user),
+    storage: Storage = Depends(get_storage)
 ):
     """
     Generate a QR code with geolocation and time validation
@@ -157,27 +126,30 @@ async def generate_location_qr_advanced(
             )
         
         # Create location record in database
-        location = await prisma.location.create(
-            data={
-                "location_code": request.location_code,
-                "location_name": request.location_name,
-                "latitude": request.latitude,
-                "longitude": request.longitude,
-                "class_start": request.class_start,
-                "class_end": request.class_end,
-                "grace_period": request.grace_period,
-                "created_by": current_user.id
-            }
-        )
+        location = await storage.locations.create({
+            "location_code": request.location_code,
+            "location_name": request.location_name,
+            "latitude": request.latitude,
+            "longitude": request.longitude,
+            "class_start": request.class_start,
+            "class_end": request.class_end,
+            "grace_period": request.grace_period,
+            "created_by": current_user.id
+        })
+        
+        # New locations may be active right away
+        await broadcast_invalidation(active_locations_cache.name)
         
         return location
         
+    except HTTPException:
+        raise
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Location code '{request.location_code}' already exists"
+        )
     except Exception as e:
-        if "unique" in str(e).lower():
-            raise HTTPException(
-                status_code=400,
-                detail=f"Location code '{request.location_code}' already exists"
-            )
         raise HTTPException(
             status_code=500,
             detail=f"Error creating location: {str(e)}"
@@ -187,7 +159,8 @@ async def generate_location_qr_advanced(
 @router.get("/qr/location/{location_id}/image")
 async def get_location_qr_image(
     location_id: str,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user),
+    storage: Storage = Depends(get_storage)
 ):
     """
     Get QR code image for a specific location
@@ -200,9 +173,7 @@ async def get_location_qr_image(
     
     try:
         # Verify location exists
-        location = await prisma.location.find_unique(
-            where={"id": location_id}
-        )
+        location = await storage.locations.get(location_id)
         
         if not location:
             raise HTTPException(
@@ -210,22 +181,8 @@ async def get_location_qr_image(
                 detail="Location not found"
             )
         
-        # Create QR code with location ID
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        
-        qr.add_data(location_id)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        buf = BytesIO()
-        img.save(buf, format='PNG')
-        buf.seek(0)
+        # Render QR with the location ID
+        buf = render_qr_png(location_id, kind="location_id")
         
         return StreamingResponse(
             buf,
@@ -2,17 +2,29 @@
 Admin endpoints for user management
 Only accessible by users with admin role
 """
+import json
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from prisma.bases import BaseUser
+from prisma.errors import UniqueViolationError
 
-from app.schemas.schemas import UserCreate, UserResponse, UserUpdate
-from app.utils.auth_utils import get_current_user, hash_password, prisma
+from app.config import settings
+from app.dependencies import require_database
+from app.schemas.schemas import PurgeJobResponse, UserCreate, UserResponse, UserUpdate
+from app.services import outbox
+from app.services.user_import import detect_format, import_users
+from app.services.user_purge import start_purge
+from app.utils.auth_utils import get_current_user, hash_password, prisma, prisma_read
 from app.utils.authorization import require_admin
+from app.utils.pagination import combine_where, decode_cursor, encode_cursor, keyset_where
+from app.utils.projection import parse_fields, partial_model, trimmed_response
 
 router = APIRouter(
     prefix="/admin/users",
-    tags=["Admin - User Management"]
+    tags=["Admin - User Management"],
+    dependencies=[Depends(require_database)]
 )
 
 
@@ -36,15 +48,6 @@ async def create_user(
     # Check if current user is admin
     require_admin(current_user)
     
-    # Check if user already exists
-    existing_user = await prisma.user.find_unique(where={"email": user_data.email})
-    
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
     # Validate role
     if user_data.role not in ["admin", "teacher", "student"]:
         raise HTTPException(
@@ -55,42 +58,93 @@ async def create_user(
     # Hash the password
     hashed_password = hash_password(user_data.password)
     
-    # Create new user in database
-    new_user = await prisma.user.create(
-        data={
-            "email": user_data.email,
-            "password_hash": hashed_password,
-            "full_name": user_data.full_name,
-            "role": user_data.role,
-        }
-    )
+    # Create new user in database; the unique email constraint rejects
+    # duplicates, including concurrent creates of the same email
+    try:
+        async with outbox.transaction(prisma) as tx:
+            new_user = await tx.user.create(
+                data={
+                    "email": user_data.email,
+                    "password_hash": hashed_password,
+                    "full_name": user_data.full_name,
+                    "role": user_data.role,
+                }
+            )
+            await outbox.enqueue(tx, outbox.USER_CREATED, new_user.id, outbox.user_payload(new_user))
+    except UniqueViolationError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+    outbox.notify()
     
     return new_user
 
 
+@router.post("/import")
+async def import_users_file(
+    file: UploadFile = File(...),
+    import_format: Optional[str] = Query(None, alias="format", pattern="^(csv|ndjson)$"),
+    current_user = Depends(get_current_user)
+):
+    """
+    Bulk-create users from a CSV or NDJSON file
+
+    **Only accessible by admin users**
+
+    Each row/line needs **email**, **password**, **full_name** and **role**
+    (CSV files must have a header row with those column names).
+
+    - **file**: The CSV or NDJSON upload
+    - **format**: "csv" or "ndjson" (detected from the filename when omitted)
+
+    Streams NDJSON events while importing: one `error` event per rejected
+    row, a `progress` event per batch and a final `summary` event.
+    """
+    # Check if current user is admin
+    require_admin(current_user)
+
+    import_format = import_format or detect_format(file.filename, file.content_type)
+
+    async def events():
+        async for event in import_users(prisma, file, import_format):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @router.get("", response_model=List[UserResponse])
 async def list_users(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
     role: Optional[str] = None,
+    q: Optional[str] = Query(None, min_length=2, max_length=100),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    fields: Optional[str] = None,
     current_user = Depends(get_current_user)
 ):
     """
     List all users with optional filtering
-    
+
     **Only accessible by admin users**
-    
-    - **skip**: Number of records to skip (pagination)
-    - **limit**: Maximum number of records to return
+
+    - **skip**: Number of records to skip (legacy offset pagination, ignored when cursor is given)
+    - **limit**: Maximum number of records to return (max: 500)
     - **role**: Optional filter by role (admin, teacher, student)
-    
-    Returns list of users (excluding passwords)
+    - **q**: Optional case-insensitive search over full name and email
+    - **cursor**: Cursor from `X-Next-Cursor` to fetch the next page
+    - **include_total**: Also count matching users into `X-Total-Count`
+    - **fields**: Optional comma-separated fields to return (e.g., "id,full_name")
+
+    Returns list of users (excluding passwords), newest first
     """
     # Check if current user is admin
     require_admin(current_user)
-    
-    # Build query
-    where_clause = {}
+
+    # Build query (soft-deleted users are hidden)
+    where_clause = {"deleted_at": None}
     if role:
         if role not in ["admin", "teacher", "student"]:
             raise HTTPException(
@@ -98,21 +152,139 @@ async def list_users(
                 detail="Invalid role filter"
             )
         where_clause["role"] = role
-    
-    # Fetch users
-    users = await prisma.user.find_many(
-        where=where_clause,
+
+    if q:
+        # ILIKE '%q%' is served by the trigram indexes on full_name and email
+        where_clause["OR"] = [
+            {"full_name": {"contains": q, "mode": "insensitive"}},
+            {"email": {"contains": q, "mode": "insensitive"}},
+        ]
+
+    page_where = where_clause
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        page_where = combine_where(
+            where_clause,
+            keyset_where("created_at", created_at, last_id, descending=True)
+        )
+        skip = 0
+
+    # Fetch users, selecting only the requested columns plus the cursor keys
+    selected = parse_fields(fields, UserResponse)
+    actions = prisma_read.user
+    if selected:
+        actions = partial_model(BaseUser, UserResponse, selected, always=("id", "created_at")).prisma(prisma_read)
+
+    users = await actions.find_many(
+        where=page_where,
         skip=skip,
         take=limit,
-        order={"created_at": "desc"}
+        order=[{"created_at": "desc"}, {"id": "desc"}]
     )
-    
+
+    if len(users) == limit:
+        last = users[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+
+    # Counting is a separate, optional query so the common path skips COUNT(*)
+    if include_total:
+        total = await prisma_read.user.count(where=where_clause)
+        response.headers["X-Total-Count"] = str(total)
+
+    if selected:
+        return trimmed_response(users, UserResponse, selected, response)
     return users
 
 
+@router.get("/purge-jobs", response_model=List[PurgeJobResponse])
+async def list_purge_jobs(
+    job_status: Optional[str] = Query(None, alias="status", pattern="^(PENDING|RUNNING|DONE|FAILED)$"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user = Depends(get_current_user)
+):
+    """
+    List background user purges, newest first
+
+    **Only accessible by admin users**
+
+    - **status**: Optional filter (PENDING, RUNNING, DONE, FAILED)
+    - **limit**: Maximum number of records to return (max: 200)
+    """
+    require_admin(current_user)
+
+    return await prisma.purgejob.find_many(
+        where={"status": job_status} if job_status else {},
+        take=limit,
+        order={"id": "desc"}
+    )
+
+
+@router.get("/purge-jobs/{job_id}", response_model=PurgeJobResponse)
+async def get_purge_job(
+    job_id: int,
+    current_user = Depends(get_current_user)
+):
+    """
+    Progress of a background user purge
+
+    **Only accessible by admin users**
+
+    - **job_id**: ID from the `X-Purge-Job-Id` header of DELETE /admin/users/{user_id}
+    """
+    require_admin(current_user)
+
+    job = await prisma.purgejob.find_unique(where={"id": job_id})
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Purge job not found"
+        )
+
+    return job
+
+
+@router.post("/purge-jobs/{job_id}/retry", response_model=PurgeJobResponse)
+async def retry_purge_job(
+    job_id: int,
+    current_user = Depends(get_current_user)
+):
+    """
+    Restart a failed purge from where it stopped
+
+    **Only accessible by admin users**
+
+    - **job_id**: ID of a FAILED purge job
+    """
+    require_admin(current_user)
+
+    # Only a FAILED job matches, so concurrent retries start it once
+    job = await prisma.purgejob.update(
+        where={"id": job_id, "status": "FAILED"},
+        data={"status": "PENDING", "error": None}
+    )
+
+    if job is None:
+        # Tell a missing job from one in another state (error path only)
+        if not await prisma.purgejob.find_unique(where={"id": job_id}):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Purge job not found"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only failed purge jobs can be retried"
+        )
+
+    start_purge(prisma, job_id)
+
+    return job
+
+
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: str,
+    fields: Optional[str] = None,
     current_user = Depends(get_current_user)
 ):
     """
@@ -121,16 +293,30 @@ async def get_user(
     **Only accessible by admin users**
     
     - **user_id**: UUID of the user
+    - **fields**: Optional comma-separated fields to return (e.g., "email,role")
     
     Returns user data (excluding password)
     """
     # Check if current user is admin
     require_admin(current_user)
     
+    selected = parse_fields(fields, UserResponse)
+    if selected:
+        # Deleted users are filtered in the query since deleted_at is not selected
+        user = await partial_model(BaseUser, UserResponse, selected).prisma(prisma).find_first(
+            where={"id": user_id, "deleted_at": None}
+        )
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        return trimmed_response(user, UserResponse, selected)
+    
     # Fetch user
     user = await prisma.user.find_unique(where={"id": user_id})
     
-    if not user:
+    if not user or user.deleted_at:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
@@ -161,26 +347,10 @@ async def update_user(
     # Check if current user is admin
     require_admin(current_user)
     
-    # Check if user exists
-    user = await prisma.user.find_unique(where={"id": user_id})
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
     # Prepare update data
     update_data = {}
     
     if user_data.email is not None:
-        # Check if email is already taken by another user
-        existing_user = await prisma.user.find_unique(where={"email": user_data.email})
-        if existing_user and existing_user.id != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already in use"
-            )
         update_data["email"] = user_data.email
     
     if user_data.full_name is not None:
@@ -197,11 +367,26 @@ async def update_user(
     if user_data.password is not None:
         update_data["password_hash"] = hash_password(user_data.password)
     
-    # Update user
-    updated_user = await prisma.user.update(
-        where={"id": user_id},
-        data=update_data
-    )
+    # Update in one statement: deleted or missing users match nothing, and
+    # the unique constraint rejects an email taken by another user
+    try:
+        async with outbox.transaction(prisma) as tx:
+            updated_user = await tx.user.update(
+                where={"id": user_id, "deleted_at": None},
+                data=update_data
+            )
+            if updated_user is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="User not found"
+                )
+            await outbox.enqueue(tx, outbox.USER_UPDATED, user_id, outbox.user_payload(updated_user))
+    except UniqueViolationError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already in use"
+        )
+    outbox.notify()
     
     return updated_user
 
@@ -209,6 +394,7 @@ async def update_user(
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: str,
+    response: Response,
     current_user = Depends(get_current_user)
 ):
     """
@@ -216,9 +402,14 @@ async def delete_user(
     
     **Only accessible by admin users**
     
+    The user is blocked from logging in immediately. Their access logs
+    and locations are then removed by a background job in small chunks,
+    so live scans are not stalled; follow it with
+    GET /admin/users/purge-jobs/{job_id}.
+    
     - **user_id**: UUID of the user to delete
     
-    Returns no content on success
+    Returns no content on success; the purge job ID is in `X-Purge-Job-Id`
     """
     # Check if current user is admin
     require_admin(current_user)
@@ -230,16 +421,37 @@ async def delete_user(
             detail="Cannot delete your own account"
         )
     
-    # Check if user exists
-    user = await prisma.user.find_unique(where={"id": user_id})
+    # Soft delete, queue the purge and publish the event in one statement;
+    # a missing or already deleted user matches nothing and no job is created
+    job = await prisma.query_first(
+        """
+        WITH deleted AS (
+            UPDATE users SET deleted_at = NOW() AT TIME ZONE 'UTC'
+            WHERE id = $1 AND deleted_at IS NULL
+            RETURNING id
+        ), event AS (
+            INSERT INTO outbox_events (topic, key, payload)
+            SELECT $3, id, jsonb_build_object('id', id) FROM deleted
+            WHERE $4::boolean
+        )
+        INSERT INTO purge_jobs (user_id, requested_by)
+        SELECT id, $2 FROM deleted
+        RETURNING id
+        """,
+        user_id,
+        current_user.id,
+        outbox.USER_DELETED,
+        settings.OUTBOX_ENABLED
+    )
     
-    if not user:
+    if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    # Delete user (cascade will delete related access logs)
-    await prisma.user.delete(where={"id": user_id})
+    outbox.notify()
+    start_purge(prisma, job["id"])
+    response.headers["X-Purge-Job-Id"] = str(job["id"])
     
     return None
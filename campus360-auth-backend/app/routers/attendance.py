@@ -0,0 +1,202 @@
+"""
+Attendance report endpoints for CAMPUS360
+Serves per-location and per-student attendance aggregates computed in the database
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.config import settings
+from app.dependencies import require_database
+from app.schemas.schemas import (
+    DailyAttendanceRow, LocationAttendanceReport, RollupBackfillRequest,
+    RollupBackfillResponse, StudentAttendanceReport
+)
+from app.services import attendance_reports, attendance_rollup
+from app.services.log_partitions import retention_cutoff
+from app.utils.auth_utils import get_current_user, prisma, prisma_read
+from app.utils.authorization import require_admin, require_admin_or_teacher
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin - Attendance"],
+    dependencies=[Depends(require_database)]
+)
+
+MAX_PAGE_SIZE = 200
+MAX_DASHBOARD_DAYS = 366
+MAX_BACKFILL_DAYS = 400
+
+
+@router.get("/locations/{location_id}/attendance", response_model=LocationAttendanceReport)
+async def get_location_attendance(
+    location_id: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    current_user = Depends(get_current_user)
+):
+    """
+    Attendance report for a location
+
+    **Accessible by admin and teacher roles**
+
+    Counts per status (ON_TIME, LATE, ABSENT, INVALID_LOCATION, EXPIRED),
+    first/last scan times and distance statistics are aggregated by the
+    database. Students are listed once each, ordered by arrival.
+
+    - **location_id**: ID of the location
+    - **skip**: Number of students to skip (pagination)
+    - **limit**: Maximum number of students to return (max: 200)
+    """
+    require_admin_or_teacher(current_user)
+
+    location = await prisma_read.location.find_unique(where={"id": location_id})
+
+    if not location:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Location not found"
+        )
+
+    summary = await attendance_reports.get_location_summary(prisma_read, location_id)
+    students = await attendance_reports.get_location_students(prisma_read, location_id, skip, limit)
+
+    return {
+        "location_id": location.id,
+        "location_code": location.location_code,
+        "location_name": location.location_name,
+        "class_start": location.class_start,
+        "class_end": location.class_end,
+        "summary": summary,
+        "students": students[:limit],
+        "skip": skip,
+        "limit": limit,
+        "has_more": len(students) > limit
+    }
+
+
+@router.get("/students/{user_id}/attendance", response_model=StudentAttendanceReport)
+async def get_student_attendance(
+    user_id: str,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    current_user = Depends(get_current_user)
+):
+    """
+    Attendance summary for a single student
+
+    **Accessible by admin and teacher roles**
+
+    - **user_id**: UUID of the student
+    - **from**: Optional inclusive start of the reporting window
+    - **to**: Optional exclusive end of the reporting window
+    - **skip**: Number of locations to skip (pagination)
+    - **limit**: Maximum number of locations to return (max: 200)
+    """
+    require_admin_or_teacher(current_user)
+
+    user = await prisma_read.user.find_unique(where={"id": user_id})
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    summary = await attendance_reports.get_student_summary(prisma_read, user_id, date_from, date_to)
+    locations = await attendance_reports.get_student_locations(
+        prisma_read, user_id, skip, limit, date_from, date_to
+    )
+
+    return {
+        "user_id": user.id,
+        "full_name": user.full_name,
+        "email": user.email,
+        "summary": summary,
+        "locations": locations[:limit],
+        "skip": skip,
+        "limit": limit,
+        "has_more": len(locations) > limit
+    }
+
+
+@router.get("/attendance/daily", response_model=List[DailyAttendanceRow])
+async def get_daily_attendance(
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    location_id: Optional[str] = None,
+    current_user = Depends(get_current_user)
+):
+    """
+    Daily attendance counts per location for dashboards
+
+    **Accessible by admin and teacher roles**
+
+    Served from the daily rollup table, so latency does not depend on
+    the size of access_logs.
+
+    - **from**: First UTC day (default: 7 days ago)
+    - **to**: Last UTC day, inclusive (default: today)
+    - **location_id**: Optional location filter
+    """
+    require_admin_or_teacher(current_user)
+
+    date_to = date_to or datetime.now(timezone.utc).date()
+    date_from = date_from or date_to - timedelta(days=6)
+
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must not be before 'from'"
+        )
+    if (date_to - date_from).days >= MAX_DASHBOARD_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range cannot exceed {MAX_DASHBOARD_DAYS} days"
+        )
+
+    return await attendance_rollup.get_daily_counts(prisma_read, date_from, date_to, location_id)
+
+
+@router.post("/attendance/rollups/backfill", response_model=RollupBackfillResponse)
+async def backfill_attendance_rollups(
+    request: RollupBackfillRequest,
+    current_user = Depends(get_current_user)
+):
+    """
+    Rebuild daily attendance rollups from access_logs
+
+    **Only accessible by admin users**
+
+    Use after restoring logs, manual data fixes or a failed deploy.
+    Each day is rebuilt in its own short transaction.
+
+    - **date_from**: First UTC day to rebuild
+    - **date_to**: Last UTC day to rebuild (inclusive)
+    """
+    require_admin(current_user)
+
+    if request.date_to < request.date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_to must not be before date_from"
+        )
+    if (request.date_to - request.date_from).days >= MAX_BACKFILL_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Backfill range cannot exceed {MAX_BACKFILL_DAYS} days"
+        )
+
+    # Archived days have no logs left to rebuild from
+    if settings.ACCESS_LOG_PARTITIONING:
+        cutoff = retention_cutoff(settings.ACCESS_LOG_RETENTION_MONTHS)
+        if request.date_from < cutoff:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Days before {cutoff} are archived; restore them before rebuilding rollups"
+            )
+
+    return await attendance_rollup.backfill_range(prisma, request.date_from, request.date_to)
@@ -4,15 +4,17 @@ Handles user login with JWT token generation
 """
 from datetime import timedelta
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi import Depends
 
 from app.config import settings
+from app.dependencies import get_storage
+from app.repositories import Storage
 from app.schemas.schemas import Token
+from app.services.throttling import check_login_allowed, clear_login_failures, record_login_failure
 from app.utils.auth_utils import (
     create_access_token,
-    prisma,
     verify_password,
 )
 
@@ -23,19 +25,30 @@ router = APIRouter(
 
 
 @router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    storage: Storage = Depends(get_storage)
+):
     """
     Login with email and password to receive JWT access token
     
     - **username**: User's email address
     - **password**: User's password
     
-    Returns JWT access token for authenticated requests
+    Returns JWT access token for authenticated requests. After
+    LOGIN_MAX_FAILURES failed attempts from the same IP, the email is
+    rejected with 429 until LOGIN_FAILURE_WINDOW_SECONDS have passed.
     """
+    client_ip = request.client.host if request.client else "unknown"
+    await check_login_allowed(form_data.username, client_ip)
+    
     # Find user by email
-    user = await prisma.user.find_unique(where={"email": form_data.username})
+    user = await storage.users.get_by_email(form_data.username)
     
-    if not user:
+    # Deleted users are rejected like unknown ones while their data is purged
+    if not user or user.deleted_at:
+        await record_login_failure(form_data.username, client_ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -44,12 +57,15 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     
     # Verify password
     if not verify_password(form_data.password, user.password_hash):
+        await record_login_failure(form_data.username, client_ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    await clear_login_failures(form_data.username, client_ip)
+    
     # Create access token with user ID and role
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
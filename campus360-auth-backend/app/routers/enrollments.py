@@ -0,0 +1,188 @@
+"""
+Enrollment endpoints for CAMPUS360
+Manages which students are expected at each location and serves rosters
+of present, late and missing students
+"""
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.dependencies import require_database
+from app.schemas.schemas import EnrollmentCreate, EnrollmentResult, LocationRoster, RosterStudent
+from app.services import rosters
+from app.utils.auth_utils import get_current_user, prisma
+from app.utils.authorization import require_admin_or_teacher
+
+router = APIRouter(
+    prefix="/admin/locations",
+    tags=["Admin - Enrollments"],
+    dependencies=[Depends(require_database)]
+)
+
+
+async def _get_location(location_id: str):
+    """Fetch a location or raise 404"""
+    location = await prisma.location.find_unique(where={"id": location_id})
+
+    if not location:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Location not found"
+        )
+
+    return location
+
+
+async def _students_by_id(user_ids: list[str]) -> dict[str, RosterStudent]:
+    """Load the students referenced by a roster with a single query"""
+    if not user_ids:
+        return {}
+    users = await prisma.user.find_many(where={"id": {"in": user_ids}})
+    return {
+        user.id: RosterStudent(user_id=user.id, full_name=user.full_name, email=user.email)
+        for user in users
+    }
+
+
+@router.post("/{location_id}/enrollments", response_model=EnrollmentResult, status_code=status.HTTP_201_CREATED)
+async def enroll_students(
+    location_id: str,
+    request: EnrollmentCreate,
+    current_user = Depends(get_current_user)
+):
+    """
+    Enroll students in a location
+
+    **Accessible by admin and teacher roles**
+
+    Students who are already enrolled are skipped.
+
+    - **location_id**: ID of the location
+    - **user_ids**: UUIDs of the students to enroll (max: 2000)
+    """
+    require_admin_or_teacher(current_user)
+    await _get_location(location_id)
+
+    user_ids = list(dict.fromkeys(request.user_ids))
+    students = await prisma.user.find_many(
+        where={"id": {"in": user_ids}, "role": "student", "deleted_at": None}
+    )
+    unknown = set(user_ids) - {student.id for student in students}
+
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Not students: {', '.join(sorted(unknown))}"
+        )
+
+    enrolled = await prisma.enrollment.create_many(
+        data=[{"location_id": location_id, "user_id": user_id} for user_id in user_ids],
+        skip_duplicates=True
+    )
+    await rosters.invalidate_roster(location_id)
+
+    return {"enrolled": enrolled, "already_enrolled": len(user_ids) - enrolled}
+
+
+@router.get("/{location_id}/enrollments", response_model=List[RosterStudent])
+async def list_enrollments(
+    location_id: str,
+    current_user = Depends(get_current_user)
+):
+    """
+    List the students enrolled in a location
+
+    **Accessible by admin and teacher roles**
+
+    - **location_id**: ID of the location
+    """
+    require_admin_or_teacher(current_user)
+    await _get_location(location_id)
+
+    enrollments = await prisma.enrollment.find_many(
+        where={"location_id": location_id},
+        include={"user": True}
+    )
+
+    return sorted(
+        (
+            RosterStudent(user_id=e.user.id, full_name=e.user.full_name, email=e.user.email)
+            for e in enrollments
+        ),
+        key=lambda student: student.full_name
+    )
+
+
+@router.delete("/{location_id}/enrollments/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def unenroll_student(
+    location_id: str,
+    user_id: str,
+    current_user = Depends(get_current_user)
+):
+    """
+    Remove a student from a location
+
+    **Accessible by admin and teacher roles**
+
+    - **location_id**: ID of the location
+    - **user_id**: UUID of the student
+    """
+    require_admin_or_teacher(current_user)
+
+    removed = await prisma.enrollment.delete_many(
+        where={"location_id": location_id, "user_id": user_id}
+    )
+
+    if not removed:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Enrollment not found"
+        )
+
+    await rosters.invalidate_roster(location_id)
+    return None
+
+
+@router.get("/{location_id}/roster", response_model=LocationRoster)
+async def get_location_roster(
+    location_id: str,
+    current_user = Depends(get_current_user)
+):
+    """
+    Present, late and missing students of a location
+
+    **Accessible by admin and teacher roles**
+
+    Enrolled students are compared with everyone who scanned ON_TIME or
+    LATE. Students who scanned without being enrolled are listed as
+    unexpected.
+
+    - **location_id**: ID of the location
+    """
+    require_admin_or_teacher(current_user)
+    location = await _get_location(location_id)
+
+    roster = await rosters.get_roster(prisma, location_id)
+    students = await _students_by_id(roster.student_ids)
+
+    def listed(bits: int) -> list[RosterStudent]:
+        found = (students.get(user_id) for user_id in roster.ids(bits))
+        return sorted((s for s in found if s), key=lambda student: student.full_name)
+
+    return {
+        "location_id": location.id,
+        "location_code": location.location_code,
+        "location_name": location.location_name,
+        "counts": {
+            "expected": roster.expected.bit_count(),
+            "present": (roster.present & roster.expected).bit_count(),
+            "on_time": (roster.on_time & roster.expected).bit_count(),
+            "late": (roster.late & roster.expected).bit_count(),
+            "missing": roster.missing.bit_count(),
+            "unexpected": roster.unexpected.bit_count(),
+        },
+        "on_time": listed(roster.on_time & roster.expected),
+        "late": listed(roster.late & roster.expected),
+        "missing": listed(roster.missing),
+        "unexpected": listed(roster.unexpected),
+    }
@@ -1,4 +1,10 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, status
+
+from app.config import settings
+from app.schemas.schemas import ReadinessResponse
+from app.services.readiness import check_database, get_pool_stats
+from app.utils.auth_utils import prisma, prisma_read
+from app.utils.startup import startup_state
 
 router = APIRouter(
     prefix="/health",
@@ -8,3 +14,48 @@ router = APIRouter(
 @router.get("/")
 def health_check():
     return {"status": "ok"}
+
+
+@router.get("/live")
+def liveness():
+    """Liveness probe: the process is up and serving (no dependencies checked)"""
+    return {"status": "ok"}
+
+
+@router.get("/ready", response_model=ReadinessResponse)
+async def readiness(response: Response):
+    """
+    Readiness probe for the load balancer
+
+    Answers 503 while startup is running, when the database does not
+    answer within READINESS_DB_TIMEOUT_SECONDS, or when more than
+    READINESS_MAX_WAITING_QUERIES queries wait for a pooled connection.
+    An unavailable read replica is reported but does not fail the probe
+    (reads fall back to the primary). With STORAGE_BACKEND=memory the
+    database is not probed.
+    """
+    reasons = []
+    if not startup_state.ready:
+        reasons.append(f"startup: {startup_state.error or 'in progress'}")
+
+    database, latency_ms = False, 0.0
+    if settings.STORAGE_BACKEND != "memory":
+        database, latency_ms, error = await check_database(prisma, settings.READINESS_DB_TIMEOUT_SECONDS)
+        if error:
+            reasons.append(f"database: {error}")
+
+    pool = await get_pool_stats(prisma) if database else None
+    if pool and pool["waiting_queries"] > settings.READINESS_MAX_WAITING_QUERIES:
+        reasons.append(f"pool: {pool['waiting_queries']} queries waiting for a connection")
+
+    if reasons:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "not_ready" if reasons else "ready",
+        "startup_complete": startup_state.ready,
+        "database": database,
+        "database_latency_ms": round(latency_ms, 2),
+        "pool": pool,
+        "replica": prisma_read.available if prisma_read is not prisma else None,
+        "reasons": reasons,
+    }
@@ -0,0 +1,212 @@
+"""
+Location catalogue endpoints for CAMPUS360
+Lists, updates and deletes locations and serves the classes running right now
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+
+from app.dependencies import get_storage
+from app.repositories import DuplicateKeyError, Storage
+from app.schemas.schemas import LocationResponse, LocationUpdate
+from app.services.locations import active_locations_cache, get_active_locations
+from app.utils.attendance import to_utc_naive
+from app.utils.auth_utils import get_current_user
+from app.utils.authorization import require_admin_or_teacher
+from app.utils.cache import broadcast_invalidation
+from app.utils.pagination import decode_cursor, encode_cursor
+
+router = APIRouter(
+    prefix="/admin/locations",
+    tags=["Admin - Locations"]
+)
+
+
+def _resolve_creator(created_by: Optional[str], current_user) -> Optional[str]:
+    """Expand the 'me' shortcut of the created_by filter"""
+    return current_user.id if created_by == "me" else created_by
+
+
+async def _get_owned_location(storage: Storage, location_id: str, current_user):
+    """Fetch a location the current user may modify, or raise 404/403"""
+    location = await storage.locations.get(location_id)
+
+    if not location:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Location not found"
+        )
+
+    # Teachers may only modify their own locations
+    if current_user.role != "admin" and location.created_by != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only modify locations you created"
+        )
+
+    return location
+
+
+@router.get("", response_model=List[LocationResponse])
+async def list_locations(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    created_by: Optional[str] = None,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    code_prefix: Optional[str] = Query(None, min_length=1, max_length=50),
+    current_user = Depends(get_current_user),
+    storage: Storage = Depends(get_storage)
+):
+    """
+    List locations ordered by class start
+
+    **Accessible by admin and teacher roles**
+
+    - **limit**: Maximum number of records to return (max: 200)
+    - **cursor**: Cursor from `X-Next-Cursor` to fetch the next page
+    - **created_by**: Optional creator UUID, or "me" for the current user
+    - **from**: Optional inclusive lower bound on class_start
+    - **to**: Optional exclusive upper bound on class_start
+    - **code_prefix**: Optional location code prefix (e.g., "LAB-")
+    """
+    require_admin_or_teacher(current_user)
+
+    locations = await storage.locations.list_page(
+        limit,
+        created_by=_resolve_creator(created_by, current_user),
+        date_from=date_from,
+        date_to=date_to,
+        code_prefix=code_prefix,
+        after=decode_cursor(cursor) if cursor else None
+    )
+
+    if len(locations) == limit:
+        last = locations[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.class_start, last.id)
+
+    return locations
+
+
+@router.get("/active", response_model=List[LocationResponse])
+async def list_active_locations(
+    response: Response,
+    created_by: Optional[str] = None,
+    current_user = Depends(get_current_user)
+):
+    """
+    Locations whose class is running right now
+
+    **Accessible by admin and teacher roles**
+
+    Served from an in-memory cache refreshed in the background, so it is
+    cheap to poll. `X-Cache-Age` reports the age of the data in seconds.
+
+    - **created_by**: Optional creator UUID, or "me" for the current user
+    """
+    require_admin_or_teacher(current_user)
+
+    locations = await get_active_locations(_resolve_creator(created_by, current_user))
+    response.headers["X-Cache-Age"] = f"{active_locations_cache.age_seconds or 0:.0f}"
+    return locations
+
+
+@router.get("/{location_id}", response_model=LocationResponse)
+async def get_location(
+    location_id: str,
+    current_user = Depends(get_current_user),
+    storage: Storage = Depends(get_storage)
+):
+    """
+    Get a location by ID
+
+    **Accessible by admin and teacher roles**
+
+    - **location_id**: ID of the location
+    """
+    require_admin_or_teacher(current_user)
+
+    location = await storage.locations.get(location_id)
+
+    if not location:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Location not found"
+        )
+
+    return location
+
+
+@router.patch("/{location_id}", response_model=LocationResponse)
+async def update_location(
+    location_id: str,
+    request: LocationUpdate,
+    current_user = Depends(get_current_user),
+    storage: Storage = Depends(get_storage)
+):
+    """
+    Update a location
+
+    **Accessible by admin and teacher roles** (teachers: own locations only)
+
+    Only the fields present in the body are changed.
+
+    - **location_id**: ID of the location
+    """
+    require_admin_or_teacher(current_user)
+    location = await _get_owned_location(storage, location_id, current_user)
+
+    data = request.model_dump(exclude_unset=True, exclude_none=True)
+    if not data:
+        return location
+
+    class_start = to_utc_naive(data.get("class_start", location.class_start))
+    class_end = to_utc_naive(data.get("class_end", location.class_end))
+    if class_end <= class_start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="class_end must be after class_start"
+        )
+
+    try:
+        updated = await storage.locations.update(location_id, data)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Location code '{data['location_code']}' already exists"
+        )
+
+    if updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Location not found"
+        )
+
+    await broadcast_invalidation(active_locations_cache.name)
+    return updated
+
+
+@router.delete("/{location_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_location(
+    location_id: str,
+    current_user = Depends(get_current_user),
+    storage: Storage = Depends(get_storage)
+):
+    """
+    Delete a location
+
+    **Accessible by admin and teacher roles** (teachers: own locations only)
+
+    Access logs of the location are kept with location_id set to null.
+
+    - **location_id**: ID of the location
+    """
+    require_admin_or_teacher(current_user)
+    await _get_owned_location(storage, location_id, current_user)
+
+    await storage.locations.delete(location_id)
+    await broadcast_invalidation(active_locations_cache.name)
+
+    return None
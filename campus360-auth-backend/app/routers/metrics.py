@@ -0,0 +1,32 @@
+"""
+Metrics endpoint for CAMPUS360
+Exposes Prometheus metrics for scraping
+"""
+import hmac
+
+from fastapi import APIRouter, Header, HTTPException, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from app.config import settings
+
+router = APIRouter(
+    tags=["Metrics"]
+)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(authorization: str = Header("")):
+    """
+    Prometheus metrics in text exposition format
+
+    Requires `Authorization: Bearer <METRICS_TOKEN>` when METRICS_TOKEN is set.
+    """
+    if settings.METRICS_TOKEN and not hmac.compare_digest(
+        authorization, f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token"
+        )
+
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
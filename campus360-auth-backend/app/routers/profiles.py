@@ -0,0 +1,64 @@
+"""
+Request profile endpoints for CAMPUS360
+Lists and serves the speedscope profiles saved by ProfilerMiddleware
+"""
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+
+from app.config import settings
+from app.schemas.schemas import ProfileInfo
+from app.utils.auth_utils import get_current_user
+from app.utils.authorization import require_admin
+from app.utils.profiling import list_profiles, profile_path
+
+router = APIRouter(
+    prefix="/admin/profiles",
+    tags=["Admin - Profiling"]
+)
+
+
+@router.get("", response_model=List[ProfileInfo])
+async def get_profiles(
+    limit: int = Query(50, ge=1, le=500),
+    current_user = Depends(get_current_user)
+):
+    """
+    List recent request profiles, newest first
+
+    **Only accessible by admin users**
+
+    Profiles are recorded when PROFILING_ENABLED is set and a request is
+    selected (`X-Profile: 1` from an admin, or PROFILING_SAMPLE_RATE).
+
+    - **limit**: Maximum profiles to return (default: 50, max: 500)
+    """
+    require_admin(current_user)
+    return list_profiles(settings.PROFILING_DIR)[:limit]
+
+
+@router.get("/{name}")
+async def download_profile(
+    name: str,
+    current_user = Depends(get_current_user)
+):
+    """
+    Download a profile as speedscope JSON
+
+    **Only accessible by admin users**
+
+    Open the file at https://www.speedscope.app to view the flamegraph.
+
+    - **name**: Profile name as returned in X-Profile-Id
+    """
+    require_admin(current_user)
+
+    path = profile_path(settings.PROFILING_DIR, name)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+
+    return FileResponse(path, media_type="application/json", filename=name)
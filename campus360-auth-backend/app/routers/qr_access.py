@@ -3,14 +3,23 @@ QR Access endpoints for CAMPUS360
 Handles QR code scanning for access control and user credential retrieval
 """
 from datetime import datetime
+from typing import Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
-
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from app.config import settings
+from app.dependencies import get_storage
+from app.repositories import Storage
 from app.schemas.schemas import (
-    ScanRequest, ScanResponse, UserResponse,
-    ScanRequestAdvanced, ScanResponseAdvanced
+    AccessLogResponseAdvanced, ScanRequest, ScanResponse, UserResponse,
+    ScanRequestAdvanced, ScanResponseAdvanced, ScanResponseCompact
 )
-from app.utils.auth_utils import get_current_user, prisma
+from app.services.log_partitions import retention_cutoff
+from app.services.throttling import claim_scan, release_scan
+from app.utils.attendance import AttendanceStatus
+from app.utils.auth_utils import get_current_user
+from app.utils.fast_json import fast_response, fields_of
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.projection import parse_fields
 
 router = APIRouter(
     prefix="/qr",
@@ -41,7 +50,8 @@ async def get_my_profile(current_user = Depends(get_current_user)):
 @router.post("/scan", response_model=ScanResponse)
 async def scan_location(
     scan_data: ScanRequest,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user),
+    storage: Storage = Depends(get_storage)
 ):
     """
     Record access to a location via QR code scan
@@ -59,13 +69,17 @@ async def scan_location(
     - Timestamp of access
     - User information
     """
+    await claim_scan(current_user.id, scan_data.location_code)
+    
     # Create access log entry
-    access_log = await prisma.accesslog.create(
-        data={
+    try:
+        access_log = await storage.access_logs.create({
             "user_id": current_user.id,
             "location_code": scan_data.location_code,
-        }
-    )
+        })
+    except BaseException:
+        await release_scan(current_user.id, scan_data.location_code)
+        raise
     
     return {
         "message": "Access recorded successfully",
@@ -77,47 +91,85 @@ async def scan_location(
 
 @router.get("/history", response_model=list[dict])
 async def get_access_history(
+    response: Response,
     current_user = Depends(get_current_user),
-    limit: int = 10
+    storage: Storage = Depends(get_storage),
+    limit: int = 10,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    status: Optional[AttendanceStatus] = None,
+    fields: Optional[str] = None
 ):
     """
     Get user's access history
-    
-    Returns the most recent access logs for the authenticated user.
-    
+
+    Returns the authenticated user's access logs, newest first.
+
     **Authentication required**: Bearer token in Authorization header
-    
+
     - **limit**: Maximum number of records to return (default: 10, max: 100)
+    - **before**: Cursor from `X-Next-Cursor`; returns older records
+    - **after**: Cursor from `X-Prev-Cursor`; returns newer records
+    - **from**: Optional inclusive start of the time window (defaults to the
+      retention window when access_logs is partitioned)
+    - **to**: Optional exclusive end of the time window
+    - **status**: Optional status filter (ON_TIME, LATE, ABSENT, INVALID_LOCATION, EXPIRED)
+    - **fields**: Optional comma-separated fields to return (e.g., "timestamp,status");
+      only those columns are read from the database
+
+    Pagination cursors are returned in the `X-Next-Cursor` (older page)
+    and `X-Prev-Cursor` (newer page) response headers.
     """
     if limit > 100:
         limit = 100
-    
-    access_logs = await prisma.accesslog.find_many(
-        where={"user_id": current_user.id},
-        order={"timestamp": "desc"},
-        take=limit
+
+    selected = parse_fields(fields, AccessLogResponseAdvanced)
+
+    if before and after:
+        raise HTTPException(
+            status_code=400,
+            detail="Use either 'before' or 'after', not both"
+        )
+
+    # Keep history reads on the hot partitions unless older data is requested
+    if date_from is None and settings.ACCESS_LOG_PARTITIONING:
+        date_from = datetime.combine(
+            retention_cutoff(settings.ACCESS_LOG_RETENTION_MONTHS), datetime.min.time()
+        )
+
+    access_logs = await storage.access_logs.list_for_user(
+        current_user.id,
+        limit,
+        date_from=date_from,
+        date_to=date_to,
+        status=status.value if status else None,
+        before=decode_cursor(before) if before else None,
+        after=decode_cursor(after) if after else None,
+        fields=selected
     )
-    
-    return [
-        {
-            "id": log.id,
-            "user_id": log.user_id,
-            "location_id": log.location_id,
-            "location_code": log.location_code,
-            "timestamp": log.timestamp,
-            "status": log.status,
-            "user_latitude": log.user_latitude,
-            "user_longitude": log.user_longitude,
-            "distance_meters": log.distance_meters
-        }
-        for log in access_logs
-    ]
 
+    if access_logs:
+        first, last = access_logs[0], access_logs[-1]
+        response.headers["X-Prev-Cursor"] = encode_cursor(first.timestamp, first.id)
+        # A page reached through 'after' always has older records behind it
+        if len(access_logs) == limit or after:
+            response.headers["X-Next-Cursor"] = encode_cursor(last.timestamp, last.id)
+
+    # Plain dicts are already cheap to validate; FAST_JSON also skips the
+    # response_model pass and serializes them with orjson
+    columns = selected or tuple(AccessLogResponseAdvanced.model_fields)
+    rows = [{name: getattr(log, name) for name in columns} for log in access_logs]
+    return fast_response(rows, response) if settings.FAST_JSON else rows
 
-@router.post("/scan-advanced", response_model=ScanResponseAdvanced)
+
+@router.post("/scan-advanced", response_model=Union[ScanResponseAdvanced, ScanResponseCompact])
 async def scan_location_advanced(
     scan_data: ScanRequestAdvanced,
-    current_user = Depends(get_current_user)
+    compact: bool = False,
+    current_user = Depends(get_current_user),
+    storage: Storage = Depends(get_storage)
 ):
     """
     Scan QR code with geolocation and time validation
@@ -129,17 +181,18 @@ async def scan_location_advanced(
     - Scan time is within class schedule
     - Determines attendance status (on-time, late, absent)
     
+    - **compact**: Omit the nested user object from the response
+    
     Returns detailed validation results
     """
     from datetime import datetime, timezone
     from app.utils.geolocation import is_within_radius
     from app.utils.attendance import calculate_attendance_status, get_status_message
     
+    claimed_code = None
     try:
         # Get location data
-        location = await prisma.location.find_unique(
-            where={"id": scan_data.location_id}
-        )
+        location = await storage.locations.get(scan_data.location_id)
         
         if not location:
             raise HTTPException(
@@ -147,6 +200,9 @@ async def scan_location_advanced(
                 detail="Location not found"
             )
         
+        await claim_scan(current_user.id, location.location_code)
+        claimed_code = location.location_code
+        
         # Use timezone-aware datetime
         scan_time = datetime.now(timezone.utc)
         
@@ -178,32 +234,42 @@ async def scan_location_advanced(
             is_location_valid=is_valid_location
         )
         
-        # Create access log
-        access_log = await prisma.accesslog.create(
-            data={
-                "user_id": current_user.id,
-                "location_id": location.id,
-                "location_code": location.location_code,
-                "status": status,
-                "user_latitude": scan_data.user_latitude,
-                "user_longitude": scan_data.user_longitude,
-                "distance_meters": distance
-            }
-        )
+        # Create access log and bump the daily rollup in the same transaction
+        access_log = await storage.access_logs.record_scan({
+            "user_id": current_user.id,
+            "location_id": location.id,
+            "location_code": location.location_code,
+            "status": status,
+            "user_latitude": scan_data.user_latitude,
+            "user_longitude": scan_data.user_longitude,
+            "distance_meters": distance
+        })
+        
+        # The scan is recorded now, so errors below keep the claim. A scan
+        # from too far away does not count: let the student retry in range.
+        claimed_code = None
+        if status == AttendanceStatus.INVALID_LOCATION:
+            await release_scan(current_user.id, location.location_code)
         
-        return {
+        result = {
             "message": get_status_message(status, distance),
             "status": status,
             "location_code": location.location_code,
             "location_name": location.location_name,
             "distance_meters": round(distance, 2),
-            "timestamp": access_log.timestamp,
-            "user": current_user
+            "timestamp": access_log.timestamp
         }
+        if not compact:
+            result["user"] = fields_of(current_user, UserResponse) if settings.FAST_JSON else current_user
+        return fast_response(result) if settings.FAST_JSON else result
         
     except HTTPException:
+        if claimed_code:
+            await release_scan(current_user.id, claimed_code)
         raise
     except Exception as e:
+        if claimed_code:
+            await release_scan(current_user.id, claimed_code)
         # Log the full error for debugging
         import traceback
         print(f"Error in scan_location_advanced: {str(e)}")
@@ -0,0 +1,147 @@
+"""
+Security review endpoints for CAMPUS360
+Runs GPS spoofing detection over access logs and manages the flags it raises
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.dependencies import require_database
+from app.schemas.schemas import (
+    ScanFlagResponse, ScanFlagReview, SpoofAnalysisRequest, SpoofAnalysisResponse
+)
+from app.utils.auth_utils import get_current_user, prisma
+from app.utils.authorization import require_admin, require_admin_or_teacher
+
+router = APIRouter(
+    prefix="/admin/security",
+    tags=["Admin - Security"],
+    dependencies=[Depends(require_database)]
+)
+
+MAX_ANALYSIS_DAYS = 200
+REVIEW_STATUSES = ("CONFIRMED", "DISMISSED")
+
+
+@router.post("/spoof-analysis", response_model=SpoofAnalysisResponse)
+async def analyze_spoofing(
+    request: SpoofAnalysisRequest,
+    current_user = Depends(get_current_user)
+):
+    """
+    Detect GPS spoofing in a window of access logs
+
+    **Only accessible by admin users**
+
+    Flags scans with impossible travel between consecutive scans of the
+    same student, coordinates shared by several students, hand-typed
+    (coarse) coordinates and positions identical to the classroom's.
+    Flags already stored are not duplicated, so windows may overlap.
+
+    - **date_from**: Inclusive start of the window
+    - **date_to**: Exclusive end of the window (max: 200 days)
+    - **max_speed_mps**: Fastest plausible travel speed in m/s (default: 50)
+    - **min_travel_meters**: Ignore jumps shorter than this (default: 500)
+    - **shared_min_users**: Students sharing a coordinate to flag it (default: 3)
+    """
+    require_admin(current_user)
+
+    if request.date_to <= request.date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_to must be after date_from"
+        )
+    if (request.date_to - request.date_from).days >= MAX_ANALYSIS_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Analysis window cannot exceed {MAX_ANALYSIS_DAYS} days"
+        )
+
+    # numpy is only loaded once an analysis is actually requested
+    from app.services.spoof_detection import DetectionParams, run_analysis
+
+    params = DetectionParams(
+        max_speed_mps=request.max_speed_mps,
+        min_travel_meters=request.min_travel_meters,
+        shared_min_users=request.shared_min_users
+    )
+    return await run_analysis(prisma, request.date_from, request.date_to, params)
+
+
+@router.get("/flags", response_model=List[ScanFlagResponse])
+async def list_scan_flags(
+    review_status: Optional[str] = Query("PENDING", pattern="^(PENDING|CONFIRMED|DISMISSED)$"),
+    reason: Optional[str] = None,
+    user_id: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    current_user = Depends(get_current_user)
+):
+    """
+    List flagged scans, most recent first
+
+    **Accessible by admin and teacher roles**
+
+    - **review_status**: PENDING (default), CONFIRMED or DISMISSED
+    - **reason**: Optional reason filter (e.g., IMPOSSIBLE_TRAVEL)
+    - **user_id**: Optional student filter
+    - **skip**: Number of records to skip (pagination)
+    - **limit**: Maximum number of records to return (max: 500)
+    """
+    require_admin_or_teacher(current_user)
+
+    where = {}
+    if review_status:
+        where["review_status"] = review_status
+    if reason:
+        where["reason"] = reason
+    if user_id:
+        where["user_id"] = user_id
+
+    return await prisma.scanflag.find_many(
+        where=where,
+        order=[{"scan_time": "desc"}, {"id": "desc"}],
+        skip=skip,
+        take=limit
+    )
+
+
+@router.post("/flags/{flag_id}/review", response_model=ScanFlagResponse)
+async def review_scan_flag(
+    flag_id: int,
+    review: ScanFlagReview,
+    current_user = Depends(get_current_user)
+):
+    """
+    Confirm or dismiss a flagged scan
+
+    **Accessible by admin and teacher roles**
+
+    - **flag_id**: ID of the flag
+    - **review_status**: CONFIRMED or DISMISSED
+    """
+    require_admin_or_teacher(current_user)
+
+    if review.review_status not in REVIEW_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid review_status. Must be: CONFIRMED or DISMISSED"
+        )
+
+    flag = await prisma.scanflag.update(
+        where={"id": flag_id},
+        data={
+            "review_status": review.review_status,
+            "reviewed_by": current_user.id,
+            "reviewed_at": datetime.utcnow()
+        }
+    )
+
+    if not flag:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Flag not found"
+        )
+
+    return flag
@@ -1,7 +1,7 @@
 """
 Pydantic schemas for request/response validation
 """
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
 from pydantic import BaseModel, EmailStr, Field
@@ -113,6 +113,16 @@ class ScanResponseAdvanced(BaseModel):
     user: UserResponse
 
 
+class ScanResponseCompact(BaseModel):
+    """Advanced scan response without the nested user (for mobile clients)"""
+    message: str
+    status: str
+    location_code: str
+    location_name: Optional[str] = None
+    distance_meters: float
+    timestamp: datetime
+
+
 class LocationResponse(BaseModel):
     """Schema for location data response"""
     id: str
@@ -145,3 +155,258 @@ class AccessLogResponseAdvanced(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+# ==================== Attendance Report Schemas ====================
+
+class AttendanceStatusCounts(BaseModel):
+    """Number of scans per attendance status"""
+    on_time: int = 0
+    late: int = 0
+    absent: int = 0
+    invalid_location: int = 0
+    expired: int = 0
+
+
+class LocationAttendanceSummary(BaseModel):
+    """Aggregated attendance figures for a location"""
+    total_scans: int
+    unique_students: int
+    counts: AttendanceStatusCounts
+    first_scan_at: Optional[datetime] = None
+    last_scan_at: Optional[datetime] = None
+    avg_distance_meters: Optional[float] = None
+    min_distance_meters: Optional[float] = None
+    max_distance_meters: Optional[float] = None
+    median_distance_meters: Optional[float] = None
+
+
+class StudentAttendanceRow(BaseModel):
+    """Per-student aggregate within a location report"""
+    user_id: str
+    full_name: str
+    email: str
+    scans: int
+    first_scan_at: datetime
+    first_status: Optional[str] = None
+    min_distance_meters: Optional[float] = None
+
+
+class LocationAttendanceReport(BaseModel):
+    """Paginated attendance report for a location"""
+    location_id: str
+    location_code: str
+    location_name: Optional[str] = None
+    class_start: datetime
+    class_end: datetime
+    summary: LocationAttendanceSummary
+    students: list[StudentAttendanceRow]
+    skip: int
+    limit: int
+    has_more: bool
+
+
+class StudentAttendanceSummary(BaseModel):
+    """Aggregated attendance figures for a student"""
+    total_scans: int
+    locations: int
+    counts: AttendanceStatusCounts
+    first_scan_at: Optional[datetime] = None
+    last_scan_at: Optional[datetime] = None
+    avg_distance_meters: Optional[float] = None
+    max_distance_meters: Optional[float] = None
+
+
+class StudentLocationRow(BaseModel):
+    """Per-location aggregate within a student report"""
+    location_id: Optional[str] = None
+    location_code: str
+    scans: int
+    counts: AttendanceStatusCounts
+    first_scan_at: datetime
+    avg_distance_meters: Optional[float] = None
+
+
+class StudentAttendanceReport(BaseModel):
+    """Paginated attendance report for a student"""
+    user_id: str
+    full_name: str
+    email: str
+    summary: StudentAttendanceSummary
+    locations: list[StudentLocationRow]
+    skip: int
+    limit: int
+    has_more: bool
+
+
+class DailyAttendanceRow(BaseModel):
+    """Rolled-up attendance counts for one location on one day"""
+    day: date
+    location_id: str
+    total_scans: int
+    on_time: int
+    late: int
+    absent: int
+    invalid_location: int
+    expired: int
+
+
+class RollupBackfillRequest(BaseModel):
+    """Schema for rebuilding daily attendance rollups"""
+    date_from: date = Field(..., description="First UTC day to rebuild")
+    date_to: date = Field(..., description="Last UTC day to rebuild (inclusive)")
+
+
+class RollupBackfillResponse(BaseModel):
+    """Result of a rollup backfill"""
+    days: int
+    rows: int
+
+
+# ==================== Security Schemas ====================
+
+class SpoofAnalysisRequest(BaseModel):
+    """Schema for running GPS spoofing detection over a time window"""
+    date_from: datetime = Field(..., description="Inclusive start of the window")
+    date_to: datetime = Field(..., description="Exclusive end of the window")
+    max_speed_mps: float = Field(50.0, gt=0, description="Fastest plausible travel speed (m/s)")
+    min_travel_meters: float = Field(500.0, ge=0, description="Ignore jumps shorter than this")
+    shared_min_users: int = Field(3, ge=2, description="Students sharing a coordinate to flag it")
+
+
+class SpoofAnalysisResponse(BaseModel):
+    """Result of a spoofing analysis run"""
+    scans_analyzed: int
+    flags_found: dict[str, int]
+    flags_stored: int
+
+
+class ScanFlagResponse(BaseModel):
+    """Schema for a flagged scan awaiting review"""
+    id: int
+    access_log_id: int
+    user_id: str
+    reason: str
+    score: float
+    scan_time: datetime
+    details: Optional[dict] = None
+    review_status: str
+    reviewed_by: Optional[str] = None
+    reviewed_at: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ScanFlagReview(BaseModel):
+    """Schema for resolving a flagged scan"""
+    review_status: str = Field(..., description="CONFIRMED or DISMISSED")
+
+
+# ==================== Enrollment Schemas ====================
+
+class EnrollmentCreate(BaseModel):
+    """Schema for enrolling students in a location"""
+    user_ids: list[str] = Field(..., min_length=1, max_length=2000, description="Student UUIDs")
+
+
+class EnrollmentResult(BaseModel):
+    """Result of an enrollment request"""
+    enrolled: int
+    already_enrolled: int
+
+
+class RosterStudent(BaseModel):
+    """Student entry in a roster or enrollment list"""
+    user_id: str
+    full_name: str
+    email: str
+
+
+class RosterCounts(BaseModel):
+    """Sizes of the roster sets"""
+    expected: int
+    present: int
+    on_time: int
+    late: int
+    missing: int
+    unexpected: int
+
+
+class LocationRoster(BaseModel):
+    """Expected vs. actual attendance of a location"""
+    location_id: str
+    location_code: str
+    location_name: Optional[str] = None
+    counts: RosterCounts
+    on_time: list[RosterStudent]
+    late: list[RosterStudent]
+    missing: list[RosterStudent]
+    unexpected: list[RosterStudent]
+
+
+# ==================== Location Catalogue Schemas ====================
+
+class LocationUpdate(BaseModel):
+    """Schema for updating a location (all fields optional)"""
+    location_code: Optional[str] = None
+    location_name: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    class_start: Optional[datetime] = None
+    class_end: Optional[datetime] = None
+    grace_period: Optional[int] = Field(None, ge=0, le=60)
+
+
+# ==================== User Purge Schemas ====================
+
+class PurgeJobResponse(BaseModel):
+    """Progress of a background user purge"""
+    id: int
+    user_id: str
+    requested_by: str
+    status: str
+    phase: Optional[str] = None
+    deleted_logs: int
+    detached_logs: int
+    deleted_locations: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+# ==================== Profiling Schemas ====================
+
+class ProfileInfo(BaseModel):
+    """A saved request profile"""
+    name: str
+    size_bytes: int
+    created_at: datetime
+
+
+# ==================== Health Schemas ====================
+
+class PoolStats(BaseModel):
+    """Prisma connection pool usage"""
+    open: int
+    busy: int
+    idle: int
+    active_queries: int
+    waiting_queries: int
+    saturation: float = Field(..., description="busy / open connections")
+
+
+class ReadinessResponse(BaseModel):
+    """Result of the readiness probe"""
+    status: str = Field(..., description="ready or not_ready")
+    startup_complete: bool
+    database: bool
+    database_latency_ms: float
+    pool: Optional[PoolStats] = None
+    replica: Optional[bool] = Field(None, description="Read replica in use (null: not configured)")
+    reasons: list[str] = []
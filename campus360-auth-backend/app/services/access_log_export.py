@@ -0,0 +1,190 @@
+"""
+Access log export for CAMPUS360
+Pages through access_logs with keyset pagination on (timestamp, id) and
+serializes each page as CSV or NDJSON, so memory stays constant
+regardless of export size
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from app.utils.attendance import to_utc_naive
+from app.utils.pagination import combine_where, keyset_where
+
+EXPORT_COLUMNS = (
+    "id",
+    "user_id",
+    "location_id",
+    "location_code",
+    "timestamp",
+    "status",
+    "user_latitude",
+    "user_longitude",
+    "distance_meters",
+)
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def build_export_filter(
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    location_id: Optional[str] = None,
+    status: Optional[str] = None,
+    user_id: Optional[str] = None
+) -> dict:
+    """
+    Build the Prisma filter for an export request
+
+    Args:
+        date_from: Optional inclusive lower bound on timestamp
+        date_to: Optional exclusive upper bound on timestamp
+        location_id: Optional location filter
+        status: Optional attendance status filter
+        user_id: Optional user filter
+
+    Returns:
+        Prisma WhereInput dictionary
+    """
+    where = {}
+    timestamp = {}
+    if date_from is not None:
+        timestamp["gte"] = to_utc_naive(date_from)
+    if date_to is not None:
+        timestamp["lt"] = to_utc_naive(date_to)
+    if timestamp:
+        where["timestamp"] = timestamp
+    if location_id is not None:
+        where["location_id"] = location_id
+    if status is not None:
+        where["status"] = status
+    if user_id is not None:
+        where["user_id"] = user_id
+    return where
+
+
+async def iter_access_log_pages(
+    db,
+    where: dict,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> AsyncIterator[list]:
+    """
+    Yield access logs page by page in (timestamp, id) order
+
+    Each page resumes strictly after the last row of the previous one,
+    so pages cost the same no matter how deep into the table they are.
+
+    Args:
+        db: Connected Prisma client
+        where: Base Prisma filter
+        chunk_size: Rows fetched per round trip
+
+    Yields:
+        Lists of AccessLog records (never empty)
+    """
+    last = None
+    while True:
+        page_where = where
+        if last is not None:
+            page_where = combine_where(where, keyset_where("timestamp", last.timestamp, last.id))
+
+        logs = await db.accesslog.find_many(
+            where=page_where,
+            order=[{"timestamp": "asc"}, {"id": "asc"}],
+            take=chunk_size
+        )
+        if not logs:
+            return
+
+        yield logs
+
+        if len(logs) < chunk_size:
+            return
+        last = logs[-1]
+
+
+def _row(log) -> list:
+    """Extract the exported columns of an access log in order"""
+    return [getattr(log, column) for column in EXPORT_COLUMNS]
+
+
+def json_default(value):
+    """Serialize datetimes as ISO 8601 strings"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def serialize_csv(logs: list, include_header: bool = False) -> str:
+    """
+    Serialize a page of access logs as CSV
+
+    Args:
+        logs: AccessLog records
+        include_header: Whether to prepend the header row
+
+    Returns:
+        CSV text for the page
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    if include_header:
+        writer.writerow(EXPORT_COLUMNS)
+    for log in logs:
+        writer.writerow([
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in _row(log)
+        ])
+    return buf.getvalue()
+
+
+def serialize_ndjson(logs: list) -> str:
+    """
+    Serialize a page of access logs as newline-delimited JSON
+
+    Args:
+        logs: AccessLog records
+
+    Returns:
+        NDJSON text for the page
+    """
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, _row(log))), default=json_default) + "\n"
+        for log in logs
+    )
+
+
+async def stream_export(
+    db,
+    where: dict,
+    export_format: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> AsyncIterator[str]:
+    """
+    Stream an access log export chunk by chunk
+
+    Args:
+        db: Connected Prisma client
+        where: Prisma filter selecting the rows to export
+        export_format: "csv" or "ndjson"
+        chunk_size: Rows fetched per round trip
+
+    Yields:
+        Serialized text chunks
+    """
+    if export_format == "csv":
+        # Always emit the header, even for an empty export
+        yield serialize_csv([], include_header=True)
+
+    async for logs in iter_access_log_pages(db, where, chunk_size):
+        if export_format == "csv":
+            yield serialize_csv(logs)
+        else:
+            yield serialize_ndjson(logs)
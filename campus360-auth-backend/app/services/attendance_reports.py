@@ -0,0 +1,205 @@
+"""
+Attendance reporting queries for CAMPUS360
+Aggregates access logs inside PostgreSQL (GROUP BY) so reports never
+materialize individual scans in Python
+"""
+from datetime import datetime
+from typing import Optional
+
+from app.services import attendance_rollup
+from app.utils.attendance import to_utc_naive
+
+# Per-status counters shared by every report query
+STATUS_COUNT_COLUMNS = """
+    COUNT(*) FILTER (WHERE l.status = 'ON_TIME')::int AS on_time,
+    COUNT(*) FILTER (WHERE l.status = 'LATE')::int AS late,
+    COUNT(*) FILTER (WHERE l.status = 'ABSENT')::int AS absent,
+    COUNT(*) FILTER (WHERE l.status = 'INVALID_LOCATION')::int AS invalid_location,
+    COUNT(*) FILTER (WHERE l.status = 'EXPIRED')::int AS expired
+"""
+
+STATUS_KEYS = ("on_time", "late", "absent", "invalid_location", "expired")
+
+
+def _split_status_counts(row: dict) -> dict:
+    """Move the per-status columns of a raw row into a nested 'counts' dict"""
+    row["counts"] = {key: row.pop(key) or 0 for key in STATUS_KEYS}
+    return row
+
+
+async def get_location_summary(db, location_id: str) -> dict:
+    """
+    Aggregate every scan recorded for a location into a single row
+
+    Status counts come from the daily rollup table; arrival times and
+    distance statistics are aggregated over the location's own logs
+    through idx_access_logs_location_id.
+
+    Args:
+        db: Connected Prisma client
+        location_id: ID of the location
+
+    Returns:
+        Dictionary with scan totals, per-status counts, first/last scan
+        times and distance statistics
+    """
+    totals = await attendance_rollup.get_location_totals(db, location_id)
+    row = await db.query_first(
+        """
+        SELECT
+            COUNT(DISTINCT l.user_id)::int AS unique_students,
+            MIN(l."timestamp") AS first_scan_at,
+            MAX(l."timestamp") AS last_scan_at,
+            AVG(l.distance_meters) AS avg_distance_meters,
+            MIN(l.distance_meters) AS min_distance_meters,
+            MAX(l.distance_meters) AS max_distance_meters,
+            percentile_cont(0.5) WITHIN GROUP (ORDER BY l.distance_meters) AS median_distance_meters
+        FROM access_logs l
+        WHERE l.location_id = $1
+        """,
+        location_id
+    )
+    return _split_status_counts({**dict(totals), **dict(row)})
+
+
+async def get_location_students(db, location_id: str, skip: int, limit: int) -> list[dict]:
+    """
+    One aggregated row per student who scanned a location
+
+    Students are ordered by their first scan, so the page reads like
+    an arrival list. Fetches limit + 1 rows so callers can tell whether
+    another page exists.
+
+    Args:
+        db: Connected Prisma client
+        location_id: ID of the location
+        skip: Number of students to skip
+        limit: Page size
+
+    Returns:
+        List of per-student dictionaries (at most limit + 1)
+    """
+    return await db.query_raw(
+        """
+        SELECT
+            l.user_id,
+            u.full_name,
+            u.email,
+            COUNT(*)::int AS scans,
+            MIN(l."timestamp") AS first_scan_at,
+            (array_agg(l.status ORDER BY l."timestamp"))[1] AS first_status,
+            MIN(l.distance_meters) AS min_distance_meters
+        FROM access_logs l
+        JOIN users u ON u.id = l.user_id
+        WHERE l.location_id = $1
+        GROUP BY l.user_id, u.full_name, u.email
+        ORDER BY first_scan_at, l.user_id
+        LIMIT $2 OFFSET $3
+        """,
+        location_id,
+        limit + 1,
+        skip
+    )
+
+
+def _user_range_filter(
+    user_id: str,
+    date_from: Optional[datetime],
+    date_to: Optional[datetime]
+) -> tuple[str, list]:
+    """Build the WHERE clause and parameters shared by the per-student queries"""
+    conditions = ["l.user_id = $1"]
+    params: list = [user_id]
+
+    if date_from is not None:
+        params.append(to_utc_naive(date_from))
+        conditions.append(f'l."timestamp" >= ${len(params)}::timestamp')
+    if date_to is not None:
+        params.append(to_utc_naive(date_to))
+        conditions.append(f'l."timestamp" < ${len(params)}::timestamp')
+
+    return " AND ".join(conditions), params
+
+
+async def get_student_summary(
+    db,
+    user_id: str,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> dict:
+    """
+    Aggregate a student's scans into a single row
+
+    Args:
+        db: Connected Prisma client
+        user_id: ID of the student
+        date_from: Optional inclusive lower bound on scan time
+        date_to: Optional exclusive upper bound on scan time
+
+    Returns:
+        Dictionary with totals, per-status counts, first/last scan times
+        and distance statistics
+    """
+    where, params = _user_range_filter(user_id, date_from, date_to)
+    row = await db.query_first(
+        f"""
+        SELECT
+            COUNT(*)::int AS total_scans,
+            COUNT(DISTINCT l.location_id)::int AS locations,
+            {STATUS_COUNT_COLUMNS},
+            MIN(l."timestamp") AS first_scan_at,
+            MAX(l."timestamp") AS last_scan_at,
+            AVG(l.distance_meters) AS avg_distance_meters,
+            MAX(l.distance_meters) AS max_distance_meters
+        FROM access_logs l
+        WHERE {where}
+        """,
+        *params
+    )
+    return _split_status_counts(dict(row))
+
+
+async def get_student_locations(
+    db,
+    user_id: str,
+    skip: int,
+    limit: int,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> list[dict]:
+    """
+    One aggregated row per location a student scanned, newest first
+
+    Args:
+        db: Connected Prisma client
+        user_id: ID of the student
+        skip: Number of locations to skip
+        limit: Page size
+        date_from: Optional inclusive lower bound on scan time
+        date_to: Optional exclusive upper bound on scan time
+
+    Returns:
+        List of per-location dictionaries (at most limit + 1)
+    """
+    where, params = _user_range_filter(user_id, date_from, date_to)
+    params.extend([limit + 1, skip])
+    rows = await db.query_raw(
+        f"""
+        SELECT
+            l.location_id,
+            MAX(l.location_code) AS location_code,
+            COUNT(*)::int AS scans,
+            {STATUS_COUNT_COLUMNS},
+            MIN(l."timestamp") AS first_scan_at,
+            AVG(l.distance_meters) AS avg_distance_meters
+        FROM access_logs l
+        WHERE {where}
+        -- Legacy /qr/scan logs have no location_id: keep one row per code
+        GROUP BY l.location_id, CASE WHEN l.location_id IS NULL THEN l.location_code END
+        -- The grouped key breaks ties so OFFSET pages never repeat or skip rows
+        ORDER BY first_scan_at DESC, l.location_id, MAX(l.location_code)
+        LIMIT ${len(params) - 1} OFFSET ${len(params)}
+        """,
+        *params
+    )
+    return [_split_status_counts(row) for row in rows]
@@ -0,0 +1,289 @@
+"""
+Daily attendance rollups for CAMPUS360
+Keeps per-day scan counts by (day, location_id, status) up to date at scan
+time, and rebuilds them from access_logs when they need repair
+"""
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from app.config import settings
+
+# Most deltas folded into the rollups per statement
+COMPACT_BATCH_SIZE = 10000
+
+
+async def record_scan(db, access_log) -> None:
+    """
+    Increment the rollup row for a freshly inserted access log
+
+    Must run in the same transaction as the access log insert so the
+    rollup never drifts from the table it summarizes. Scans without a
+    location or status (legacy /qr/scan) are not rolled up.
+
+    With ROLLUP_DELTAS the scan is written as a delta row instead, so
+    concurrent scans of one class do not queue on the same rollup row
+    lock; compact_deltas() folds them in later.
+
+    Args:
+        db: Prisma client or transaction
+        access_log: The AccessLog record that was just created
+    """
+    if access_log.location_id is None or access_log.status is None:
+        return
+
+    timestamp = access_log.timestamp
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+
+    if settings.ROLLUP_DELTAS:
+        query = """
+            INSERT INTO attendance_rollup_deltas (day, location_id, status, scans)
+            VALUES ($1::date, $2, $3, 1)
+        """
+    else:
+        query = """
+            INSERT INTO attendance_daily_rollups (day, location_id, status, scans, updated_at)
+            VALUES ($1::date, $2, $3, 1, NOW())
+            ON CONFLICT (day, location_id, status)
+            DO UPDATE SET scans = attendance_daily_rollups.scans + 1, updated_at = NOW()
+        """
+    await db.execute_raw(
+        query,
+        timestamp.date().isoformat(),
+        access_log.location_id,
+        access_log.status
+    )
+
+
+def subtract_sql(counts: str) -> str:
+    """
+    Statement taking scans out of the rollups, for a data-modifying CTE
+
+    Args:
+        counts: Name of a CTE with day, location_id (text), status and scans columns
+
+    Returns:
+        INSERT of negative deltas with ROLLUP_DELTAS, else an UPDATE of the rollup rows
+    """
+    if settings.ROLLUP_DELTAS:
+        return f"""
+            INSERT INTO attendance_rollup_deltas (day, location_id, status, scans)
+            SELECT day, location_id, status, -scans FROM {counts}
+        """
+    return f"""
+        UPDATE attendance_daily_rollups r
+        SET scans = r.scans - c.scans, updated_at = NOW()
+        FROM {counts} c
+        WHERE r.day = c.day AND r.location_id = c.location_id AND r.status = c.status
+    """
+
+
+def _rollups_source() -> str:
+    """Rollup rows to read from, including deltas not yet compacted"""
+    if settings.ROLLUP_DELTAS:
+        return """(
+            SELECT day, location_id, status, scans FROM attendance_daily_rollups
+            UNION ALL
+            SELECT day, location_id, status, scans FROM attendance_rollup_deltas
+        )"""
+    return "attendance_daily_rollups"
+
+
+async def compact_deltas(db, batch_size: int = COMPACT_BATCH_SIZE) -> int:
+    """
+    Fold the oldest deltas into the rollups in one statement
+
+    Each rollup row is updated once per batch, however many scans it
+    received. Rows locked by a concurrent compaction are skipped, so
+    several workers can compact at once without counting a delta twice.
+
+    Args:
+        db: Connected Prisma client
+        batch_size: Most deltas to fold
+
+    Returns:
+        Number of deltas folded
+    """
+    row = await db.query_first(
+        """
+        WITH moved AS (
+            DELETE FROM attendance_rollup_deltas
+            WHERE id IN (
+                SELECT id FROM attendance_rollup_deltas
+                ORDER BY id
+                LIMIT $1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING day, location_id, status, scans
+        ), folded AS (
+            INSERT INTO attendance_daily_rollups (day, location_id, status, scans, updated_at)
+            SELECT day, location_id, status, SUM(scans)::int, NOW()
+            FROM moved
+            GROUP BY 1, 2, 3
+            ON CONFLICT (day, location_id, status)
+            DO UPDATE SET scans = attendance_daily_rollups.scans + EXCLUDED.scans, updated_at = NOW()
+        )
+        SELECT COUNT(*)::int AS moved FROM moved
+        """,
+        batch_size
+    )
+    return row["moved"]
+
+
+async def run_compactor(db, interval_seconds: float) -> None:
+    """
+    Compact rollup deltas for as long as the app runs
+
+    Started from lifespan when ROLLUP_DELTAS is enabled.
+
+    Args:
+        db: Connected Prisma client
+        interval_seconds: Pause between compactions once the deltas are drained
+    """
+    while True:
+        try:
+            while await compact_deltas(db) == COMPACT_BATCH_SIZE:
+                pass
+        except Exception as e:
+            print(f"⚠️ Rollup compaction failed: {e}")
+        await asyncio.sleep(interval_seconds)
+
+
+async def backfill_day(db, day: date) -> int:
+    """
+    Rebuild the rollup rows of a single day from access_logs
+
+    Deletes and recomputes the day inside one transaction, so readers
+    see either the old or the new counts, never a partial day.
+
+    Args:
+        db: Connected Prisma client
+        day: UTC day to rebuild
+
+    Returns:
+        Number of rollup rows written
+    """
+    start = datetime.combine(day, datetime.min.time())
+    end = start + timedelta(days=1)
+
+    async with db.tx() as tx:
+        await tx.execute_raw(
+            "DELETE FROM attendance_daily_rollups WHERE day = $1::date",
+            day.isoformat()
+        )
+        if settings.ROLLUP_DELTAS:
+            await tx.execute_raw(
+                "DELETE FROM attendance_rollup_deltas WHERE day = $1::date",
+                day.isoformat()
+            )
+        return await tx.execute_raw(
+            """
+            INSERT INTO attendance_daily_rollups (day, location_id, status, scans, updated_at)
+            SELECT "timestamp"::date, location_id, status, COUNT(*)::int, NOW()
+            FROM access_logs
+            WHERE location_id IS NOT NULL
+              AND status IS NOT NULL
+              AND "timestamp" >= $1::timestamp
+              AND "timestamp" < $2::timestamp
+            GROUP BY 1, 2, 3
+            """,
+            start,
+            end
+        )
+
+
+async def backfill_range(db, date_from: date, date_to: date) -> dict:
+    """
+    Rebuild the rollups for every day in [date_from, date_to]
+
+    Works one day at a time to keep each transaction short.
+
+    Args:
+        db: Connected Prisma client
+        date_from: First UTC day to rebuild
+        date_to: Last UTC day to rebuild (inclusive)
+
+    Returns:
+        Dictionary with the number of days processed and rows written
+    """
+    days = 0
+    rows = 0
+    day = date_from
+    while day <= date_to:
+        rows += await backfill_day(db, day)
+        days += 1
+        day += timedelta(days=1)
+
+    return {"days": days, "rows": rows}
+
+
+async def get_daily_counts(
+    db,
+    date_from: date,
+    date_to: date,
+    location_id: Optional[str] = None
+) -> list[dict]:
+    """
+    Per-day, per-location status counts read from the rollup table
+
+    Args:
+        db: Connected Prisma client
+        date_from: First UTC day (inclusive)
+        date_to: Last UTC day (inclusive)
+        location_id: Optional location filter
+
+    Returns:
+        List of dictionaries with day, location_id and per-status counts
+    """
+    conditions = ["r.day >= $1::date", "r.day <= $2::date"]
+    params: list = [date_from.isoformat(), date_to.isoformat()]
+    if location_id is not None:
+        params.append(location_id)
+        conditions.append(f"r.location_id = ${len(params)}")
+
+    return await db.query_raw(
+        f"""
+        SELECT
+            r.day,
+            r.location_id,
+            SUM(r.scans)::int AS total_scans,
+            COALESCE(SUM(r.scans) FILTER (WHERE r.status = 'ON_TIME'), 0)::int AS on_time,
+            COALESCE(SUM(r.scans) FILTER (WHERE r.status = 'LATE'), 0)::int AS late,
+            COALESCE(SUM(r.scans) FILTER (WHERE r.status = 'ABSENT'), 0)::int AS absent,
+            COALESCE(SUM(r.scans) FILTER (WHERE r.status = 'INVALID_LOCATION'), 0)::int AS invalid_location,
+            COALESCE(SUM(r.scans) FILTER (WHERE r.status = 'EXPIRED'), 0)::int AS expired
+        FROM {_rollups_source()} r
+        WHERE {" AND ".join(conditions)}
+        GROUP BY r.day, r.location_id
+        ORDER BY r.day DESC, r.location_id
+        """,
+        *params
+    )
+
+
+async def get_location_totals(db, location_id: str) -> dict:
+    """
+    Lifetime status counts for a location, summed from the rollup table
+
+    Args:
+        db: Connected Prisma client
+        location_id: ID of the location
+
+    Returns:
+        Dictionary with total_scans and per-status counts
+    """
+    return await db.query_first(
+        f"""
+        SELECT
+            COALESCE(SUM(r.scans), 0)::int AS total_scans,
+            COALESCE(SUM(r.scans) FILTER (WHERE r.status = 'ON_TIME'), 0)::int AS on_time,
+            COALESCE(SUM(r.scans) FILTER (WHERE r.status = 'LATE'), 0)::int AS late,
+            COALESCE(SUM(r.scans) FILTER (WHERE r.status = 'ABSENT'), 0)::int AS absent,
+            COALESCE(SUM(r.scans) FILTER (WHERE r.status = 'INVALID_LOCATION'), 0)::int AS invalid_location,
+            COALESCE(SUM(r.scans) FILTER (WHERE r.status = 'EXPIRED'), 0)::int AS expired
+        FROM {_rollups_source()} r
+        WHERE r.location_id = $1
+        """,
+        location_id
+    )
@@ -0,0 +1,90 @@
+"""
+Location catalogue queries for CAMPUS360
+Builds listing filters and keeps the set of currently running classes in a
+background-refreshed cache
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.config import settings
+from app.utils.attendance import to_utc_naive
+from app.utils.cache import RefreshingCache
+
+# Classes starting this soon are kept in the cache so they show up as
+# active on time even if the next refresh is late
+ACTIVE_LOOKAHEAD = timedelta(hours=1)
+
+
+def build_location_filter(
+    created_by: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    code_prefix: Optional[str] = None
+) -> dict:
+    """
+    Build a Prisma filter for the location catalogue
+
+    Args:
+        created_by: Optional creator (teacher or admin) id
+        date_from: Optional inclusive lower bound on class_start
+        date_to: Optional exclusive upper bound on class_start
+        code_prefix: Optional location_code prefix (case-sensitive)
+
+    Returns:
+        Prisma WhereInput dictionary
+    """
+    where = {}
+    if created_by:
+        where["created_by"] = created_by
+    if date_from or date_to:
+        where["class_start"] = {}
+        if date_from:
+            where["class_start"]["gte"] = to_utc_naive(date_from)
+        if date_to:
+            where["class_start"]["lt"] = to_utc_naive(date_to)
+    if code_prefix:
+        where["location_code"] = {"startswith": code_prefix}
+    return where
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes from the database as UTC"""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def is_active(location, now: datetime) -> bool:
+    """Whether a class is running at the given (aware) time"""
+    return _as_utc(location.class_start) <= now < _as_utc(location.class_end)
+
+
+async def _load_current_locations() -> list:
+    """Locations running now or starting within ACTIVE_LOOKAHEAD"""
+    # Imported here: the Prisma repositories use build_location_filter
+    from app.dependencies import get_storage
+
+    now = datetime.now(timezone.utc)
+    return await get_storage().locations.list_running(now, now + ACTIVE_LOOKAHEAD)
+
+
+active_locations_cache = RefreshingCache(
+    _load_current_locations,
+    interval_seconds=settings.ACTIVE_LOCATIONS_REFRESH_SECONDS,
+    name="active_locations"
+)
+
+
+async def get_active_locations(created_by: Optional[str] = None) -> list:
+    """
+    Locations whose class is running right now, from the cache
+
+    Args:
+        created_by: Optional creator filter
+
+    Returns:
+        Active locations ordered by class_start
+    """
+    now = datetime.now(timezone.utc)
+    return [
+        location for location in await active_locations_cache.get()
+        if is_active(location, now) and (not created_by or location.created_by == created_by)
+    ]
@@ -0,0 +1,250 @@
+"""
+Access log archival for CAMPUS360
+Moves closed monthly partitions of access_logs into gzip-compressed JSONL
+files on local disk, and reads or restores them on demand
+"""
+import gzip
+import hashlib
+import json
+import os
+from datetime import date, datetime
+from typing import AsyncIterator, Iterator, Optional
+
+from app.services.access_log_export import EXPORT_COLUMNS, json_default
+from app.services.log_partitions import (
+    check_partition_name, list_partitions, month_start, partition_name, retention_cutoff
+)
+
+ARCHIVE_CHUNK_SIZE = 5000
+
+
+def archive_paths(archive_dir: str, name: str) -> tuple[str, str]:
+    """Paths of the data file and manifest for an archived partition"""
+    return (
+        os.path.join(archive_dir, f"{name}.jsonl.gz"),
+        os.path.join(archive_dir, f"{name}.manifest.json"),
+    )
+
+
+async def _iter_partition_rows(db, name: str) -> AsyncIterator[list[dict]]:
+    """Read a partition in (timestamp, id) order, one chunk at a time"""
+    columns = ", ".join(f'"{column}"' for column in EXPORT_COLUMNS)
+    last = None
+    while True:
+        if last is None:
+            rows = await db.query_raw(
+                f'SELECT {columns} FROM {name} ORDER BY "timestamp", id LIMIT $1',
+                ARCHIVE_CHUNK_SIZE
+            )
+        else:
+            rows = await db.query_raw(
+                f'SELECT {columns} FROM {name} '
+                f'WHERE ("timestamp", id) > ($1::timestamp, $2) '
+                f'ORDER BY "timestamp", id LIMIT $3',
+                last["timestamp"],
+                last["id"],
+                ARCHIVE_CHUNK_SIZE
+            )
+        if not rows:
+            return
+        yield rows
+        if len(rows) < ARCHIVE_CHUNK_SIZE:
+            return
+        last = rows[-1]
+
+
+def _iso(value) -> Optional[str]:
+    """ISO string of a timestamp; raw queries return them as strings already"""
+    if value is None or isinstance(value, str):
+        return value
+    return value.isoformat()
+
+
+async def archive_partition(db, name: str, archive_dir: str, drop: bool = True) -> dict:
+    """
+    Write a partition to <archive_dir>/<name>.jsonl.gz and optionally drop it
+
+    The partition is detached and dropped only after the file has been
+    fully written and its row count matches the table.
+
+    Args:
+        db: Connected Prisma client
+        name: Partition to archive (e.g., access_logs_y2025m03)
+        archive_dir: Directory for archive files
+        drop: Whether to detach and drop the partition afterwards
+
+    Returns:
+        The archive manifest
+    """
+    check_partition_name(name)
+    os.makedirs(archive_dir, exist_ok=True)
+    data_path, manifest_path = archive_paths(archive_dir, name)
+    tmp_path = data_path + ".tmp"
+
+    rows = 0
+    first_ts = last_ts = None
+    digest = hashlib.sha256()
+
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as out:
+        async for chunk in _iter_partition_rows(db, name):
+            for row in chunk:
+                line = json.dumps(row, default=json_default) + "\n"
+                digest.update(line.encode("utf-8"))
+                out.write(line)
+            rows += len(chunk)
+            first_ts = first_ts or chunk[0]["timestamp"]
+            last_ts = chunk[-1]["timestamp"]
+
+    expected = await db.query_first(f"SELECT COUNT(*)::int AS rows FROM {name}")
+    if expected["rows"] != rows:
+        os.remove(tmp_path)
+        raise RuntimeError(
+            f"Row count changed while archiving {name}: wrote {rows}, table has {expected['rows']}"
+        )
+
+    os.replace(tmp_path, data_path)
+    manifest = {
+        "partition": name,
+        "rows": rows,
+        "first_timestamp": _iso(first_ts),
+        "last_timestamp": _iso(last_ts),
+        "sha256": digest.hexdigest(),
+        "columns": list(EXPORT_COLUMNS),
+        "archived_at": datetime.utcnow().isoformat(),
+    }
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    if drop:
+        await db.execute_raw(f"ALTER TABLE access_logs DETACH PARTITION {name}")
+        await db.execute_raw(f"DROP TABLE {name}")
+
+    return manifest
+
+
+async def apply_retention(
+    db,
+    archive_dir: str,
+    retention_months: int,
+    today: Optional[date] = None
+) -> list[dict]:
+    """
+    Archive every partition that ends before the retention cutoff
+
+    Daily attendance rollups are left untouched, so dashboards keep
+    showing archived months.
+
+    Args:
+        db: Connected Prisma client
+        archive_dir: Directory for archive files
+        retention_months: Number of months to keep in the database
+        today: Reference day (default: today in UTC)
+
+    Returns:
+        Manifests of the archived partitions
+    """
+    cutoff = retention_cutoff(retention_months, today)
+    manifests = []
+    for partition in await list_partitions(db):
+        if partition["is_default"] or partition["upper_bound"] is None:
+            continue
+        if partition["upper_bound"] <= cutoff:
+            manifests.append(await archive_partition(db, partition["name"], archive_dir))
+    return manifests
+
+
+def list_archives(archive_dir: str) -> list[dict]:
+    """Manifests of every archive in archive_dir, oldest first"""
+    if not os.path.isdir(archive_dir):
+        return []
+
+    manifests = []
+    for filename in sorted(os.listdir(archive_dir)):
+        if filename.endswith(".manifest.json"):
+            with open(os.path.join(archive_dir, filename), encoding="utf-8") as f:
+                manifests.append(json.load(f))
+    return manifests
+
+
+def iter_archive(
+    path: str,
+    user_id: Optional[str] = None,
+    location_id: Optional[str] = None,
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> Iterator[dict]:
+    """
+    Stream the rows of an archive file that match the given filters
+
+    Args:
+        path: Path to a .jsonl.gz archive
+        user_id: Optional user filter
+        location_id: Optional location filter
+        status: Optional status filter
+        date_from: Optional inclusive lower bound on timestamp (naive UTC)
+        date_to: Optional exclusive upper bound on timestamp (naive UTC)
+
+    Yields:
+        Matching rows as dictionaries
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            row = json.loads(line)
+            if user_id is not None and row["user_id"] != user_id:
+                continue
+            if location_id is not None and row["location_id"] != location_id:
+                continue
+            if status is not None and row["status"] != status:
+                continue
+            if date_from is not None or date_to is not None:
+                timestamp = datetime.fromisoformat(row["timestamp"]).replace(tzinfo=None)
+                if date_from is not None and timestamp < date_from:
+                    continue
+                if date_to is not None and timestamp >= date_to:
+                    continue
+            yield row
+
+
+async def restore_archive(db, path: str, manifest: dict) -> int:
+    """
+    Load an archive back into access_logs
+
+    Monthly partitions covering the archive are recreated first, then rows
+    are inserted with their original ids in batches.
+
+    Args:
+        db: Connected Prisma client
+        path: Path to a .jsonl.gz archive
+        manifest: The archive's manifest
+
+    Returns:
+        Number of rows restored
+    """
+    if manifest["rows"] == 0:
+        return 0
+
+    first = datetime.fromisoformat(manifest["first_timestamp"]).date()
+    last = datetime.fromisoformat(manifest["last_timestamp"]).date()
+    month = month_start(first)
+    while month <= last:
+        name = partition_name(month)
+        await db.execute_raw(
+            f"CREATE TABLE IF NOT EXISTS {check_partition_name(name)} "
+            f"PARTITION OF access_logs FOR VALUES FROM ('{month.isoformat()}') "
+            f"TO ('{month_start(month, 1).isoformat()}')"
+        )
+        month = month_start(month, 1)
+
+    restored = 0
+    batch = []
+    for row in iter_archive(path):
+        row["timestamp"] = datetime.fromisoformat(row["timestamp"])
+        batch.append(row)
+        if len(batch) >= ARCHIVE_CHUNK_SIZE:
+            restored += await db.accesslog.create_many(data=batch, skip_duplicates=True)
+            batch = []
+    if batch:
+        restored += await db.accesslog.create_many(data=batch, skip_duplicates=True)
+
+    return restored
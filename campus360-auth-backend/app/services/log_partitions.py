@@ -0,0 +1,169 @@
+"""
+Monthly partition maintenance for access_logs
+Creates upcoming partitions ahead of time and lists the existing ones with
+their bounds (see migrations/005_partition_access_logs.sql)
+"""
+import asyncio
+import re
+from datetime import date, datetime, timezone
+from typing import Optional
+
+PARTITION_PREFIX = "access_logs_y"
+PARTITION_NAME = re.compile(r"^access_logs_(y\d{4}m\d{2}|legacy|default)$")
+
+
+def month_start(value: date, offset: int = 0) -> date:
+    """
+    First day of the month of value, shifted by offset months
+
+    Args:
+        value: Any day
+        offset: Number of months to move forward (negative moves back)
+
+    Returns:
+        First day of the resulting month
+    """
+    index = value.year * 12 + (value.month - 1) + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding the given month (e.g., access_logs_y2026m10)"""
+    return f"{PARTITION_PREFIX}{month.year:04d}m{month.month:02d}"
+
+
+def check_partition_name(name: str) -> str:
+    """
+    Validate a partition name before it is interpolated into SQL
+
+    Raises:
+        ValueError: If the name is not an access_logs partition
+    """
+    if not PARTITION_NAME.match(name):
+        raise ValueError(f"Not an access_logs partition: {name}")
+    return name
+
+
+def retention_cutoff(retention_months: int, today: Optional[date] = None) -> date:
+    """
+    First day that is still kept in the database
+
+    Whole months before the cutoff are eligible for archiving.
+
+    Args:
+        retention_months: Number of months to keep, including the current one
+        today: Reference day (default: today in UTC)
+
+    Returns:
+        First day of the oldest retained month
+    """
+    today = today or datetime.now(timezone.utc).date()
+    return month_start(today, -(retention_months - 1))
+
+
+async def ensure_partitions(db, months_ahead: int, today: Optional[date] = None) -> list[str]:
+    """
+    Create the partitions for the current month and the next months_ahead
+
+    Months already covered by the legacy partition are skipped.
+
+    Args:
+        db: Connected Prisma client
+        months_ahead: How many future months to prepare
+        today: Reference day (default: today in UTC)
+
+    Returns:
+        Names of the partitions that were created
+    """
+    today = today or datetime.now(timezone.utc).date()
+    existing = await list_partitions(db)
+    covered_until = max(
+        (p["upper_bound"] for p in existing
+         if p["lower_bound"] is None and p["upper_bound"] is not None),
+        default=None
+    )
+
+    created = []
+    for offset in range(months_ahead + 1):
+        start = month_start(today, offset)
+        end = month_start(today, offset + 1)
+        name = partition_name(start)
+        if any(p["name"] == name for p in existing):
+            continue
+        if covered_until is not None and end <= covered_until:
+            continue
+
+        await db.execute_raw(
+            f"CREATE TABLE IF NOT EXISTS {check_partition_name(name)} "
+            f"PARTITION OF access_logs FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        created.append(name)
+
+    return created
+
+
+async def list_partitions(db) -> list[dict]:
+    """
+    List the partitions of access_logs with their bounds and sizes
+
+    Args:
+        db: Connected Prisma client
+
+    Returns:
+        List of dicts with name, lower_bound, upper_bound (dates or None
+        for MINVALUE / DEFAULT) and approximate row count, oldest first
+    """
+    rows = await db.query_raw(
+        """
+        SELECT
+            c.relname AS name,
+            pg_get_expr(c.relpartbound, c.oid) AS bound,
+            c.reltuples::bigint AS approx_rows
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = 'access_logs'
+        ORDER BY c.relname
+        """
+    )
+
+    partitions = []
+    for row in rows:
+        bounds = re.findall(r"'(\d{4}-\d{2}-\d{2})[^']*'", row["bound"])
+        lower = upper = None
+        if "MINVALUE" in row["bound"] and bounds:
+            upper = date.fromisoformat(bounds[0])
+        elif len(bounds) == 2:
+            lower, upper = date.fromisoformat(bounds[0]), date.fromisoformat(bounds[1])
+        partitions.append({
+            "name": row["name"],
+            "lower_bound": lower,
+            "upper_bound": upper,
+            "is_default": row["bound"] == "DEFAULT",
+            "approx_rows": max(row["approx_rows"], 0),
+        })
+
+    partitions.sort(key=lambda p: (p["upper_bound"] is None, p["upper_bound"] or date.max))
+    return partitions
+
+
+async def maintain_partitions(db, months_ahead: int, interval_seconds: int = 6 * 3600) -> None:
+    """
+    Keep upcoming partitions created for as long as the app runs
+
+    Started from lifespan when ACCESS_LOG_PARTITIONING is enabled, so
+    scans never fall into the default partition at a month boundary.
+
+    Args:
+        db: Connected Prisma client
+        months_ahead: How many future months to prepare
+        interval_seconds: Time between checks
+    """
+    while True:
+        try:
+            created = await ensure_partitions(db, months_ahead)
+            for name in created:
+                print(f"✅ Created partition {name}")
+        except Exception as e:
+            print(f"⚠️ Partition maintenance failed: {e}")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,334 @@
+"""
+Event outbox for CAMPUS360
+Writes events about scans and user changes in the same transaction as the
+change, and delivers them in batches to other modules' webhooks
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.config import settings
+from app.utils.attendance import to_utc_naive
+from app.utils.metrics import OUTBOX_DELIVERY_LAG, OUTBOX_DELIVERY_LATENCY, OUTBOX_EVENTS
+
+ACCESS_LOG_CREATED = "access_log.created"
+USER_CREATED = "user.created"
+USER_UPDATED = "user.updated"
+USER_DELETED = "user.deleted"
+
+SIGNATURE_HEADER = "X-Campus360-Signature"
+
+# Advisory lock serializing claims across workers and instances, so a
+# claim always sees the leases committed by the previous one
+CLAIM_LOCK_KEY = "campus360:outbox-claim"
+
+# Delivered events are pruned at most this often
+PRUNE_INTERVAL_SECONDS = 3600
+
+# Set by notify() so the dispatcher does not wait for its next poll
+_wakeup: Optional[asyncio.Event] = None
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return getattr(value, "value", str(value))
+
+
+def access_log_payload(access_log) -> dict:
+    """Event payload for a recorded scan"""
+    return {
+        "id": access_log.id,
+        "user_id": access_log.user_id,
+        "location_id": access_log.location_id,
+        "location_code": access_log.location_code,
+        "status": getattr(access_log.status, "value", access_log.status),
+        "timestamp": access_log.timestamp,
+        "distance_meters": access_log.distance_meters,
+    }
+
+
+def user_payload(user) -> dict:
+    """Event payload for a created or updated user (never the password hash)"""
+    return {
+        "id": user.id,
+        "email": user.email,
+        "full_name": user.full_name,
+        "role": user.role,
+    }
+
+
+def transaction(db):
+    """
+    db.tx() when events are published, else db itself
+
+    Lets single-statement writes skip the transaction while the outbox
+    is disabled.
+    """
+    if settings.OUTBOX_ENABLED:
+        return db.tx()
+    return _without_transaction(db)
+
+
+@asynccontextmanager
+async def _without_transaction(db):
+    yield db
+
+
+async def enqueue(db, topic: str, key: str, payload: dict) -> None:
+    """
+    Write an event to the outbox (no-op unless OUTBOX_ENABLED)
+
+    Call with the transaction client of the change the event describes,
+    so the event exists if and only if the change was committed, and
+    call notify() after the commit.
+
+    Args:
+        db: Prisma transaction client
+        topic: Event type (e.g., "access_log.created")
+        key: Ordering key; events of one key are delivered in order
+        payload: JSON-serializable event data
+    """
+    if not settings.OUTBOX_ENABLED:
+        return
+    await db.execute_raw(
+        "INSERT INTO outbox_events (topic, key, payload) VALUES ($1, $2, $3::jsonb)",
+        topic,
+        key,
+        json.dumps(payload, default=_json_default)
+    )
+
+
+def notify() -> None:
+    """Wake the dispatcher of this process after committing events"""
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Delay before retrying an event that has failed `attempts` times before"""
+    return min(settings.OUTBOX_MAX_BACKOFF_SECONDS, settings.OUTBOX_BACKOFF_SECONDS * 2 ** attempts)
+
+
+def webhook_urls() -> list[str]:
+    """Configured webhook endpoints"""
+    return [url.strip() for url in settings.OUTBOX_WEBHOOK_URLS.split(",") if url.strip()]
+
+
+def sign(body: bytes, secret: str) -> str:
+    """HMAC-SHA256 signature of a request body, as sent in SIGNATURE_HEADER"""
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+async def claim_events(db, limit: int, lease_seconds: float) -> list[dict]:
+    """
+    Take the next deliverable events and hide them for lease_seconds
+
+    An event is skipped while an earlier event with the same key is
+    leased or waiting for a retry, so each key is delivered in order. If
+    the dispatcher dies, the lease runs out and the events are claimed
+    again (delivery is at least once).
+
+    Claims run one at a time under a transaction-level advisory lock
+    (session locks would not stick to one of Prisma's pooled
+    connections). A worker finding the lock taken claims nothing this
+    round; rows being settled by another worker are skipped.
+
+    Args:
+        db: Connected Prisma client
+        limit: Maximum events to claim
+        lease_seconds: How long the claimed events stay hidden
+
+    Returns:
+        Claimed events (id, topic, key, payload, attempts, created_at) in id order
+    """
+    async with db.tx() as tx:
+        lock = await tx.query_first(
+            "SELECT pg_try_advisory_xact_lock(hashtext($1)) AS locked", CLAIM_LOCK_KEY
+        )
+        if not lock["locked"]:
+            return []
+        rows = await tx.query_raw(
+            """
+            UPDATE outbox_events
+            SET next_attempt_at = now() + make_interval(secs => $2)
+            WHERE id IN (
+                SELECT e.id FROM outbox_events e
+                WHERE e.delivered_at IS NULL AND e.dead_at IS NULL
+                  AND e.next_attempt_at <= now()
+                  AND NOT EXISTS (
+                      SELECT 1 FROM outbox_events p
+                      WHERE p.key = e.key AND p.id < e.id
+                        AND p.delivered_at IS NULL AND p.dead_at IS NULL
+                        AND p.next_attempt_at > now()
+                  )
+                ORDER BY e.id
+                LIMIT $1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, topic, key, payload, attempts, created_at
+            """,
+            limit,
+            lease_seconds
+        )
+    return sorted(rows, key=lambda row: row["id"])
+
+
+async def mark_delivered(db, events: list[dict]) -> None:
+    """Record a successful delivery"""
+    now = datetime.utcnow()
+    await db.outboxevent.update_many(
+        where={"id": {"in": [event["id"] for event in events]}},
+        data={"delivered_at": now}
+    )
+    for event in events:
+        OUTBOX_EVENTS.labels(event["topic"], "delivered").inc()
+        created_at = event["created_at"]
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at)
+        OUTBOX_DELIVERY_LAG.observe((now - to_utc_naive(created_at)).total_seconds())
+
+
+async def mark_failed(db, events: list[dict], error: str) -> None:
+    """Schedule a retry with backoff, or give up after OUTBOX_MAX_ATTEMPTS"""
+    now = datetime.utcnow()
+    by_attempts: dict[int, list[dict]] = {}
+    for event in events:
+        by_attempts.setdefault(event["attempts"], []).append(event)
+
+    for attempts, group in by_attempts.items():
+        dead = attempts + 1 >= settings.OUTBOX_MAX_ATTEMPTS
+        data = {
+            "attempts": {"increment": 1},
+            "last_error": error[:1000],
+            "next_attempt_at": now + timedelta(seconds=backoff_seconds(attempts)),
+        }
+        if dead:
+            data["dead_at"] = now
+        await db.outboxevent.update_many(
+            where={"id": {"in": [event["id"] for event in group]}},
+            data=data
+        )
+        for event in group:
+            OUTBOX_EVENTS.labels(event["topic"], "dead" if dead else "retried").inc()
+        if dead:
+            print(f"❌ Giving up on {len(group)} outbox events after {attempts + 1} attempts: {error}")
+
+
+async def deliver(client, urls: list[str], events: list[dict]) -> Optional[str]:
+    """
+    POST a batch of events to every webhook
+
+    Args:
+        client: httpx.AsyncClient
+        urls: Webhook endpoints
+        events: Events in id order
+
+    Returns:
+        None if every endpoint answered 2xx, else the first error
+    """
+    body = json.dumps({"events": [
+        {key: event[key] for key in ("id", "topic", "key", "payload", "created_at")}
+        for event in events
+    ]}, default=_json_default).encode()
+    headers = {"Content-Type": "application/json"}
+    if settings.OUTBOX_WEBHOOK_SECRET:
+        headers[SIGNATURE_HEADER] = sign(body, settings.OUTBOX_WEBHOOK_SECRET)
+
+    error = None
+    for url in urls:
+        started = time.perf_counter()
+        try:
+            response = await client.post(url, content=body, headers=headers)
+            failure = None if response.is_success else f"{url}: HTTP {response.status_code}"
+        except Exception as e:
+            failure = f"{url}: {e!r}"
+        OUTBOX_DELIVERY_LATENCY.labels("failure" if failure else "success").observe(
+            time.perf_counter() - started
+        )
+        error = error or failure
+    return error
+
+
+async def dispatch_once(db, client, urls: list[str]) -> int:
+    """
+    Claim, deliver and settle one batch
+
+    A batch failing on any endpoint is retried as a whole; receivers
+    should ignore event ids they have already processed.
+
+    Returns:
+        Number of events claimed
+    """
+    lease_seconds = settings.OUTBOX_TIMEOUT_SECONDS * max(1, len(urls)) + 30
+    events = await claim_events(db, settings.OUTBOX_BATCH_SIZE, lease_seconds)
+    if not events:
+        return 0
+
+    error = await deliver(client, urls, events)
+    if error:
+        await mark_failed(db, events, error)
+    else:
+        await mark_delivered(db, events)
+    return len(events)
+
+
+async def prune_delivered(db, retention_days: int) -> int:
+    """Delete events delivered (or given up on) more than retention_days ago"""
+    return await db.execute_raw(
+        """
+        DELETE FROM outbox_events
+        WHERE COALESCE(delivered_at, dead_at) < now() - make_interval(days => $1)
+        """,
+        retention_days
+    )
+
+
+async def run_dispatcher(db) -> None:
+    """
+    Deliver outbox events for as long as the app runs
+
+    Started from lifespan when OUTBOX_ENABLED is set. Every worker runs
+    one; claim_events() keeps them from taking the same events or
+    delivering one key out of order.
+
+    Args:
+        db: Connected Prisma client
+    """
+    # Imported here so httpx is only loaded when the outbox is enabled
+    import httpx
+
+    urls = webhook_urls()
+    if not urls:
+        print("⚠️ OUTBOX_ENABLED without OUTBOX_WEBHOOK_URLS: events are stored but not delivered")
+        return
+
+    global _wakeup
+    _wakeup = asyncio.Event()
+    pruned_at = 0.0
+
+    async with httpx.AsyncClient(timeout=settings.OUTBOX_TIMEOUT_SECONDS) as client:
+        while True:
+            claimed = 0
+            try:
+                claimed = await dispatch_once(db, client, urls)
+                if time.monotonic() - pruned_at > PRUNE_INTERVAL_SECONDS:
+                    await prune_delivered(db, settings.OUTBOX_RETENTION_DAYS)
+                    pruned_at = time.monotonic()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Outbox dispatch failed: {e}")
+
+            # A full batch means more may be waiting: go again right away
+            if claimed < settings.OUTBOX_BATCH_SIZE:
+                _wakeup.clear()
+                try:
+                    await asyncio.wait_for(_wakeup.wait(), settings.OUTBOX_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
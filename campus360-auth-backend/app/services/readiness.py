@@ -0,0 +1,108 @@
+"""
+Readiness checks and warm-up for CAMPUS360
+Probes the database with a bounded timeout, reports Prisma pool usage and
+prefills caches before an instance starts taking traffic
+"""
+import asyncio
+import time
+from typing import Optional
+
+from app.services.locations import active_locations_cache
+from app.services.rosters import get_roster_index
+
+# Prisma engine gauges (requires the "metrics" preview feature)
+POOL_GAUGES = {
+    "prisma_pool_connections_open": "open",
+    "prisma_pool_connections_busy": "busy",
+    "prisma_pool_connections_idle": "idle",
+    "prisma_client_queries_active": "active_queries",
+    "prisma_client_queries_wait": "waiting_queries",
+}
+
+# Rosters of at most this many active locations are loaded during warm-up
+WARMUP_MAX_ROSTERS = 50
+
+
+async def check_database(db, timeout_seconds: float) -> tuple[bool, float, Optional[str]]:
+    """
+    Run SELECT 1 with a timeout
+
+    Args:
+        db: Prisma client
+        timeout_seconds: Maximum time to wait for the answer
+
+    Returns:
+        (reachable, latency in ms, error message or None)
+    """
+    if not db.is_connected():
+        return False, 0.0, "Not connected"
+
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(db.query_raw("SELECT 1 AS ok"), timeout_seconds)
+    except asyncio.TimeoutError:
+        return False, timeout_seconds * 1000, f"No answer within {timeout_seconds}s"
+    except Exception as e:
+        return False, (time.perf_counter() - started) * 1000, str(e)
+    return True, (time.perf_counter() - started) * 1000, None
+
+
+async def get_pool_stats(db) -> Optional[dict]:
+    """
+    Connection pool usage and queue depth from the Prisma engine
+
+    Args:
+        db: Connected Prisma client
+
+    Returns:
+        Dictionary with open/busy/idle connections and active/waiting
+        queries, or None if the engine does not expose metrics
+    """
+    try:
+        metrics = await db.get_metrics()
+    except Exception:
+        return None
+
+    stats = {name: 0 for name in POOL_GAUGES.values()}
+    for gauge in metrics.gauges:
+        if gauge.key in POOL_GAUGES:
+            stats[POOL_GAUGES[gauge.key]] = int(gauge.value)
+    stats["saturation"] = round(stats["busy"] / stats["open"], 2) if stats["open"] else 0.0
+    return stats
+
+
+async def warm_up(db) -> None:
+    """
+    Prefill caches and run the queries of the hot endpoints once
+
+    Loads the active locations cache, the roster indexes of the classes
+    currently running and the lookups done by get_current_user,
+    /qr/scan-advanced and /qr/history, so the first real requests find
+    warm caches, open connections and prepared query plans. Failures are
+    logged, not raised.
+
+    Args:
+        db: Connected Prisma client
+    """
+    started = time.perf_counter()
+    try:
+        locations = await active_locations_cache.refresh()
+        for location in locations[:WARMUP_MAX_ROSTERS]:
+            await get_roster_index(db, location.id)
+
+        user = await db.user.find_first(where={"deleted_at": None})
+        if user:
+            await db.user.find_unique(where={"id": user.id})
+            await db.accesslog.find_many(
+                where={"user_id": user.id},
+                order=[{"timestamp": "desc"}, {"id": "desc"}],
+                take=20
+            )
+        if locations:
+            await db.location.find_unique(where={"id": locations[0].id})
+    except Exception as e:
+        print(f"⚠️ Warm-up incomplete: {e}")
+        return
+
+    print(f"🔥 Warm-up finished in {(time.perf_counter() - started) * 1000:.0f} ms "
+          f"({len(locations)} active locations)")
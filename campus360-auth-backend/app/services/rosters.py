@@ -0,0 +1,186 @@
+"""
+Enrollment rosters for CAMPUS360
+Keeps each location's enrolled students as a dense index and answers
+"who is present / late / missing" with bitset operations
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from app.utils.cache import broadcast_invalidation, on_invalidation
+from app.utils.metrics import record_cache
+
+# Enrollment indexes are cached per process; enrollment changes invalidate
+# them in every worker through the shared state backend, and the TTL bounds
+# staleness if a broadcast is lost
+ROSTER_CACHE_TTL_SECONDS = 60
+
+
+def to_bitset(indexes: Iterable[int]) -> int:
+    """Build a bitset (Python int) with the given bit positions set"""
+    bits = 0
+    for index in indexes:
+        bits |= 1 << index
+    return bits
+
+
+def iter_bits(bits: int) -> Iterable[int]:
+    """Yield the positions of the set bits, lowest first"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+@dataclass
+class RosterIndex:
+    """Dense student index for a location's enrollments"""
+    location_id: str
+    student_ids: list[str]
+    positions: dict[str, int]
+    expected: int
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def build(cls, location_id: str, student_ids: list[str]) -> "RosterIndex":
+        """Assign bit positions 0..n-1 to the enrolled students"""
+        student_ids = sorted(set(student_ids))
+        return cls(
+            location_id=location_id,
+            student_ids=student_ids,
+            positions={user_id: n for n, user_id in enumerate(student_ids)},
+            expected=(1 << len(student_ids)) - 1,
+        )
+
+
+@dataclass
+class Roster:
+    """Expected, present and late sets of a location as bitsets"""
+    student_ids: list[str]
+    expected: int
+    present: int
+    late: int
+
+    @property
+    def on_time(self) -> int:
+        return self.present & ~self.late
+
+    @property
+    def missing(self) -> int:
+        return self.expected & ~self.present
+
+    @property
+    def unexpected(self) -> int:
+        """Students who scanned without being enrolled"""
+        return self.present & ~self.expected
+
+    def ids(self, bits: int) -> list[str]:
+        """Translate a bitset back to user ids"""
+        return [self.student_ids[index] for index in iter_bits(bits)]
+
+
+def build_roster(index: RosterIndex, on_time_ids: Iterable[str], late_ids: Iterable[str]) -> Roster:
+    """
+    Combine an enrollment index with the students who scanned
+
+    A student with both an ON_TIME and a LATE scan counts as on time.
+    Scanners who are not enrolled get positions after the enrolled ones.
+
+    Args:
+        index: Enrollment index of the location
+        on_time_ids: Students with at least one ON_TIME scan
+        late_ids: Students with at least one LATE scan
+
+    Returns:
+        Roster with expected, present and late bitsets
+    """
+    student_ids = index.student_ids
+    positions = index.positions
+    extra: dict[str, int] = {}
+
+    def position(user_id: str) -> int:
+        found = positions.get(user_id)
+        if found is None:
+            found = extra.setdefault(user_id, len(student_ids) + len(extra))
+        return found
+
+    on_time = to_bitset(position(user_id) for user_id in on_time_ids)
+    late = to_bitset(position(user_id) for user_id in late_ids) & ~on_time
+
+    return Roster(
+        student_ids=student_ids + list(extra),
+        expected=index.expected,
+        present=on_time | late,
+        late=late,
+    )
+
+
+_index_cache: dict[str, RosterIndex] = {}
+on_invalidation("roster_index", lambda location_id: _index_cache.pop(location_id, None))
+
+
+async def invalidate_roster(location_id: str) -> None:
+    """Drop the cached enrollment index of a location in every worker"""
+    await broadcast_invalidation("roster_index", location_id)
+
+
+async def get_roster_index(db, location_id: str) -> RosterIndex:
+    """
+    Enrollment index of a location, cached for ROSTER_CACHE_TTL_SECONDS
+
+    Args:
+        db: Connected Prisma client
+        location_id: ID of the location
+
+    Returns:
+        RosterIndex over the enrolled students
+    """
+    cached = _index_cache.get(location_id)
+    if cached and time.monotonic() - cached.loaded_at < ROSTER_CACHE_TTL_SECONDS:
+        record_cache("roster_index", hit=True)
+        return cached
+    record_cache("roster_index", hit=False)
+
+    rows = await db.query_raw(
+        "SELECT user_id FROM enrollments WHERE location_id = $1",
+        location_id
+    )
+    index = RosterIndex.build(location_id, [row["user_id"] for row in rows])
+    _index_cache[location_id] = index
+    return index
+
+
+async def get_roster(db, location_id: str, index: Optional[RosterIndex] = None) -> Roster:
+    """
+    Current roster of a location
+
+    Scans are reduced to one row per student in the database, so only
+    the ids of students who scanned are transferred.
+
+    Args:
+        db: Connected Prisma client
+        location_id: ID of the location
+        index: Enrollment index (loaded if not given)
+
+    Returns:
+        Roster for the location
+    """
+    index = index or await get_roster_index(db, location_id)
+    rows = await db.query_raw(
+        """
+        SELECT
+            user_id,
+            bool_or(status = 'ON_TIME') AS on_time,
+            bool_or(status = 'LATE') AS late
+        FROM access_logs
+        WHERE location_id = $1
+          AND status IN ('ON_TIME', 'LATE')
+        GROUP BY user_id
+        """,
+        location_id
+    )
+    return build_roster(
+        index,
+        on_time_ids=(row["user_id"] for row in rows if row["on_time"]),
+        late_ids=(row["user_id"] for row in rows if row["late"]),
+    )
@@ -0,0 +1,276 @@
+"""
+GPS spoofing detection for CAMPUS360
+Loads a time window of advanced scans into NumPy arrays and flags
+impossible travel, coordinates shared across students and implausible
+position precision, all in vectorized passes
+"""
+from dataclasses import dataclass
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import numpy as np
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.utils.attendance import to_utc_naive
+
+# Earth's radius in meters (same as app.utils.geolocation)
+EARTH_RADIUS_METERS = 6371000
+
+LOAD_WINDOW = timedelta(days=7)
+# Longitudes in units of 1e-7 degrees fit in (-COORD_KEY_SPAN / 2, COORD_KEY_SPAN / 2)
+COORD_KEY_SPAN = 4_000_000_000
+FLAG_INSERT_BATCH = 1000
+
+
+class FlagReason:
+    """Reasons a scan can be flagged for review"""
+    IMPOSSIBLE_TRAVEL = "IMPOSSIBLE_TRAVEL"
+    SHARED_COORDINATES = "SHARED_COORDINATES"
+    LOW_PRECISION = "LOW_PRECISION"
+    EXACT_LOCATION = "EXACT_LOCATION"
+
+
+@dataclass
+class DetectionParams:
+    """Thresholds used by detect_spoofing"""
+    # Faster than this between two scans of the same student (m/s, ~180 km/h)
+    max_speed_mps: float = 50.0
+    # Ignore jumps shorter than this (GPS jitter, building size)
+    min_travel_meters: float = 500.0
+    # Identical coordinates reported by this many different students
+    shared_min_users: int = 3
+    # Coordinates that are exact multiples of this many degrees (~11 m)
+    coarse_step_degrees: float = 1e-4
+    # Scans closer than this to the classroom's own coordinates
+    exact_location_meters: float = 0.01
+
+
+@dataclass
+class ScanWindow:
+    """Columnar view of the scans in an analysis window"""
+    ids: np.ndarray          # int64 access log ids
+    user_ids: np.ndarray     # object array of user ids
+    timestamps: np.ndarray   # float64 epoch seconds
+    latitudes: np.ndarray    # float64 degrees
+    longitudes: np.ndarray   # float64 degrees
+    distances: np.ndarray    # float64 meters from the location (NaN if unknown)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def haversine_vectorized(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Great-circle distance in meters between arrays of points
+
+    Same formula as app.utils.geolocation.haversine_distance, applied
+    element-wise.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(a) for a in (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_METERS * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def detect_spoofing(window: ScanWindow, params: Optional[DetectionParams] = None) -> list[dict]:
+    """
+    Flag suspicious scans in a window
+
+    Args:
+        window: Scans to analyze (any order)
+        params: Detection thresholds
+
+    Returns:
+        List of flag dictionaries with access_log_id, user_id, reason,
+        score, scan_time and details
+    """
+    params = params or DetectionParams()
+    if len(window) == 0:
+        return []
+
+    flags: list[dict] = []
+    # Dense integer code per student; a dict beats np.unique on object arrays
+    codes: dict = {}
+    user_codes = np.fromiter(
+        (codes.setdefault(user_id, len(codes)) for user_id in window.user_ids),
+        dtype=np.int64,
+        count=len(window)
+    )
+
+    def add(mask: np.ndarray, reason: str, scores: np.ndarray, details: Optional[list] = None):
+        for n, index in enumerate(np.flatnonzero(mask)):
+            flags.append({
+                "access_log_id": int(window.ids[index]),
+                "user_id": str(window.user_ids[index]),
+                "reason": reason,
+                "score": float(scores[index]),
+                "scan_time": datetime.fromtimestamp(
+                    float(window.timestamps[index]), timezone.utc
+                ).replace(tzinfo=None),
+                "details": details[n] if details else None,
+            })
+
+    # Impossible travel: consecutive scans of the same student
+    order = np.lexsort((window.timestamps, user_codes))
+    users = user_codes[order]
+    same_user = users[1:] == users[:-1]
+    lat, lon, ts = window.latitudes[order], window.longitudes[order], window.timestamps[order]
+    meters = haversine_vectorized(lat[:-1], lon[:-1], lat[1:], lon[1:])
+    seconds = np.maximum(ts[1:] - ts[:-1], 1.0)
+    speeds = meters / seconds
+    travel = same_user & (meters >= params.min_travel_meters) & (speeds > params.max_speed_mps)
+
+    travel_mask = np.zeros(len(window), dtype=bool)
+    travel_scores = np.zeros(len(window))
+    flagged_second = order[1:][travel]
+    travel_mask[flagged_second] = True
+    travel_scores[flagged_second] = speeds[travel]
+    travel_details = [
+        {"previous_access_log_id": int(window.ids[prev]), "meters": round(float(m), 1),
+         "seconds": round(float(s), 1)}
+        for prev, m, s in zip(order[:-1][travel], meters[travel], seconds[travel])
+    ]
+    # add() walks flagged rows in index order, so sort details the same way
+    travel_details = [d for _, d in sorted(zip(flagged_second, travel_details), key=lambda p: p[0])]
+    add(travel_mask, FlagReason.IMPOSSIBLE_TRAVEL, travel_scores, travel_details)
+
+    # Identical coordinates reported by several different students
+    # (coordinates compared at 1e-7 degrees, packed into one int64 key)
+    coord_keys = (
+        np.round(window.latitudes * 1e7).astype(np.int64) * COORD_KEY_SPAN
+        + np.round(window.longitudes * 1e7).astype(np.int64)
+    )
+    _, coord_codes = np.unique(coord_keys, return_inverse=True)
+    pairs = np.unique(coord_codes * len(codes) + user_codes)
+    users_per_coord = np.bincount(pairs // len(codes), minlength=coord_codes.max() + 1)
+    shared = users_per_coord[coord_codes]
+    add(shared >= params.shared_min_users, FlagReason.SHARED_COORDINATES, shared.astype(float))
+
+    # Hand-typed coordinates: both axes land exactly on a coarse grid
+    step = params.coarse_step_degrees
+    on_grid = (
+        np.isclose(window.latitudes / step, np.round(window.latitudes / step), rtol=0, atol=1e-6)
+        & np.isclose(window.longitudes / step, np.round(window.longitudes / step), rtol=0, atol=1e-6)
+    )
+    add(on_grid, FlagReason.LOW_PRECISION, np.ones(len(window)))
+
+    # Position copied from the classroom itself (what mock-location apps snap to)
+    exact = np.nan_to_num(window.distances, nan=np.inf) < params.exact_location_meters
+    add(exact, FlagReason.EXACT_LOCATION, np.ones(len(window)))
+
+    return flags
+
+
+async def load_scan_window(db, date_from: datetime, date_to: datetime) -> ScanWindow:
+    """
+    Load advanced scans between date_from and date_to into arrays
+
+    Each sub-window is fetched as a single row of Postgres arrays
+    (array_agg), which avoids building one Python dict per scan.
+
+    Args:
+        db: Connected Prisma client
+        date_from: Inclusive start of the window
+        date_to: Exclusive end of the window
+
+    Returns:
+        ScanWindow with every scan that has coordinates
+    """
+    start, end = to_utc_naive(date_from), to_utc_naive(date_to)
+    parts = []
+    while start < end:
+        stop = min(start + LOAD_WINDOW, end)
+        row = await db.query_first(
+            """
+            SELECT
+                array_agg(id::bigint) AS ids,
+                array_agg(user_id) AS user_ids,
+                array_agg(extract(epoch FROM "timestamp")::float8) AS timestamps,
+                array_agg(user_latitude) AS latitudes,
+                array_agg(user_longitude) AS longitudes,
+                array_agg(COALESCE(distance_meters, 'NaN'::float8)) AS distances
+            FROM access_logs
+            WHERE "timestamp" >= $1::timestamp
+              AND "timestamp" < $2::timestamp
+              AND user_latitude IS NOT NULL
+              AND user_longitude IS NOT NULL
+            """,
+            start,
+            stop
+        )
+        if row and row["ids"]:
+            parts.append(row)
+        start = stop
+
+    def column(key, dtype):
+        if not parts:
+            return np.array([], dtype=dtype)
+        return np.concatenate([np.asarray(part[key], dtype=dtype) for part in parts])
+
+    return ScanWindow(
+        ids=column("ids", np.int64),
+        user_ids=column("user_ids", object),
+        timestamps=column("timestamps", np.float64),
+        latitudes=column("latitudes", np.float64),
+        longitudes=column("longitudes", np.float64),
+        distances=column("distances", np.float64),
+    )
+
+
+async def save_flags(db, flags: list[dict]) -> int:
+    """
+    Write flags to the review table, skipping ones already recorded
+
+    Args:
+        db: Connected Prisma client
+        flags: Output of detect_spoofing
+
+    Returns:
+        Number of new flags stored
+    """
+    from prisma import Json
+
+    stored = 0
+    for i in range(0, len(flags), FLAG_INSERT_BATCH):
+        stored += await db.scanflag.create_many(
+            data=[
+                {**flag, "details": Json(flag["details"]) if flag["details"] else None}
+                for flag in flags[i:i + FLAG_INSERT_BATCH]
+            ],
+            skip_duplicates=True
+        )
+    return stored
+
+
+async def run_analysis(
+    db,
+    date_from: datetime,
+    date_to: datetime,
+    params: Optional[DetectionParams] = None
+) -> dict:
+    """
+    Analyze a time window and store the resulting flags
+
+    Args:
+        db: Connected Prisma client
+        date_from: Inclusive start of the window
+        date_to: Exclusive end of the window
+        params: Detection thresholds
+
+    Returns:
+        Dictionary with scans analyzed, flags found per reason and flags stored
+    """
+    window = await load_scan_window(db, date_from, date_to)
+    # CPU-bound work; keep it off the event loop
+    flags = await run_in_threadpool(detect_spoofing, window, params)
+    stored = await save_flags(db, flags)
+
+    return {
+        "scans_analyzed": len(window),
+        "flags_found": dict(Counter(flag["reason"] for flag in flags)),
+        "flags_stored": stored,
+    }
@@ -0,0 +1,103 @@
+"""
+Throttles for CAMPUS360
+Login failure limits and duplicate-scan windows kept in the shared state
+backend, so they hold across workers and instances
+"""
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.utils.state import get_state
+
+
+def _login_key(email: str, client_ip: str) -> str:
+    return f"login-failures:{email.lower()}:{client_ip}"
+
+
+async def check_login_allowed(email: str, client_ip: str) -> None:
+    """
+    Reject a login while an email/IP pair has too many recent failures
+
+    Raises:
+        HTTPException: 429 once LOGIN_MAX_FAILURES failures happened within
+            LOGIN_FAILURE_WINDOW_SECONDS
+    """
+    if not settings.LOGIN_MAX_FAILURES:
+        return
+    try:
+        failures = await get_state().get(_login_key(email, client_ip))
+    except Exception as e:
+        # Fail open: an unreachable state backend must not block logins
+        print(f"⚠️ Login throttle unavailable: {e}")
+        return
+
+    if failures and int(failures) >= settings.LOGIN_MAX_FAILURES:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts, try again later",
+            headers={"Retry-After": str(settings.LOGIN_FAILURE_WINDOW_SECONDS)},
+        )
+
+
+async def record_login_failure(email: str, client_ip: str) -> None:
+    """Count a failed login for an email/IP pair"""
+    if not settings.LOGIN_MAX_FAILURES:
+        return
+    try:
+        await get_state().incr(_login_key(email, client_ip), ttl=settings.LOGIN_FAILURE_WINDOW_SECONDS)
+    except Exception as e:
+        print(f"⚠️ Login throttle unavailable: {e}")
+
+
+async def clear_login_failures(email: str, client_ip: str) -> None:
+    """Reset the failure count after a successful login"""
+    if not settings.LOGIN_MAX_FAILURES:
+        return
+    try:
+        await get_state().delete(_login_key(email, client_ip))
+    except Exception as e:
+        print(f"⚠️ Login throttle unavailable: {e}")
+
+
+def _scan_key(user_id: str, location_code: str) -> str:
+    return f"scan:{user_id}:{location_code}"
+
+
+async def claim_scan(user_id: str, location_code: str) -> None:
+    """
+    Reject a repeated scan of the same location within SCAN_DEDUP_SECONDS
+
+    Call release_scan() if the scan is then not recorded, so the user can
+    try again right away.
+
+    Args:
+        user_id: Scanning user
+        location_code: Scanned location code (shared by /qr/scan and /qr/scan-advanced)
+
+    Raises:
+        HTTPException: 409 if the user already scanned this location in the window
+    """
+    if not settings.SCAN_DEDUP_SECONDS:
+        return
+    try:
+        claimed = await get_state().set_if_absent(
+            _scan_key(user_id, location_code), "1", ttl=settings.SCAN_DEDUP_SECONDS
+        )
+    except Exception as e:
+        print(f"⚠️ Scan deduplication unavailable: {e}")
+        return
+
+    if not claimed:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Scan already recorded in the last {settings.SCAN_DEDUP_SECONDS} seconds"
+        )
+
+
+async def release_scan(user_id: str, location_code: str) -> None:
+    """Drop a claim taken by claim_scan() for a scan that was not recorded"""
+    if not settings.SCAN_DEDUP_SECONDS:
+        return
+    try:
+        await get_state().delete(_scan_key(user_id, location_code))
+    except Exception as e:
+        print(f"⚠️ Scan deduplication unavailable: {e}")
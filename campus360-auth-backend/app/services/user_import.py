@@ -0,0 +1,228 @@
+"""
+Bulk user import for CAMPUS360
+Reads CSV or NDJSON uploads in batches, hashes passwords across a process
+pool and inserts users with create_many, reporting progress as it goes
+"""
+import asyncio
+import csv
+import io
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Iterator, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+
+from app.schemas.schemas import UserCreate
+from app.utils.auth_utils import hash_password
+
+IMPORT_BATCH_SIZE = 500
+HASH_WORKERS = os.cpu_count() or 1
+VALID_ROLES = ("admin", "teacher", "student")
+
+# Created on first import so regular requests never fork worker processes
+_hash_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_hash_pool() -> ProcessPoolExecutor:
+    """Return the shared bcrypt process pool, creating it on first use"""
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(max_workers=HASH_WORKERS)
+    return _hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    """Stop the bcrypt process pool if it was started"""
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    """Hash a slice of passwords (runs inside a pool worker)"""
+    return [hash_password(password) for password in passwords]
+
+
+async def hash_passwords_parallel(passwords: list[str]) -> list[str]:
+    """
+    Hash passwords using every core of the host
+
+    The batch is split into one slice per worker so each process pays
+    the pickling overhead once per slice instead of once per password.
+
+    Args:
+        passwords: Plain text passwords
+
+    Returns:
+        Hashed passwords in the same order
+    """
+    if not passwords:
+        return []
+
+    pool = get_hash_pool()
+    size = -(-len(passwords) // HASH_WORKERS)
+    slices = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *(loop.run_in_executor(pool, hash_passwords, chunk) for chunk in slices)
+    )
+    return list(itertools.chain.from_iterable(results))
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    """
+    Guess the upload format from its filename or content type
+
+    Returns:
+        "ndjson" or "csv"
+    """
+    name = (filename or "").lower()
+    kind = (content_type or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in kind or "jsonl" in kind:
+        return "ndjson"
+    return "csv"
+
+
+def iter_records(binary_file, import_format: str) -> Iterator[tuple[int, object]]:
+    """
+    Lazily read (row_number, record) pairs from an uploaded file
+
+    Malformed NDJSON lines are yielded as the exception that parsing
+    raised, so they can be reported without stopping the import.
+
+    Args:
+        binary_file: File object of the upload
+        import_format: "csv" or "ndjson"
+
+    Yields:
+        Tuples of 1-based data row number and a dict (or exception)
+    """
+    text = io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+
+    if import_format == "csv":
+        for number, row in enumerate(csv.DictReader(text), start=1):
+            yield number, row
+        return
+
+    number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            yield number, json.loads(line)
+        except ValueError as e:
+            yield number, e
+
+
+def _validate(record: object) -> UserCreate:
+    """Validate a raw record, raising ValueError with a readable message"""
+    if isinstance(record, Exception):
+        raise ValueError(f"Invalid JSON: {record}")
+    if not isinstance(record, dict):
+        raise ValueError("Record must be an object")
+
+    try:
+        user = UserCreate(**{key: value for key, value in record.items() if key})
+    except ValidationError as e:
+        raise ValueError("; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in e.errors()
+        ))
+
+    if user.role not in VALID_ROLES:
+        raise ValueError("Invalid role. Must be: admin, teacher, or student")
+    return user
+
+
+async def import_users(db, upload, import_format: str) -> AsyncIterator[dict]:
+    """
+    Import users from an upload, yielding progress and error events
+
+    For every batch: rows are validated, duplicate emails are rejected
+    against the rest of the file and against the database (one find_many
+    per batch), passwords are hashed in parallel and the valid rows are
+    written with a single create_many.
+
+    Args:
+        db: Connected Prisma client
+        upload: FastAPI UploadFile
+        import_format: "csv" or "ndjson"
+
+    Yields:
+        Event dictionaries: "error" per rejected row, "progress" per batch
+        and a final "summary"
+    """
+    records = iter_records(upload.file, import_format)
+    seen_emails: set[str] = set()
+    processed = created = failed = skipped = 0
+
+    while True:
+        batch = await run_in_threadpool(lambda: list(itertools.islice(records, IMPORT_BATCH_SIZE)))
+        if not batch:
+            break
+
+        valid: list[tuple[int, UserCreate]] = []
+        for number, record in batch:
+            try:
+                user = _validate(record)
+            except ValueError as e:
+                failed += 1
+                email = record.get("email") if isinstance(record, dict) else None
+                yield {"event": "error", "row": number, "email": email, "detail": str(e)}
+                continue
+
+            if user.email in seen_emails:
+                failed += 1
+                yield {"event": "error", "row": number, "email": user.email,
+                       "detail": "Duplicate email in file"}
+                continue
+
+            seen_emails.add(user.email)
+            valid.append((number, user))
+
+        # Reject emails that already exist with one query per batch
+        if valid:
+            existing = await db.user.find_many(
+                where={"email": {"in": [user.email for _, user in valid]}}
+            )
+            taken = {user.email for user in existing}
+            remaining = []
+            for number, user in valid:
+                if user.email in taken:
+                    failed += 1
+                    yield {"event": "error", "row": number, "email": user.email,
+                           "detail": "Email already registered"}
+                else:
+                    remaining.append((number, user))
+            valid = remaining
+
+        if valid:
+            hashes = await hash_passwords_parallel([user.password for _, user in valid])
+            inserted = await db.user.create_many(
+                data=[
+                    {
+                        "email": user.email,
+                        "password_hash": password_hash,
+                        "full_name": user.full_name,
+                        "role": user.role,
+                    }
+                    for (_, user), password_hash in zip(valid, hashes)
+                ],
+                skip_duplicates=True
+            )
+            created += inserted
+            # Rows created concurrently by someone else are skipped, not failed
+            skipped += len(valid) - inserted
+
+        processed += len(batch)
+        yield {"event": "progress", "processed": processed, "created": created,
+               "failed": failed, "skipped": skipped}
+
+    yield {"event": "summary", "processed": processed, "created": created,
+           "failed": failed, "skipped": skipped}
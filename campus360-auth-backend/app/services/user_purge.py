@@ -0,0 +1,214 @@
+"""
+Background user purge for CAMPUS360
+Deletes a soft-deleted user's dependent rows in small chunks with pauses,
+so removing a long-serving account never locks the scan tables for long
+"""
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from app.config import settings
+from app.services import attendance_rollup
+
+# Jobs whose worker has not reported for this long are taken over
+STALE_JOB_SECONDS = 120
+
+# Running purge tasks, kept referenced until they finish
+_tasks: set[asyncio.Task] = set()
+
+
+async def _touch(db, job_id: int, **data) -> None:
+    """Record progress on a job (also serves as its heartbeat)"""
+    await db.purgejob.update(
+        where={"id": job_id},
+        data={**data, "updated_at": datetime.utcnow()}
+    )
+
+
+async def _claim(db, job_id: int) -> bool:
+    """Atomically mark a job as running unless another worker is on it"""
+    claimed = await db.execute_raw(
+        """
+        UPDATE purge_jobs
+        SET status = 'RUNNING', updated_at = now()
+        WHERE id = $1
+          AND (status = 'PENDING'
+               OR (status = 'RUNNING' AND updated_at < now() - make_interval(secs => $2)))
+        """,
+        job_id,
+        STALE_JOB_SECONDS
+    )
+    return claimed > 0
+
+
+async def _delete_user_logs(db, user_id: str, chunk_size: int) -> int:
+    """
+    Delete one chunk of the user's scans through idx_access_logs_user_timestamp
+
+    The daily rollups of the deleted scans are decremented in the same
+    statement, so the totals never count purged rows.
+    """
+    row = await db.query_first(
+        f"""
+        WITH removed AS (
+            DELETE FROM access_logs
+            WHERE (id, "timestamp") IN (
+                SELECT id, "timestamp" FROM access_logs
+                WHERE user_id = $1
+                LIMIT $2
+            )
+            RETURNING "timestamp", location_id, status
+        ), counts AS (
+            SELECT "timestamp"::date AS day, location_id::text AS location_id,
+                   status::text AS status, COUNT(*)::int AS scans
+            FROM removed
+            WHERE location_id IS NOT NULL AND status IS NOT NULL
+            GROUP BY 1, 2, 3
+        ), adjusted AS ({attendance_rollup.subtract_sql("counts")})
+        SELECT COUNT(*)::int AS removed FROM removed
+        """,
+        user_id,
+        chunk_size
+    )
+    return row["removed"]
+
+
+async def _detach_location_logs(db, location_id: str, chunk_size: int) -> int:
+    """
+    Set location_id to NULL on one chunk of a location's scans
+
+    Detached scans leave the location's rollups in the same statement.
+    """
+    row = await db.query_first(
+        f"""
+        WITH detached AS (
+            UPDATE access_logs SET location_id = NULL
+            WHERE (id, "timestamp") IN (
+                SELECT id, "timestamp" FROM access_logs
+                WHERE location_id = $1
+                LIMIT $2
+            )
+            RETURNING "timestamp", status
+        ), counts AS (
+            SELECT "timestamp"::date AS day, $1::text AS location_id,
+                   status::text AS status, COUNT(*)::int AS scans
+            FROM detached
+            WHERE status IS NOT NULL
+            GROUP BY 1, 3
+        ), adjusted AS ({attendance_rollup.subtract_sql("counts")})
+        SELECT COUNT(*)::int AS detached FROM detached
+        """,
+        location_id,
+        chunk_size
+    )
+    return row["detached"]
+
+
+async def run_purge_job(
+    db,
+    job_id: int,
+    chunk_size: Optional[int] = None,
+    pause_seconds: Optional[float] = None
+) -> None:
+    """
+    Purge a soft-deleted user in bounded steps
+
+    Phases, each resumable after a restart:
+    1. Delete the user's access logs, chunk_size rows per statement
+    2. For each location the user created, detach its access logs in
+       chunks, then delete the location (enrollments and rollups cascade)
+    3. Delete the user row, whose remaining dependents are small
+
+    Args:
+        db: Connected Prisma client
+        job_id: ID of the PurgeJob
+        chunk_size: Rows per statement (default: USER_PURGE_CHUNK_SIZE)
+        pause_seconds: Sleep between statements (default: USER_PURGE_PAUSE_SECONDS)
+    """
+    chunk_size = chunk_size or settings.USER_PURGE_CHUNK_SIZE
+    pause_seconds = settings.USER_PURGE_PAUSE_SECONDS if pause_seconds is None else pause_seconds
+
+    if not await _claim(db, job_id):
+        return
+
+    job = await db.purgejob.find_unique(where={"id": job_id})
+    user_id = job.user_id
+    deleted_logs = job.deleted_logs
+    detached_logs = job.detached_logs
+    deleted_locations = job.deleted_locations
+
+    try:
+        await _touch(db, job_id, phase="ACCESS_LOGS")
+        while True:
+            removed = await _delete_user_logs(db, user_id, chunk_size)
+            if not removed:
+                break
+            deleted_logs += removed
+            await _touch(db, job_id, deleted_logs=deleted_logs)
+            await asyncio.sleep(pause_seconds)
+
+        await _touch(db, job_id, phase="LOCATIONS")
+        while True:
+            locations = await db.location.find_many(where={"created_by": user_id}, take=50)
+            if not locations:
+                break
+            for location in locations:
+                while True:
+                    detached = await _detach_location_logs(db, location.id, chunk_size)
+                    if not detached:
+                        break
+                    detached_logs += detached
+                    await _touch(db, job_id, detached_logs=detached_logs)
+                    await asyncio.sleep(pause_seconds)
+                await db.location.delete_many(where={"id": location.id})
+                deleted_locations += 1
+                await _touch(db, job_id, deleted_locations=deleted_locations)
+
+        await _touch(db, job_id, phase="USER")
+        await db.user.delete_many(where={"id": user_id})
+
+        await _touch(db, job_id, status="DONE", phase=None, finished_at=datetime.utcnow())
+        print(f"✅ Purged user {user_id} ({deleted_logs} logs, {deleted_locations} locations)")
+    except asyncio.CancelledError:
+        # Shutdown: hand the job back so the next start claims it right
+        # away instead of waiting for the heartbeat to go stale
+        try:
+            await _touch(db, job_id, status="PENDING")
+        except Exception as e:
+            print(f"⚠️ Could not release purge job {job_id}: {e}")
+        raise
+    except Exception as e:
+        await _touch(db, job_id, status="FAILED", error=str(e)[:1000])
+        print(f"⚠️ Purge of user {user_id} failed: {e}")
+
+
+def start_purge(db, job_id: int) -> asyncio.Task:
+    """Run a purge job in the background of the current event loop"""
+    task = asyncio.create_task(run_purge_job(db, job_id))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+
+async def resume_purge_jobs(db) -> int:
+    """
+    Restart purge jobs left unfinished by a previous process
+
+    Called from lifespan. Jobs still heartbeating in another worker are
+    skipped by the claim in run_purge_job.
+
+    Returns:
+        Number of jobs started
+    """
+    jobs = await db.purgejob.find_many(where={"status": {"in": ["PENDING", "RUNNING"]}})
+    for job in jobs:
+        start_purge(db, job.id)
+    return len(jobs)
+
+
+async def stop_purge_jobs() -> None:
+    """Cancel running purge tasks and wait for them to release their jobs (called on shutdown)"""
+    tasks = list(_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -3,7 +3,8 @@ Attendance validation utilities for time-based QR code scanning
 Determines attendance status based on scan time relative to class schedule
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 from enum import Enum
 
 
@@ -103,3 +104,20 @@ def get_status_color(status: AttendanceStatus) -> str:
         AttendanceStatus.EXPIRED: "#6b7280",      # Gray
     }
     return colors.get(status, "#6b7280")
+
+
+def to_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Normalize a datetime to naive UTC, the format Prisma stores in the database
+
+    Args:
+        value: Aware or naive datetime (naive values are assumed to be UTC)
+
+    Returns:
+        Naive UTC datetime, or None if value is None
+    """
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
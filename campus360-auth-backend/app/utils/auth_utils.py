@@ -5,20 +5,21 @@ Handles password hashing, JWT token creation/validation, and user authentication
 from datetime import datetime, timedelta
 from typing import Optional
 
-import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from prisma import Prisma
 
 from app.config import settings
+from app.dependencies import get_storage
+from app.repositories import Storage
+from app.utils.database import prisma, prisma_read  # noqa: F401 (re-exported)
+from app.utils.metrics import BCRYPT_LATENCY
+
+# bcrypt and python-jose are imported inside the functions below so that
+# startup (and /health) does not pay for loading them and cryptography
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-# Global Prisma instance (initialized in main.py)
-prisma = Prisma()
-
 
 def hash_password(password: str) -> str:
     """
@@ -30,10 +31,13 @@ def hash_password(password: str) -> str:
     Returns:
         Hashed password string
     """
+    import bcrypt
+
     # Convert password to bytes and hash it
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
+    with BCRYPT_LATENCY.labels("hash").time():
+        salt = bcrypt.gensalt()
+        hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
 
@@ -48,10 +52,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
+    import bcrypt
+
     # Convert both to bytes for bcrypt
     password_bytes = plain_password.encode('utf-8')
     hashed_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+    with BCRYPT_LATENCY.labels("verify").time():
+        return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -66,6 +73,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Returns:
         Encoded JWT token string
     """
+    from jose import jwt
+
     to_encode = data.copy()
     
     if expires_delta:
@@ -92,6 +101,8 @@ def verify_token(token: str) -> dict:
     Raises:
         HTTPException: If token is invalid or expired
     """
+    from jose import JWTError, jwt
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -105,12 +116,16 @@ def verify_token(token: str) -> dict:
         raise credentials_exception
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    storage: Storage = Depends(get_storage)
+):
     """
     Dependency to get the current authenticated user from JWT token
     
     Args:
         token: JWT token from Authorization header
+        storage: Repositories (see app.dependencies)
         
     Returns:
         User object from database
@@ -131,9 +146,10 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         raise credentials_exception
     
     # Fetch user from database
-    user = await prisma.user.find_unique(where={"id": user_id})
+    user = await storage.users.get(user_id)
     
-    if user is None:
+    # Tokens issued before a delete stop working right away
+    if user is None or user.deleted_at:
         raise credentials_exception
     
     return user
@@ -0,0 +1,126 @@
+"""
+In-process caches for CAMPUS360
+Holds small, frequently polled query results that are refreshed in the
+background instead of on every request, and invalidates them in all workers
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Generic, Optional, TypeVar
+
+from app.utils.metrics import record_cache
+from app.utils.state import get_state
+
+T = TypeVar("T")
+
+INVALIDATION_CHANNEL = "campus360:cache-invalidation"
+
+# Cache name -> function dropping one key ("" for the whole cache)
+_invalidation_handlers: dict[str, Callable[[str], None]] = {}
+
+
+def on_invalidation(name: str, handler: Callable[[str], None]) -> None:
+    """Register how a cache drops a key when any worker invalidates it"""
+    _invalidation_handlers[name] = handler
+
+
+async def broadcast_invalidation(name: str, key: str = "") -> None:
+    """
+    Invalidate a cache entry in this process and in every other worker
+
+    Args:
+        name: Cache name given to on_invalidation
+        key: Entry to drop ("" for the whole cache)
+    """
+    _invalidation_handlers[name](key)
+    try:
+        await get_state().publish(INVALIDATION_CHANNEL, f"{name}:{key}")
+    except Exception as e:
+        print(f"⚠️ Could not broadcast invalidation of {name}: {e}")
+
+
+async def listen_for_invalidations() -> None:
+    """Apply invalidations published by other workers (run as a task)"""
+    while True:
+        try:
+            async for message in get_state().subscribe(INVALIDATION_CHANNEL):
+                name, _, key = message.partition(":")
+                handler = _invalidation_handlers.get(name)
+                if handler:
+                    handler(key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Cache invalidation listener failed, reconnecting: {e}")
+            await asyncio.sleep(1)
+
+
+class RefreshingCache(Generic[T]):
+    """
+    A value reloaded by a background task every interval_seconds
+
+    Readers never wait for the database except on the first read, or
+    after invalidate() was called by a write in this process.
+    """
+
+    def __init__(self, loader: Callable[[], Awaitable[T]], interval_seconds: float, name: str = "cache"):
+        """
+        Args:
+            loader: Coroutine function returning a fresh value
+            interval_seconds: Time between background refreshes
+            name: Label used in log messages and invalidation broadcasts
+        """
+        self.loader = loader
+        self.interval_seconds = interval_seconds
+        self.name = name
+        self._value: Optional[T] = None
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        on_invalidation(name, lambda key: self.invalidate())
+
+    @property
+    def age_seconds(self) -> Optional[float]:
+        """Seconds since the value was loaded, or None if never loaded"""
+        if self._loaded_at is None:
+            return None
+        return time.monotonic() - self._loaded_at
+
+    async def refresh(self) -> T:
+        """Reload the value now"""
+        async with self._lock:
+            self._value = await self.loader()
+            self._loaded_at = time.monotonic()
+            return self._value
+
+    async def get(self) -> T:
+        """Return the cached value, loading it if missing or invalidated"""
+        record_cache(self.name, hit=self._loaded_at is not None)
+        if self._loaded_at is None:
+            async with self._lock:
+                if self._loaded_at is None:
+                    self._value = await self.loader()
+                    self._loaded_at = time.monotonic()
+        return self._value
+
+    def invalidate(self) -> None:
+        """Force the next get() to reload"""
+        self._loaded_at = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"⚠️ Refreshing {self.name} failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        """Start the background refresh task (called from lifespan)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop the background refresh task"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
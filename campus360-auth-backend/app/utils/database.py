@@ -0,0 +1,160 @@
+"""
+Database clients for CAMPUS360
+Builds Prisma connection URLs from the pool settings, creates the global
+clients and routes read-only queries to an optional replica
+"""
+import asyncio
+import time
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from prisma.engine.errors import EngineError
+from prisma.errors import ClientNotConnectedError, DataError, HTTPClientClosedError
+
+from app.config import settings
+from app.utils.metrics import InstrumentedPrisma
+
+# Errors meaning the replica cannot be reached (query errors are re-raised)
+REPLICA_UNAVAILABLE_ERRORS = (EngineError, ClientNotConnectedError, HTTPClientClosedError)
+
+# Query engine error codes for an unreachable database server: P1001 can't
+# reach it, P1002 timed out, P1017 closed the connection, P2024 pool timeout
+REPLICA_UNAVAILABLE_CODES = {"P1001", "P1002", "P1017", "P2024"}
+
+
+def is_unavailable_error(error: Exception) -> bool:
+    """Whether an error means the database cannot be reached, not that the query failed"""
+    if isinstance(error, REPLICA_UNAVAILABLE_ERRORS):
+        return True
+    if isinstance(error, DataError):
+        data = getattr(error, "data", None) or {}
+        return (data.get("user_facing_error") or {}).get("error_code") in REPLICA_UNAVAILABLE_CODES
+    return False
+
+
+def build_database_url(
+    url: str,
+    connection_limit: int = 0,
+    pool_timeout: int = 0,
+    statement_timeout_ms: int = 0
+) -> str:
+    """
+    Add Prisma pool parameters to a PostgreSQL connection URL
+
+    Parameters already present in the URL win over the settings, and
+    settings left at 0 keep Prisma's defaults.
+
+    Args:
+        url: postgresql:// connection URL
+        connection_limit: Connections in Prisma's pool
+        pool_timeout: Seconds a query waits for a free connection
+        statement_timeout_ms: Server-side statement_timeout for every session
+
+    Returns:
+        URL with the extra query parameters
+    """
+    parts = urlsplit(url)
+    params = dict(parse_qsl(parts.query, keep_blank_values=True))
+
+    if connection_limit:
+        params.setdefault("connection_limit", str(connection_limit))
+    if pool_timeout:
+        params.setdefault("pool_timeout", str(pool_timeout))
+    if statement_timeout_ms:
+        params.setdefault("options", f"-c statement_timeout={statement_timeout_ms}")
+
+    return urlunsplit(parts._replace(query=urlencode(params)))
+
+
+class ReplicaPrisma(InstrumentedPrisma):
+    """
+    Prisma client for a read replica that falls back to the primary
+
+    When the replica cannot be reached (at connect time or on a query,
+    whether its query engine or the database server is down), queries go
+    to the primary for retry_seconds before the replica is tried again,
+    reconnecting if the first connect failed. Only use it for reads:
+    results may lag the primary.
+    """
+
+    def __init__(self, *, primary: Optional[InstrumentedPrisma] = None, retry_seconds: float = 30, **kwargs):
+        """
+        Args:
+            primary: Client used while the replica is unavailable
+            retry_seconds: How long the replica is skipped after a failure
+            **kwargs: Passed to Prisma (e.g., datasource)
+        """
+        super().__init__(**kwargs)
+        self._primary = primary
+        self._retry_seconds = retry_seconds
+        self._down_until = 0.0
+        self._connect_lock = asyncio.Lock()
+
+    @property
+    def available(self) -> bool:
+        """Whether queries are currently sent to the replica"""
+        return self.is_connected() and time.monotonic() >= self._down_until
+
+    def _mark_down(self, error: Exception) -> None:
+        self._down_until = time.monotonic() + self._retry_seconds
+        print(f"⚠️ Read replica unavailable, using primary for {self._retry_seconds}s: {error}")
+
+    async def connect(self, *args, **kwargs) -> None:
+        """Connect to the replica; a failure only disables it"""
+        try:
+            await super().connect(*args, **kwargs)
+            print("✅ Connected to read replica")
+        except Exception as e:
+            if self._primary is None:
+                raise
+            self._mark_down(e)
+
+    async def disconnect(self, *args, **kwargs) -> None:
+        if self.is_connected():
+            await super().disconnect(*args, **kwargs)
+
+    async def _reconnect_if_due(self) -> None:
+        """Retry a failed connect once retry_seconds have passed"""
+        if self.is_connected() or time.monotonic() < self._down_until:
+            return
+        async with self._connect_lock:
+            if not self.is_connected() and time.monotonic() >= self._down_until:
+                await self.connect()
+
+    async def _execute(self, *, method, arguments, model=None, root_selection=None):
+        if self._primary is not None:
+            await self._reconnect_if_due()
+        if self._primary is not None and not self.available:
+            return await self._primary._execute(
+                method=method, arguments=arguments, model=model, root_selection=root_selection
+            )
+        try:
+            return await super()._execute(
+                method=method, arguments=arguments, model=model, root_selection=root_selection
+            )
+        except Exception as e:
+            if self._primary is None or not is_unavailable_error(e):
+                raise
+            self._mark_down(e)
+            return await self._primary._execute(
+                method=method, arguments=arguments, model=model, root_selection=root_selection
+            )
+
+
+# Global Prisma instance (initialized in main.py), timing every query
+prisma = InstrumentedPrisma(datasource={"url": build_database_url(
+    settings.DATABASE_URL,
+    connection_limit=settings.DATABASE_CONNECTION_LIMIT,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    statement_timeout_ms=settings.DATABASE_STATEMENT_TIMEOUT_MS,
+)})
+
+# Client for read-only endpoints: the replica when configured, else the primary
+prisma_read = prisma
+if settings.DATABASE_READ_URL:
+    prisma_read = ReplicaPrisma(primary=prisma, datasource={"url": build_database_url(
+        settings.DATABASE_READ_URL,
+        connection_limit=settings.DATABASE_READ_CONNECTION_LIMIT,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        statement_timeout_ms=settings.DATABASE_STATEMENT_TIMEOUT_MS,
+    )})
@@ -0,0 +1,61 @@
+"""
+Fast JSON responses for CAMPUS360 hot endpoints
+Serializes dicts built from trusted internal objects with orjson, skipping
+FastAPI's response_model validation pass (enabled by FAST_JSON)
+"""
+from typing import Any, Optional, Type
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson
+
+    Not used as the app's default_response_class: any custom default
+    disables FastAPI's own Pydantic-to-bytes path for every endpoint that
+    declares a response_model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        # OPT_UTC_Z matches the "Z" suffix Pydantic writes for UTC datetimes
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+def fields_of(source: Any, model: Type[BaseModel]) -> dict:
+    """
+    Copy the fields of a response model from a trusted object
+
+    Args:
+        source: Object with the model's fields as attributes (e.g., a Prisma model)
+        model: Response model whose field names are copied
+
+    Returns:
+        Dictionary with one entry per model field
+    """
+    return {name: getattr(source, name) for name in model.model_fields}
+
+
+def fast_response(content: Any, response: Optional[Response] = None, status_code: int = 200) -> Response:
+    """
+    Return already-shaped content without response_model validation
+
+    The endpoint is responsible for producing exactly the shape of its
+    response_model (see fields_of).
+
+    Args:
+        content: Dicts, lists and scalars (datetimes and enums included)
+        response: Injected Response whose headers (e.g., cursors) are kept
+        status_code: HTTP status code
+
+    Returns:
+        FastJSONResponse with the serialized content
+    """
+    headers = None
+    if response is not None:
+        headers = dict(response.headers)
+        headers.pop("content-length", None)
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
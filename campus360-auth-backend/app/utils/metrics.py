@@ -0,0 +1,139 @@
+"""
+Prometheus metrics for CAMPUS360
+Request latency middleware, a Prisma client that times every query (and
+counts it against the request's query budget), and histograms/counters for
+bcrypt, QR rendering, in-process caches and outbox deliveries
+"""
+import time
+
+from prisma import Prisma
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.utils.query_budget import record_query
+
+# Database and bcrypt work is mostly in the millisecond range
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+REQUEST_LATENCY = Histogram(
+    "campus360_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "campus360_http_requests_in_flight",
+    "HTTP requests currently being served",
+)
+DB_QUERY_LATENCY = Histogram(
+    "campus360_db_query_duration_seconds",
+    "Prisma query latency by model and operation",
+    ["model", "operation"],
+    buckets=FAST_BUCKETS,
+)
+DB_QUERY_ERRORS = Counter(
+    "campus360_db_query_errors_total",
+    "Prisma queries that raised",
+    ["model", "operation"],
+)
+BCRYPT_LATENCY = Histogram(
+    "campus360_bcrypt_duration_seconds",
+    "bcrypt hashing and verification time",
+    ["operation"],
+    buckets=FAST_BUCKETS,
+)
+QR_RENDER_LATENCY = Histogram(
+    "campus360_qr_render_duration_seconds",
+    "QR code PNG rendering time",
+    ["kind"],
+    buckets=FAST_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "campus360_cache_requests_total",
+    "In-process cache lookups (hit ratio = hit / (hit + miss))",
+    ["cache", "result"],
+)
+
+OUTBOX_EVENTS = Counter(
+    "campus360_outbox_events_total",
+    "Outbox events by delivery outcome (delivered, retried, dead)",
+    ["topic", "result"],
+)
+OUTBOX_DELIVERY_LATENCY = Histogram(
+    "campus360_outbox_delivery_duration_seconds",
+    "Time to POST one batch of events to a webhook",
+    ["result"],
+    buckets=FAST_BUCKETS,
+)
+OUTBOX_DELIVERY_LAG = Histogram(
+    "campus360_outbox_delivery_lag_seconds",
+    "Time from writing an event to delivering it",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup"""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+class InstrumentedPrisma(Prisma):
+    """
+    Prisma client that records the latency of every query
+
+    Every model action and raw query goes through _execute, including
+    those issued inside tx() (transaction clients are created from
+    self.__class__) and through partial models. Queries are also added
+    to the current request's QueryLog (see app.utils.query_budget).
+    """
+
+    async def _execute(self, *, method, arguments, model=None, root_selection=None):
+        model_name = getattr(model, "__prisma_model__", None) or "raw"
+        started = time.perf_counter()
+        try:
+            return await super()._execute(
+                method=method, arguments=arguments, model=model, root_selection=root_selection
+            )
+        except Exception:
+            DB_QUERY_ERRORS.labels(model_name, method).inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            DB_QUERY_LATENCY.labels(model_name, method).observe(elapsed)
+            record_query(model_name, method, arguments, elapsed)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency and in-flight requests
+
+    Latency is labelled with the matched route template (e.g.,
+    /admin/users/{user_id}), never the raw path, to keep label
+    cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.labels(scope["method"], template, str(status_code)).observe(
+                time.perf_counter() - started
+            )
@@ -0,0 +1,106 @@
+"""
+Keyset pagination helpers for CAMPUS360
+Builds Prisma filters that resume a (sort key, id) ordered scan after the
+last row of the previous page, and encodes page positions as opaque cursors
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+
+
+def keyset_where(
+    sort_field: str,
+    sort_value: Any,
+    row_id: Any,
+    descending: bool = False,
+    id_field: str = "id"
+) -> dict:
+    """
+    Build a Prisma filter selecting rows strictly after (sort_value, row_id)
+
+    Rows are assumed to be ordered by sort_field then id_field, both in
+    the same direction. Ties on sort_field are broken by id_field so no
+    row is skipped or repeated between pages.
+
+    Args:
+        sort_field: Name of the primary sort column (e.g., "timestamp")
+        sort_value: Value of sort_field in the last row of the previous page
+        row_id: Value of id_field in the last row of the previous page
+        descending: Whether the ordering is descending
+        id_field: Name of the tie-breaking unique column
+
+    Returns:
+        Prisma WhereInput dictionary
+    """
+    op = "lt" if descending else "gt"
+    return {
+        "OR": [
+            {sort_field: {op: sort_value}},
+            {"AND": [{sort_field: sort_value}, {id_field: {op: row_id}}]},
+        ]
+    }
+
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    """
+    Encode a (sort key, id) position as an opaque, URL-safe cursor
+
+    Args:
+        sort_value: Sort key of the row (datetimes are stored as ISO strings)
+        row_id: Unique id of the row
+
+    Returns:
+        Base64 cursor string
+    """
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, datetime_key: bool = True) -> tuple[Any, Any]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Opaque cursor string from a previous response
+        datetime_key: Whether the sort key is a datetime
+
+    Returns:
+        Tuple of (sort_value, row_id)
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if datetime_key:
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, row_id
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def combine_where(*clauses: Optional[dict]) -> dict:
+    """
+    AND together Prisma filters, ignoring empty ones
+
+    Args:
+        clauses: Prisma WhereInput dictionaries (None or {} are skipped)
+
+    Returns:
+        A single WhereInput dictionary
+    """
+    parts = [clause for clause in clauses if clause]
+    if not parts:
+        return {}
+    if len(parts) == 1:
+        return parts[0]
+    return {"AND": parts}
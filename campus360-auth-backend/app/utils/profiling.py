@@ -0,0 +1,134 @@
+"""
+On-demand request profiling for CAMPUS360
+Runs pyinstrument over single requests (admin header or sampling) and saves
+speedscope files; only installed when PROFILING_ENABLED is set
+"""
+import asyncio
+import os
+import random
+import re
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.config import settings
+from app.utils.auth_utils import verify_token
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_SUFFIX = ".speedscope.json"
+PROFILE_NAME = re.compile(r"^[\w.-]+\.speedscope\.json$")
+
+
+def _admin_requested(headers: dict) -> bool:
+    """Whether the request asks for a profile with an admin bearer token"""
+    if headers.get(PROFILE_HEADER) != b"1":
+        return False
+    authorization = headers.get(b"authorization", b"").decode("latin-1")
+    if not authorization.lower().startswith("bearer "):
+        return False
+    try:
+        return verify_token(authorization[7:]).get("role") == "admin"
+    except Exception:
+        return False
+
+
+def _write_profile(directory: str, name: str, content: str, keep: int) -> None:
+    """Write a profile and delete the oldest ones beyond keep"""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+        f.write(content)
+
+    profiles = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith(PROFILE_SUFFIX)),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    for entry in profiles[:-keep]:
+        os.remove(entry.path)
+
+
+def list_profiles(directory: str) -> list[dict]:
+    """Saved profiles, newest first"""
+    if not os.path.isdir(directory):
+        return []
+
+    profiles = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(PROFILE_SUFFIX):
+            stat = entry.stat()
+            profiles.append({
+                "name": entry.name,
+                "size_bytes": stat.st_size,
+                "created_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+            })
+    profiles.sort(key=lambda profile: profile["created_at"], reverse=True)
+    return profiles
+
+
+def profile_path(directory: str, name: str) -> Optional[str]:
+    """Path of a saved profile, or None if the name is invalid or missing"""
+    if not PROFILE_NAME.match(name):
+        return None
+    path = os.path.join(directory, name)
+    return path if os.path.isfile(path) else None
+
+
+class ProfilerMiddleware:
+    """
+    ASGI middleware profiling selected requests with pyinstrument
+
+    A request is profiled when it carries `X-Profile: 1` with an admin
+    bearer token, or at random with PROFILING_SAMPLE_RATE. One request is
+    profiled at a time; others run normally meanwhile. The saved file's
+    name is returned in the `X-Profile-Id` response header.
+
+    main.py only adds this middleware when PROFILING_ENABLED is set, so
+    it costs nothing otherwise.
+    """
+
+    def __init__(self, app):
+        # Imported here so pyinstrument is only loaded when profiling is on
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        self.app = app
+        self.profiler_class = Profiler
+        self.renderer_class = SpeedscopeRenderer
+        self.busy = False
+
+    def _selected(self, scope) -> bool:
+        if self.busy:
+            return False
+        if _admin_requested(dict(scope["headers"])):
+            return True
+        return settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self.busy = True
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        slug = re.sub(r"[^\w-]+", "_", scope["path"]).strip("_") or "root"
+        name = f"{stamp}_{scope['method']}_{slug[:80]}{PROFILE_SUFFIX}"
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-profile-id", name.encode())]
+            await send(message)
+
+        profiler = self.profiler_class(interval=settings.PROFILING_INTERVAL, async_mode="enabled")
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            self.busy = False
+            content = profiler.output(renderer=self.renderer_class())
+            await asyncio.to_thread(
+                _write_profile, settings.PROFILING_DIR, name, content, settings.PROFILING_KEEP
+            )
+            print(f"🔬 Profiled {scope['method']} {scope['path']} "
+                  f"({(time.perf_counter() - started) * 1000:.0f} ms) -> {name}")
@@ -0,0 +1,125 @@
+"""
+Sparse fieldset helpers for CAMPUS360
+Turns a `fields=` query parameter into a Prisma partial model (the query
+only selects those columns) and a trimmed Pydantic response model
+"""
+from functools import lru_cache
+from typing import Optional, Type
+
+from fastapi import HTTPException, Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, create_model
+
+
+def parse_fields(fields: Optional[str], response_model: Type[BaseModel]) -> Optional[tuple[str, ...]]:
+    """
+    Validate a comma-separated `fields` parameter against a response model
+
+    Args:
+        fields: Raw query parameter (e.g., "id,timestamp,status")
+        response_model: Model whose fields may be requested
+
+    Returns:
+        Requested field names in model order, or None for all fields
+
+    Raises:
+        HTTPException: If a field is unknown or the list is empty
+    """
+    if fields is None:
+        return None
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    allowed = response_model.model_fields
+    unknown = requested - allowed.keys()
+
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid fields. Allowed: {', '.join(allowed)}"
+        )
+
+    return tuple(name for name in allowed if name in requested)
+
+
+@lru_cache(maxsize=256)
+def trimmed_model(response_model: Type[BaseModel], fields: tuple[str, ...]) -> Type[BaseModel]:
+    """
+    Response model with only the given fields of response_model
+
+    Args:
+        response_model: Full response model
+        fields: Field names to keep
+
+    Returns:
+        A new Pydantic model (cached per field set)
+    """
+    source = response_model.model_fields
+    return create_model(
+        f"{response_model.__name__}_{'_'.join(fields)}",
+        __config__=response_model.model_config,
+        **{name: (source[name].annotation, source[name]) for name in fields}
+    )
+
+
+@lru_cache(maxsize=256)
+def partial_model(
+    prisma_base: type,
+    response_model: Type[BaseModel],
+    fields: tuple[str, ...],
+    always: tuple[str, ...] = ("id",)
+) -> type:
+    """
+    Prisma partial model selecting only the given columns
+
+    Queries issued through `Model.prisma(client)` select exactly the
+    fields declared on Model, so the database and the query engine never
+    read or transfer the other columns.
+
+    Args:
+        prisma_base: Generated Prisma base class (e.g., prisma.bases.BaseUser)
+        response_model: Model providing the field annotations
+        fields: Columns requested by the client
+        always: Columns the endpoint itself needs (e.g., cursor keys)
+
+    Returns:
+        A subclass of prisma_base (cached per field set)
+    """
+    source = response_model.model_fields
+    selected = [name for name in source if name in fields or name in always]
+    return create_model(
+        f"{prisma_base.__name__[4:]}Partial_{'_'.join(selected)}",
+        __base__=prisma_base,
+        **{name: (source[name].annotation, ...) for name in selected}
+    )
+
+
+def trimmed_response(
+    rows,
+    response_model: Type[BaseModel],
+    fields: tuple[str, ...],
+    response: Optional[Response] = None
+) -> JSONResponse:
+    """
+    Serialize rows with only the requested fields
+
+    Returned directly from an endpoint, bypassing its full response_model.
+
+    Args:
+        rows: A Prisma model or a list of them
+        response_model: Full response model of the endpoint
+        fields: Field names to keep
+        response: Injected Response whose headers (e.g., cursors) are kept
+
+    Returns:
+        JSONResponse with the trimmed object(s)
+    """
+    model = trimmed_model(response_model, fields)
+
+    def dump(row):
+        return model.model_validate(row, from_attributes=True).model_dump(mode="json")
+
+    content = [dump(row) for row in rows] if isinstance(rows, list) else dump(rows)
+    headers = dict(response.headers) if response is not None else None
+    if headers:
+        headers.pop("content-length", None)
+    return JSONResponse(content=content, headers=headers)
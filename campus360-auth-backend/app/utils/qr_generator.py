@@ -0,0 +1,41 @@
+"""
+QR code rendering for CAMPUS360
+Renders location and credential QR codes as PNG images
+"""
+from io import BytesIO
+
+from app.utils.metrics import QR_RENDER_LATENCY
+
+
+def render_qr_png(data: str, kind: str, error_correction: str = "L") -> BytesIO:
+    """
+    Render data as a black-on-white QR code PNG
+
+    Args:
+        data: Content encoded in the QR (location code, location ID or user ID)
+        kind: Label for the render-time metric (e.g., "location", "credential")
+        error_correction: Error correction level ("L", "M", "Q" or "H")
+
+    Returns:
+        Buffer positioned at the start of the PNG
+    """
+    # qrcode pulls in PIL; imported on first render to keep cold starts fast
+    import qrcode
+
+    with QR_RENDER_LATENCY.labels(kind).time():
+        # Create QR code instance
+        qr = qrcode.QRCode(
+            version=1,  # Size of QR code (1-40)
+            error_correction=getattr(qrcode.constants, f"ERROR_CORRECT_{error_correction}"),
+            box_size=10,
+            border=4,
+        )
+        qr.add_data(data)
+        qr.make(fit=True)
+
+        img = qr.make_image(fill_color="black", back_color="white")
+
+        buf = BytesIO()
+        img.save(buf, format='PNG')
+        buf.seek(0)
+        return buf
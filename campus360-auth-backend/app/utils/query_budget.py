@@ -0,0 +1,128 @@
+"""
+Per-request database query accounting for CAMPUS360
+Counts and times the Prisma round trips of each request and logs requests
+over QUERY_BUDGET or repeating one query shape (N+1 patterns)
+"""
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from prometheus_client import Histogram
+
+from app.config import settings
+
+# Defined here rather than in app/utils/metrics.py, whose Prisma client
+# imports record_query from this module
+DB_QUERIES_PER_REQUEST = Histogram(
+    "campus360_db_queries_per_request",
+    "Prisma queries issued while serving a request, by route template",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 64),
+)
+
+
+@dataclass
+class QueryLog:
+    """Queries issued while serving one request"""
+    count: int = 0
+    seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Query shapes issued at least threshold times, most frequent first"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+# Log of the request being served (None outside QueryBudgetMiddleware)
+_current: ContextVar[Optional[QueryLog]] = ContextVar("query_log", default=None)
+
+
+def _skeleton(value: Any) -> str:
+    """Argument structure with the values left out"""
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{key}:{_skeleton(item)}" for key, item in sorted(value.items())) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(sorted({_skeleton(item) for item in value})) + "]"
+    return "?"
+
+
+def query_shape(model: str, method: str, arguments: dict) -> str:
+    """
+    Identify queries that differ only in their values
+
+    Raw queries are identified by their SQL text, model actions by the
+    keys of their arguments (e.g., user.find_unique({where:{id:?}})).
+    """
+    if "query" in arguments and isinstance(arguments["query"], str):
+        return f"{model}.{method}({' '.join(arguments['query'].split())})"
+    return f"{model}.{method}({_skeleton(arguments)})"
+
+
+def record_query(model: str, method: str, arguments: dict, seconds: float) -> None:
+    """Add a query to the current request's log (no-op outside a request)"""
+    log = _current.get()
+    if log is None:
+        return
+    log.count += 1
+    log.seconds += seconds
+    log.shapes[query_shape(model, method, arguments)] += 1
+
+
+def current_query_log() -> Optional[QueryLog]:
+    """Log of the request being served, if any"""
+    return _current.get()
+
+
+class QueryBudgetMiddleware:
+    """
+    ASGI middleware giving every request its own QueryLog
+
+    After the response, requests over QUERY_BUDGET queries and query
+    shapes repeated QUERY_REPEAT_THRESHOLD times are logged, and the count
+    is observed in campus360_db_queries_per_request. With
+    QUERY_STATS_HEADER the response carries `X-Query-Count` and
+    `X-Query-Time-Ms` (queries issued before the response started).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        log = QueryLog()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and settings.QUERY_STATS_HEADER:
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-query-count", str(log.count).encode()),
+                    (b"x-query-time-ms", f"{log.seconds * 1000:.1f}".encode()),
+                ]
+            await send(message)
+
+        token = _current.set(log)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+            _report(scope["method"], template, log, time.perf_counter() - started)
+
+
+def _report(method: str, template: str, log: QueryLog, elapsed: float) -> None:
+    DB_QUERIES_PER_REQUEST.labels(method, template).observe(log.count)
+
+    if settings.QUERY_BUDGET and log.count > settings.QUERY_BUDGET:
+        print(f"⚠️ {method} {template} issued {log.count} queries "
+              f"({log.seconds * 1000:.0f} of {elapsed * 1000:.0f} ms), budget {settings.QUERY_BUDGET}")
+
+    if not settings.QUERY_REPEAT_THRESHOLD:
+        return
+    for shape, n in log.repeated(settings.QUERY_REPEAT_THRESHOLD):
+        print(f"⚠️ Possible N+1 in {method} {template}: {shape} ran {n} times")
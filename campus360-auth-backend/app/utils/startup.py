@@ -0,0 +1,61 @@
+"""
+Background startup for CAMPUS360
+Lets the app answer /health while the database connection and warm-up
+finish in the background (enabled by BACKGROUND_STARTUP)
+"""
+import json
+from typing import Optional
+
+# Paths served before startup has finished
+ALWAYS_OPEN_PREFIXES = ("/health", "/metrics")
+
+
+class StartupState:
+    """Progress of the background startup"""
+
+    def __init__(self):
+        self.ready = False
+        self.error: Optional[str] = None
+
+    def mark_ready(self) -> None:
+        self.ready = True
+        self.error = None
+
+    def mark_failed(self, error: Exception) -> None:
+        self.error = str(error)
+
+
+startup_state = StartupState()
+
+
+class StartupGateMiddleware:
+    """
+    ASGI middleware answering 503 until startup_state is ready
+
+    /health and /metrics are always served so the platform's health check
+    passes while the database connection is still being established.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or startup_state.ready
+            or scope["path"].startswith(ALWAYS_OPEN_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Service is starting, retry shortly"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", b"2"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
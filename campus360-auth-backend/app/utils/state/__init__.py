@@ -0,0 +1,57 @@
+"""
+Shared state for CAMPUS360
+Selects the backend from STATE_BACKEND: memory (one worker), shm (workers
+on one host) or redis (several hosts)
+"""
+from typing import Optional
+
+from app.config import settings
+from app.utils.state.base import StateBackend
+
+_backend: Optional[StateBackend] = None
+
+
+def create_backend(kind: str, shm_path: str = "", redis_url: str = "") -> StateBackend:
+    """
+    Build a state backend
+
+    Args:
+        kind: "memory", "shm" or "redis"
+        shm_path: SQLite file for "shm"
+        redis_url: Server URL for "redis"
+
+    Returns:
+        The backend
+
+    Raises:
+        ValueError: If kind is unknown
+    """
+    if kind == "memory":
+        from app.utils.state.memory import MemoryBackend
+        return MemoryBackend()
+    if kind == "shm":
+        from app.utils.state.shm import SharedMemoryBackend
+        return SharedMemoryBackend(shm_path)
+    if kind == "redis":
+        from app.utils.state.resp import RESPBackend
+        return RESPBackend(redis_url)
+    raise ValueError(f"Unknown STATE_BACKEND: {kind}")
+
+
+def get_state() -> StateBackend:
+    """The process-wide state backend configured in settings"""
+    global _backend
+    if _backend is None:
+        _backend = create_backend(settings.STATE_BACKEND, settings.STATE_SHM_PATH, settings.STATE_REDIS_URL)
+    return _backend
+
+
+async def close_state() -> None:
+    """Close the process-wide backend (called from lifespan)"""
+    global _backend
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
+
+
+__all__ = ["StateBackend", "close_state", "create_backend", "get_state"]
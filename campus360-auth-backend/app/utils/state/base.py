@@ -0,0 +1,52 @@
+"""
+Shared state interface for CAMPUS360
+Key/value with TTL, atomic counters and pub/sub, implemented per process,
+per host (shared memory) or across hosts (Redis protocol)
+"""
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional
+
+
+class StateBackend(ABC):
+    """
+    Storage for state that must be consistent across workers
+
+    Keys and values are strings. TTLs are in seconds; a key without TTL
+    lives until deleted.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Value of a key, or None if missing or expired"""
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Store a value, replacing any previous one"""
+
+    @abstractmethod
+    async def set_if_absent(self, key: str, value: str, ttl: Optional[float] = None) -> bool:
+        """Store a value only if the key is missing; True if it was stored"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove a key"""
+
+    @abstractmethod
+    async def incr(self, key: str, ttl: Optional[float] = None) -> int:
+        """
+        Atomically add 1 to a counter and return the new value
+
+        The TTL is set when the counter is created, so the counter covers a
+        fixed window starting at its first increment.
+        """
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str) -> None:
+        """Send a message to every subscriber of a channel, in all workers"""
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> AsyncIterator[str]:
+        """Iterate over the messages published to a channel from now on"""
+
+    async def close(self) -> None:
+        """Release connections and files"""
@@ -0,0 +1,68 @@
+"""
+In-process state backend for CAMPUS360
+Default for a single worker; state is lost on restart and not shared
+"""
+import asyncio
+import time
+from typing import AsyncIterator, Optional
+
+from app.utils.state.base import StateBackend
+
+
+class MemoryBackend(StateBackend):
+    """StateBackend kept in a dict; expired keys are dropped on access"""
+
+    def __init__(self):
+        self._values: dict[str, tuple[str, Optional[float]]] = {}
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+
+    def _live(self, key: str) -> Optional[str]:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._values[key]
+            return None
+        return value
+
+    @staticmethod
+    def _expiry(ttl: Optional[float]) -> Optional[float]:
+        return time.monotonic() + ttl if ttl else None
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._live(key)
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        self._values[key] = (value, self._expiry(ttl))
+
+    async def set_if_absent(self, key: str, value: str, ttl: Optional[float] = None) -> bool:
+        if self._live(key) is not None:
+            return False
+        self._values[key] = (value, self._expiry(ttl))
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._values.pop(key, None)
+
+    async def incr(self, key: str, ttl: Optional[float] = None) -> int:
+        current = self._live(key)
+        if current is None:
+            self._values[key] = ("1", self._expiry(ttl))
+            return 1
+        value = int(current) + 1
+        self._values[key] = (str(value), self._values[key][1])
+        return value
+
+    async def publish(self, channel: str, message: str) -> None:
+        for queue in self._subscribers.get(channel, ()):
+            queue.put_nowait(message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[str]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(channel, set()).add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers[channel].discard(queue)
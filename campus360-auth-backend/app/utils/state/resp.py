@@ -0,0 +1,140 @@
+"""
+Redis-protocol state backend for CAMPUS360
+Minimal RESP2 client (asyncio streams) for Redis or any compatible server,
+sharing state across hosts
+"""
+import asyncio
+from typing import AsyncIterator, Optional
+from urllib.parse import urlsplit
+
+from app.utils.state.base import StateBackend
+
+
+class RESPError(Exception):
+    """Error reply from the server"""
+
+
+def encode_command(*args) -> bytes:
+    """Encode a command as a RESP array of bulk strings"""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader):
+    """Read one RESP2 reply (bulk strings are decoded as UTF-8)"""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed by server")
+    kind, payload = line[:1], line[1:-2]
+
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        raise RESPError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2].decode()
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise RESPError(f"Unexpected reply type: {line!r}")
+
+
+class RESPBackend(StateBackend):
+    """
+    StateBackend on a Redis-protocol server
+
+    Commands share one connection and are sent one at a time; each
+    subscription opens its own connection. A broken connection is
+    re-opened on the next command.
+    """
+
+    def __init__(self, url: str):
+        """
+        Args:
+            url: redis://[:password@]host[:port][/db]
+        """
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = parts.password
+        self.db = int(parts.path.lstrip("/") or 0)
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            writer.write(encode_command("AUTH", self.password))
+            await read_reply(reader)
+        if self.db:
+            writer.write(encode_command("SELECT", self.db))
+            await read_reply(reader)
+        return reader, writer
+
+    async def execute(self, *args):
+        """Send a command and return its reply"""
+        async with self._lock:
+            if self._writer is None:
+                self._reader, self._writer = await self._open()
+            try:
+                self._writer.write(encode_command(*args))
+                await self._writer.drain()
+                return await read_reply(self._reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self._writer.close()
+                self._reader = self._writer = None
+                raise
+
+    @staticmethod
+    def _px(ttl: Optional[float]) -> tuple:
+        return ("PX", max(1, int(ttl * 1000))) if ttl else ()
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.execute("GET", key)
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        await self.execute("SET", key, value, *self._px(ttl))
+
+    async def set_if_absent(self, key: str, value: str, ttl: Optional[float] = None) -> bool:
+        return await self.execute("SET", key, value, "NX", *self._px(ttl)) == "OK"
+
+    async def delete(self, key: str) -> None:
+        await self.execute("DEL", key)
+
+    async def incr(self, key: str, ttl: Optional[float] = None) -> int:
+        value = await self.execute("INCR", key)
+        if value == 1 and ttl:
+            await self.execute("PEXPIRE", key, max(1, int(ttl * 1000)))
+        return value
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self.execute("PUBLISH", channel, message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[str]:
+        reader, writer = await self._open()
+        try:
+            writer.write(encode_command("SUBSCRIBE", channel))
+            await writer.drain()
+            while True:
+                reply = await read_reply(reader)
+                if reply[0] == "message":
+                    yield reply[2]
+        finally:
+            writer.close()
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = self._writer = None
@@ -0,0 +1,136 @@
+"""
+Shared-memory state backend for CAMPUS360
+SQLite database in /dev/shm shared by the workers of one host
+"""
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import AsyncIterator, Optional
+
+from app.utils.state.base import StateBackend
+
+# How often subscribers look for new messages, and how long messages are kept
+POLL_SECONDS = 0.1
+MESSAGE_RETENTION_SECONDS = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    message TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class SharedMemoryBackend(StateBackend):
+    """
+    StateBackend on a SQLite file, normally under /dev/shm (RAM)
+
+    Every statement is atomic, so counters and set_if_absent are consistent
+    across processes. Pub/sub is a message table polled every POLL_SECONDS.
+    Expiry uses wall-clock time, since monotonic clocks are per process.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Database file (e.g., /dev/shm/campus360-state.db)
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Statements run in worker threads (asyncio.to_thread), one at a time
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.executescript(SCHEMA)
+
+    def _run(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    async def _query(self, sql: str, params: tuple = ()) -> list:
+        return await asyncio.to_thread(self._run, sql, params)
+
+    @staticmethod
+    def _expiry(ttl: Optional[float]) -> Optional[float]:
+        return time.time() + ttl if ttl else None
+
+    async def get(self, key: str) -> Optional[str]:
+        rows = await self._query(
+            "SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time())
+        )
+        return rows[0][0] if rows else None
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        await self._query(
+            "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, self._expiry(ttl))
+        )
+
+    async def set_if_absent(self, key: str, value: str, ttl: Optional[float] = None) -> bool:
+        # Replaces an expired row, keeps a live one
+        rows = await self._query(
+            """
+            INSERT INTO kv (key, value, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT (key) DO UPDATE
+                SET value = excluded.value, expires_at = excluded.expires_at
+                WHERE kv.expires_at IS NOT NULL AND kv.expires_at <= ?
+            RETURNING 1
+            """,
+            (key, value, self._expiry(ttl), time.time())
+        )
+        return bool(rows)
+
+    async def delete(self, key: str) -> None:
+        await self._query("DELETE FROM kv WHERE key = ?", (key,))
+
+    async def incr(self, key: str, ttl: Optional[float] = None) -> int:
+        now = time.time()
+        rows = await self._query(
+            """
+            INSERT INTO kv (key, value, expires_at) VALUES (?, '1', ?)
+            ON CONFLICT (key) DO UPDATE SET
+                value = CASE WHEN kv.expires_at IS NOT NULL AND kv.expires_at <= ?
+                             THEN '1' ELSE CAST(kv.value AS INTEGER) + 1 END,
+                expires_at = CASE WHEN kv.expires_at IS NOT NULL AND kv.expires_at <= ?
+                                  THEN excluded.expires_at ELSE kv.expires_at END
+            RETURNING value
+            """,
+            (key, self._expiry(ttl), now, now)
+        )
+        return int(rows[0][0])
+
+    async def publish(self, channel: str, message: str) -> None:
+        now = time.time()
+        await self._query(
+            "INSERT INTO messages (channel, message, created_at) VALUES (?, ?, ?)",
+            (channel, message, now)
+        )
+        await self._query("DELETE FROM messages WHERE created_at < ?", (now - MESSAGE_RETENTION_SECONDS,))
+
+    async def subscribe(self, channel: str) -> AsyncIterator[str]:
+        rows = await self._query("SELECT COALESCE(MAX(id), 0) FROM messages")
+        last_id = rows[0][0]
+        while True:
+            rows = await self._query(
+                "SELECT id, message FROM messages WHERE channel = ? AND id > ? ORDER BY id",
+                (channel, last_id)
+            )
+            for last_id, message in rows:
+                yield message
+            if not rows:
+                await asyncio.sleep(POLL_SECONDS)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -52,6 +52,10 @@ async def apply_migration_step_by_step():
         "CREATE INDEX IF NOT EXISTS idx_access_logs_location_id ON access_logs(location_id)",
         "CREATE INDEX IF NOT EXISTS idx_access_logs_status ON access_logs(status)",
         "CREATE INDEX IF NOT EXISTS idx_access_logs_timestamp ON access_logs(timestamp)",
+        # Per-user history (migrations/003_access_logs_user_timestamp_index.sql)
+        "CREATE INDEX IF NOT EXISTS idx_access_logs_user_timestamp ON access_logs(user_id, timestamp DESC, id DESC)",
+        # Location catalogue (migrations/008_locations_class_start_index.sql)
+        "CREATE INDEX IF NOT EXISTS idx_locations_class_start_id ON locations(class_start, id)",
     ]
     
     try:
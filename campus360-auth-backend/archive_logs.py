@@ -0,0 +1,120 @@
+"""
+Access log partition, retention and archive tool
+Usage:
+    python archive_logs.py partitions                 # create upcoming partitions and list all
+    python archive_logs.py retention                  # archive partitions past ACCESS_LOG_RETENTION_MONTHS
+    python archive_logs.py archive PARTITION          # archive (and drop) one partition
+    python archive_logs.py list                       # list archive files
+    python archive_logs.py query FILE [filters]       # print matching rows of an archive as NDJSON
+    python archive_logs.py restore FILE               # load an archive back into access_logs
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+
+from prisma import Prisma
+
+from app.config import settings
+from app.services.log_archive import (
+    apply_retention, archive_partition, iter_archive, list_archives, restore_archive
+)
+from app.services.log_partitions import ensure_partitions, list_partitions
+
+
+async def run(args):
+    """Execute a database-backed subcommand"""
+    prisma = Prisma()
+    await prisma.connect()
+
+    try:
+        if args.command == "partitions":
+            for name in await ensure_partitions(prisma, settings.ACCESS_LOG_PARTITION_MONTHS_AHEAD):
+                print(f"✅ Created partition {name}")
+            for partition in await list_partitions(prisma):
+                print(
+                    f"{partition['name']:<28} {str(partition['lower_bound'] or '-'):<12} "
+                    f"{str(partition['upper_bound'] or '-'):<12} ~{partition['approx_rows']} rows"
+                )
+
+        elif args.command == "retention":
+            manifests = await apply_retention(
+                prisma, args.archive_dir, settings.ACCESS_LOG_RETENTION_MONTHS
+            )
+            for manifest in manifests:
+                print(f"✅ Archived {manifest['partition']} ({manifest['rows']} rows)")
+            if not manifests:
+                print("Nothing to archive")
+
+        elif args.command == "archive":
+            manifest = await archive_partition(prisma, args.partition, args.archive_dir)
+            print(f"✅ Archived {manifest['partition']} ({manifest['rows']} rows)")
+
+        elif args.command == "restore":
+            manifest_path = args.file.replace(".jsonl.gz", ".manifest.json")
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            restored = await restore_archive(prisma, args.file, manifest)
+            print(f"✅ Restored {restored} of {manifest['rows']} rows from {manifest['partition']}")
+
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        await prisma.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Access log partition and archive tool")
+    parser.add_argument("--archive-dir", default=settings.ACCESS_LOG_ARCHIVE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("partitions")
+    sub.add_parser("retention")
+    sub.add_parser("list")
+
+    archive = sub.add_parser("archive")
+    archive.add_argument("partition")
+
+    query = sub.add_parser("query")
+    query.add_argument("file")
+    query.add_argument("--user")
+    query.add_argument("--location")
+    query.add_argument("--status")
+    query.add_argument("--from", dest="date_from", type=datetime.fromisoformat)
+    query.add_argument("--to", dest="date_to", type=datetime.fromisoformat)
+
+    restore = sub.add_parser("restore")
+    restore.add_argument("file")
+
+    args = parser.parse_args()
+
+    # Reading archives does not need the database
+    if args.command == "list":
+        for manifest in list_archives(args.archive_dir):
+            print(
+                f"{manifest['partition']:<28} {manifest['rows']:>10} rows  "
+                f"{manifest['first_timestamp']} → {manifest['last_timestamp']}  "
+                f"{os.path.join(args.archive_dir, manifest['partition'] + '.jsonl.gz')}"
+            )
+        return
+
+    if args.command == "query":
+        for row in iter_archive(
+            args.file,
+            user_id=args.user,
+            location_id=args.location,
+            status=args.status,
+            date_from=args.date_from,
+            date_to=args.date_to
+        ):
+            print(json.dumps(row))
+        return
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
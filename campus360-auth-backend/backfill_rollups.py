@@ -0,0 +1,39 @@
+"""
+Rebuild daily attendance rollups from access_logs
+Usage: python backfill_rollups.py [--from YYYY-MM-DD] [--to YYYY-MM-DD]
+"""
+import argparse
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+from prisma import Prisma
+
+from app.services.attendance_rollup import backfill_range
+
+
+async def backfill(date_from: date, date_to: date):
+    """Rebuild the rollups for every day in the given range"""
+    prisma = Prisma()
+    await prisma.connect()
+
+    try:
+        print(f"Rebuilding rollups from {date_from} to {date_to}...")
+        result = await backfill_range(prisma, date_from, date_to)
+        print(f"✅ Rebuilt {result['days']} day(s), {result['rows']} rollup row(s)")
+
+    except Exception as e:
+        print(f"\n❌ Error rebuilding rollups: {e}")
+    finally:
+        await prisma.disconnect()
+
+
+if __name__ == "__main__":
+    today = datetime.now(timezone.utc).date()
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat,
+                        default=today - timedelta(days=7))
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, default=today)
+    args = parser.parse_args()
+
+    asyncio.run(backfill(args.date_from, args.date_to))
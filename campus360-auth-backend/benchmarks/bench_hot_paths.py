@@ -0,0 +1,160 @@
+"""
+Micro-benchmarks of the per-request hot paths
+Times JWT creation/verification, bcrypt, haversine, attendance status, QR
+rendering and ScanRequestAdvanced validation, and compares them with a
+stored baseline
+
+Methodology: each case is called once to warm up, then the loop count is
+calibrated so one repeat takes at least --min-time seconds; --repeats
+repeats run with the garbage collector disabled (as timeit does) and the
+fastest repeat is the reported per-call time, being the least disturbed
+by the rest of the machine.
+
+Usage:
+    python benchmarks/bench_hot_paths.py [--repeats 7] [--min-time 0.2] [-k jwt]
+    python benchmarks/bench_hot_paths.py --save benchmarks/baselines/hot_paths.json
+    python benchmarks/bench_hot_paths.py --compare benchmarks/baselines/hot_paths.json [--threshold 0.2]
+
+--compare exits with status 1 when a case is slower than its baseline by
+more than --threshold (a fraction, 0.2 = 20%).
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.schemas.schemas import ScanRequestAdvanced
+from app.utils.attendance import calculate_attendance_status
+from app.utils.auth_utils import create_access_token, hash_password, verify_password, verify_token
+from app.utils.geolocation import haversine_distance
+from app.utils.qr_generator import render_qr_png
+
+
+def build_cases() -> dict:
+    """Name -> zero-argument callable with realistic inputs"""
+    token = create_access_token({"sub": "5f0c6a4e-2b1d-4c7e-9a3f-1e2d3c4b5a69", "role": "student"})
+    password_hash = hash_password("correct horse battery staple")
+    class_start = datetime.now(timezone.utc) - timedelta(minutes=10)
+    class_end = class_start + timedelta(hours=2)
+    scan_time = datetime.now(timezone.utc)
+    scan_payload = {
+        "location_id": "9b2f7c1e-3d4a-4e5f-8a6b-7c8d9e0f1a2b",
+        "user_latitude": -12.0465,
+        "user_longitude": -77.0429,
+    }
+    scan_json = json.dumps(scan_payload)
+
+    return {
+        "jwt.create_access_token": lambda: create_access_token({"sub": "user-id", "role": "student"}),
+        "jwt.verify_token": lambda: verify_token(token),
+        "bcrypt.hash_password": lambda: hash_password("correct horse battery staple"),
+        "bcrypt.verify_password": lambda: verify_password("correct horse battery staple", password_hash),
+        "geo.haversine_distance": lambda: haversine_distance(-12.0464, -77.0428, -12.0465, -77.0429),
+        "attendance.calculate_status": lambda: calculate_attendance_status(
+            scan_time, class_start, class_end, 15, True
+        ),
+        "qr.render_location_png": lambda: render_qr_png("9b2f7c1e-3d4a-4e5f-8a6b-7c8d9e0f1a2b", kind="bench"),
+        "schema.scan_request_from_dict": lambda: ScanRequestAdvanced(**scan_payload),
+        "schema.scan_request_from_json": lambda: ScanRequestAdvanced.model_validate_json(scan_json),
+    }
+
+
+def time_case(func, repeats: int, min_time: float) -> dict:
+    """
+    Per-call time of func
+
+    Returns:
+        Loops per repeat, and best/median per-call time in microseconds
+    """
+    func()
+
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - started >= min_time:
+            break
+        loops *= 2
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        samples = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            for _ in range(loops):
+                func()
+            samples.append((time.perf_counter() - started) / loops)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return {
+        "loops": loops,
+        "best_us": round(min(samples) * 1e6, 3),
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Cases slower than the baseline by more than threshold"""
+    slower = []
+    for name, current in results["cases"].items():
+        base = baseline["cases"].get(name)
+        if base and current["best_us"] > base["best_us"] * (1 + threshold):
+            change = current["best_us"] / base["best_us"] - 1
+            slower.append(f"{name}: {current['best_us']} us (baseline {base['best_us']} us, +{change:.0%})")
+    return slower
+
+
+def main(args) -> int:
+    cases = {name: func for name, func in build_cases().items() if not args.k or args.k in name}
+    results = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": {name: time_case(func, args.repeats, args.min_time) for name, func in cases.items()},
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    print(f"{'case':<34}{'best us':>14}{'median us':>14}{'baseline':>12}")
+    for name, case in results["cases"].items():
+        base = baseline["cases"].get(name) if baseline else None
+        change = f"{case['best_us'] / base['best_us'] - 1:+.0%}" if base else ""
+        print(f"{name:<34}{case['best_us']:>14.3f}{case['median_us']:>14.3f}{change:>12}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if baseline:
+        slower = compare(results, baseline, args.threshold)
+        for line in slower:
+            print(f"SLOWER {line}")
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=7, help="Timed repeats per case")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per repeat")
+    parser.add_argument("-k", help="Only run cases whose name contains this text")
+    parser.add_argument("--save", help="Write the results as a baseline JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown (0.2 = 20%%)")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,116 @@
+"""
+Benchmark of the FAST_JSON response path
+Compares requests per second of scan-advanced and history style responses
+served the standard way (dicts validated against response_model) and
+through app.utils.fast_json, in-process and without a database
+
+Usage: python benchmarks/bench_json_responses.py [--seconds 3] [--history-size 100]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import httpx
+from fastapi import FastAPI, Response
+
+from app.schemas.schemas import AccessLogResponseAdvanced, ScanResponseAdvanced, UserResponse
+from app.utils.fast_json import fast_response, fields_of
+
+NOW = datetime(2026, 10, 1, 8, 0, tzinfo=timezone.utc)
+
+# Stand-ins with the attributes of the Prisma User and AccessLog models
+USER = SimpleNamespace(
+    id="6f1c2b9e-0d7e-4b8f-9a51-3c2d1e0f9a8b", email="estudiante@pucesm.edu.ec",
+    password_hash="$2b$12$" + "x" * 53, full_name="Juan Pérez", role="student",
+    created_at=NOW - timedelta(days=400), deleted_at=None
+)
+
+
+def make_logs(size: int) -> list:
+    return [
+        SimpleNamespace(
+            id=100000 + n, user_id=USER.id, location_id="0b6f3a52-8a1e-4c7d-b9f0-2e4d6c8a0f13",
+            location_code="LAB-101", timestamp=NOW - timedelta(hours=n), status="ON_TIME",
+            user_latitude=-0.9536 + n * 1e-6, user_longitude=-80.7339 - n * 1e-6,
+            distance_meters=12.5 + n % 7
+        )
+        for n in range(size)
+    ]
+
+
+def build_app(logs: list) -> FastAPI:
+    app = FastAPI()
+    log = logs[0]
+
+    @app.post("/standard/scan", response_model=ScanResponseAdvanced)
+    async def standard_scan():
+        return {
+            "message": "Asistencia registrada a tiempo", "status": "ON_TIME",
+            "location_code": "LAB-101", "location_name": "Laboratorio 101",
+            "distance_meters": 12.5, "timestamp": log.timestamp, "user": USER
+        }
+
+    @app.post("/fast/scan", response_model=ScanResponseAdvanced)
+    async def fast_scan():
+        return fast_response({
+            "message": "Asistencia registrada a tiempo", "status": "ON_TIME",
+            "location_code": "LAB-101", "location_name": "Laboratorio 101",
+            "distance_meters": 12.5, "timestamp": log.timestamp,
+            "user": fields_of(USER, UserResponse)
+        })
+
+    @app.get("/standard/history", response_model=list[dict])
+    async def standard_history():
+        return [
+            {name: getattr(row, name) for name in AccessLogResponseAdvanced.model_fields}
+            for row in logs
+        ]
+
+    @app.get("/fast/history", response_model=list[dict])
+    async def fast_history(response: Response):
+        return fast_response([fields_of(row, AccessLogResponseAdvanced) for row in logs], response)
+
+    return app
+
+
+async def requests_per_second(client: httpx.AsyncClient, method: str, path: str, seconds: float) -> float:
+    done = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        response = await client.request(method, path)
+        response.raise_for_status()
+        done += 1
+    return done / (time.perf_counter() - started)
+
+
+async def main(seconds: float, history_size: int) -> None:
+    app = build_app(make_logs(history_size))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Same body either way
+        for name, method in (("scan", "POST"), ("history", "GET")):
+            standard = await client.request(method, f"/standard/{name}")
+            fast = await client.request(method, f"/fast/{name}")
+            assert standard.json() == fast.json(), name
+
+        print(f"{'endpoint':<10}{'standard req/s':>16}{'fast req/s':>14}{'speedup':>10}")
+        for name, method in (("scan", "POST"), ("history", "GET")):
+            standard = await requests_per_second(client, method, f"/standard/{name}", seconds)
+            fast = await requests_per_second(client, method, f"/fast/{name}", seconds)
+            print(f"{name:<10}{standard:>16.0f}{fast:>14.0f}{fast / standard:>9.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0, help="Duration of each measurement")
+    parser.add_argument("--history-size", type=int, default=100, help="Rows per history page")
+    args = parser.parse_args()
+    asyncio.run(main(args.seconds, args.history_size))
@@ -0,0 +1,77 @@
+"""
+Benchmark of the metrics instrumentation overhead
+Measures requests per second of a trivial endpoint with and without
+MetricsMiddleware, and the per-query cost added by InstrumentedPrisma
+
+Usage: python benchmarks/bench_metrics_overhead.py [--seconds 5] [--rounds 5]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import httpx
+from fastapi import FastAPI
+
+from app.utils.metrics import DB_QUERY_LATENCY, MetricsMiddleware
+
+
+def build_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    return app
+
+
+async def requests_per_second(app: FastAPI, seconds: float) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        done = 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < seconds:
+            (await client.get(f"/items/{done}")).raise_for_status()
+            done += 1
+        return done / (time.perf_counter() - started)
+
+
+def query_overhead_us(iterations: int = 200_000) -> float:
+    """Work InstrumentedPrisma._execute adds around each query"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        query_started = time.perf_counter()
+        DB_QUERY_LATENCY.labels("User", "find_unique").observe(time.perf_counter() - query_started)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def main(seconds: float, rounds: int) -> None:
+    # Interleave short runs and keep the best of each to damp machine noise
+    plain_app, instrumented_app = build_app(False), build_app(True)
+    plain = instrumented = 0.0
+    for _ in range(rounds):
+        plain = max(plain, await requests_per_second(plain_app, seconds / rounds))
+        instrumented = max(instrumented, await requests_per_second(instrumented_app, seconds / rounds))
+    per_request_us = (1 / instrumented - 1 / plain) * 1e6
+
+    print(f"{'':<28}{'req/s':>10}")
+    print(f"{'without middleware':<28}{plain:>10.0f}")
+    print(f"{'with MetricsMiddleware':<28}{instrumented:>10.0f}")
+    print(f"middleware overhead: {per_request_us:.1f} us/request")
+    print(f"query timing overhead: {query_overhead_us():.2f} us/query")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0, help="Total duration per variant")
+    parser.add_argument("--rounds", type=int, default=5, help="Interleaved runs per variant")
+    args = parser.parse_args()
+    asyncio.run(main(args.seconds, args.rounds))
@@ -0,0 +1,272 @@
+"""
+Scan-storm load test for CAMPUS360
+Mints N student tokens and drives /auth/login, /qr/scan-advanced,
+/qr/history and the location QR image through the real ASGI app at a given
+concurrency, reporting throughput and p50/p95/p99 latency per endpoint
+
+Storage is either the in-memory engine (default, no database needed) or
+the Postgres database in DATABASE_URL; seeded rows are removed afterwards.
+
+Usage:
+    python benchmarks/load_scan_storm.py [--students 500] [--concurrency 50] [--rounds 3]
+        [--storage memory|postgres] [--output results.json]
+        [--baseline benchmarks/baselines/scan_storm_memory.json] [--tolerance 0.25]
+
+With --baseline, exits with status 1 when an endpoint's p95 latency grows
+or its throughput drops by more than the tolerance, or when requests fail.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "postgresql://benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import httpx
+
+from app.dependencies import get_storage
+from app.main import app
+from app.repositories import Storage, create_memory_storage
+from app.repositories.prisma import create_prisma_storage
+from app.utils.auth_utils import create_access_token, hash_password, prisma, prisma_read
+
+PASSWORD = "load-test-password"
+
+# Classroom coordinates; students scan from a few metres away
+LATITUDE, LONGITUDE = -12.0464, -77.0428
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def seed(storage: Storage, students: int) -> dict:
+    """Create a teacher, N students and a class running now"""
+    run = uuid.uuid4().hex[:8]
+    password_hash = hash_password(PASSWORD)
+    teacher = await storage.users.create({
+        "email": f"load-{run}-teacher@campus360.test", "password_hash": password_hash,
+        "full_name": "Load Test Teacher", "role": "teacher",
+    })
+    users = [
+        await storage.users.create({
+            "email": f"load-{run}-{n}@campus360.test", "password_hash": password_hash,
+            "full_name": f"Load Test Student {n}", "role": "student",
+        })
+        for n in range(students)
+    ]
+    now = datetime.now(timezone.utc)
+    location = await storage.locations.create({
+        "location_code": f"LOAD-{run}", "location_name": "Load Test Room",
+        "latitude": LATITUDE, "longitude": LONGITUDE,
+        "class_start": now - timedelta(minutes=5), "class_end": now + timedelta(hours=2),
+        "created_by": teacher.id,
+    })
+    return {"teacher": teacher, "students": users, "location": location}
+
+
+async def cleanup(db, data: dict) -> None:
+    """Remove what seed() created (access logs cascade from users)"""
+    await db.execute_raw(
+        "DELETE FROM attendance_daily_rollups WHERE location_id = $1", data["location"].id
+    )
+    await db.location.delete(where={"id": data["location"].id})
+    await db.user.delete_many(where={"id": {"in": [
+        user.id for user in data["students"] + [data["teacher"]]
+    ]}})
+
+
+async def run_phase(client: httpx.AsyncClient, name: str, requests: list, concurrency: int) -> dict:
+    """
+    Send requests with at most `concurrency` in flight
+
+    Args:
+        client: Client bound to the ASGI app
+        name: Phase name for the report
+        requests: (method, url, kwargs) tuples
+        concurrency: Maximum requests in flight
+
+    Returns:
+        Request count, errors, throughput and latency percentiles
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def send(method, url, kwargs):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(send(*request) for request in requests))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(requests),
+        "errors": errors,
+        "throughput_rps": round(len(requests) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+async def storm(data: dict, concurrency: int, logins: int) -> dict:
+    """Run the phases in the order of a lecture start"""
+    location = data["location"]
+    student_tokens = [
+        create_access_token({"sub": user.id, "role": user.role}) for user in data["students"]
+    ]
+    teacher_headers = {"Authorization": "Bearer " + create_access_token(
+        {"sub": data["teacher"].id, "role": "teacher"}
+    )}
+
+    phases = {
+        "login": [
+            ("POST", "/auth/login", {"data": {"username": user.email, "password": PASSWORD}})
+            for user in data["students"][:logins]
+        ],
+        "scan_advanced": [
+            ("POST", "/qr/scan-advanced", {
+                "json": {
+                    "location_id": location.id,
+                    "user_latitude": LATITUDE + 0.0001,
+                    "user_longitude": LONGITUDE,
+                },
+                "headers": {"Authorization": f"Bearer {token}"},
+            })
+            for token in student_tokens
+        ],
+        "history": [
+            ("GET", "/qr/history?limit=20", {"headers": {"Authorization": f"Bearer {token}"}})
+            for token in student_tokens
+        ],
+        "qr_image": [
+            ("GET", f"/admin/qr/location/{location.id}/image", {"headers": teacher_headers})
+            for _ in range(max(1, len(student_tokens) // 10))
+        ],
+    }
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load-test") as client:
+        return {
+            name: await run_phase(client, name, requests, concurrency)
+            for name, requests in phases.items()
+        }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions of results against a baseline, as readable lines"""
+    regressions = []
+    for name, base in baseline["phases"].items():
+        current = results["phases"].get(name)
+        if current is None:
+            continue
+        if current["errors"]:
+            regressions.append(f"{name}: {current['errors']} failed requests")
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {current['p95_ms']} ms (baseline {base['p95_ms']} ms)")
+        if current["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {current['throughput_rps']} req/s (baseline {base['throughput_rps']} req/s)"
+            )
+    return regressions
+
+
+def best_of(rounds: list[dict]) -> dict:
+    """Best value of each metric over several rounds, to damp machine noise"""
+    best = {}
+    for name in rounds[0]:
+        phases = [phases[name] for phases in rounds]
+        best[name] = {
+            "requests": phases[0]["requests"],
+            "errors": max(phase["errors"] for phase in phases),
+            "throughput_rps": max(phase["throughput_rps"] for phase in phases),
+            **{key: min(phase[key] for phase in phases) for key in ("p50_ms", "p95_ms", "p99_ms")},
+        }
+    return best
+
+
+async def run_round(args) -> dict:
+    """Seed a fresh class, run the storm and clean up"""
+    if args.storage == "memory":
+        storage = create_memory_storage()
+        app.dependency_overrides[get_storage] = lambda: storage
+        try:
+            data = await seed(storage, args.students)
+            return await storm(data, args.concurrency, args.logins)
+        finally:
+            app.dependency_overrides.pop(get_storage, None)
+
+    data = await seed(create_prisma_storage(prisma, prisma_read), args.students)
+    try:
+        return await storm(data, args.concurrency, args.logins)
+    finally:
+        await cleanup(prisma, data)
+
+
+async def main(args) -> int:
+    if args.storage == "postgres":
+        await prisma.connect()
+        if prisma_read is not prisma:
+            await prisma_read.connect()
+    try:
+        phases = best_of([await run_round(args) for _ in range(args.rounds)])
+    finally:
+        if args.storage == "postgres":
+            await prisma.disconnect()
+
+    results = {
+        "storage": args.storage,
+        "students": args.students,
+        "concurrency": args.concurrency,
+        "rounds": args.rounds,
+        "phases": phases,
+    }
+
+    print(f"{args.students} students, concurrency {args.concurrency}, {args.storage} storage")
+    print(f"{'endpoint':<16}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, phase in phases.items():
+        print(f"{name:<16}{phase['requests']:>10}{phase['errors']:>8}{phase['throughput_rps']:>10.1f}"
+              f"{phase['p50_ms']:>10.2f}{phase['p95_ms']:>10.2f}{phase['p99_ms']:>10.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=500, help="Students (tokens) in the class")
+    parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight")
+    parser.add_argument("--rounds", type=int, default=3, help="Repetitions; the best of each metric is kept")
+    parser.add_argument("--logins", type=int, default=20, help="Students who log in (bcrypt-bound)")
+    parser.add_argument("--storage", choices=("memory", "postgres"), default="memory")
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    sys.exit(asyncio.run(main(parser.parse_args())))
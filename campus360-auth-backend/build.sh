@@ -15,7 +15,13 @@ echo "🔧 Generating Prisma client..."
 python -m prisma generate
 
 # Push database schema (creates tables if they don't exist)
-echo "🗄️  Pushing database schema..."
-python -m prisma db push --skip-generate
+# Set SKIP_DB_PUSH=true once access_logs is partitioned: db push cannot manage
+# partitioned tables, so schema changes are applied from migrations/ instead
+if [ "${SKIP_DB_PUSH:-false}" = "true" ]; then
+    echo "⏭️  Skipping prisma db push (SKIP_DB_PUSH=true)"
+else
+    echo "🗄️  Pushing database schema..."
+    python -m prisma db push --skip-generate
+fi
 
 echo "✅ Build completed successfully!"
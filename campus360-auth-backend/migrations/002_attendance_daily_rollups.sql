@@ -0,0 +1,23 @@
+-- Migration: Add daily attendance rollups maintained at scan time
+-- Date: 2026-10-18
+
+-- Create rollup table keyed by (day, location, status)
+CREATE TABLE IF NOT EXISTS attendance_daily_rollups (
+    day DATE NOT NULL,
+    location_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    scans INTEGER DEFAULT 0 NOT NULL,
+    updated_at TIMESTAMP(3) DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    PRIMARY KEY (day, location_id, status),
+    FOREIGN KEY (location_id) REFERENCES locations(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS attendance_daily_rollups_location_id_idx ON attendance_daily_rollups(location_id);
+
+-- Seed the rollups from the existing access logs
+INSERT INTO attendance_daily_rollups (day, location_id, status, scans)
+SELECT "timestamp"::date, location_id, status, COUNT(*)
+FROM access_logs
+WHERE location_id IS NOT NULL AND status IS NOT NULL
+GROUP BY 1, 2, 3
+ON CONFLICT (day, location_id, status) DO UPDATE SET scans = EXCLUDED.scans;
@@ -0,0 +1,8 @@
+-- Migration: Composite index for per-user access history
+-- Date: 2026-10-18
+
+-- /qr/history filters by user_id and pages by (timestamp, id) newest first.
+-- Without this index every history request walks idx_access_logs_timestamp
+-- across the logs of all users.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_access_logs_user_timestamp
+ON access_logs(user_id, "timestamp" DESC, id DESC);
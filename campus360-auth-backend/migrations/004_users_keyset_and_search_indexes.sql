@@ -0,0 +1,19 @@
+-- Migration: Keyset pagination and search indexes for the admin user list
+-- Date: 2026-10-18
+
+-- Trigram matching for ILIKE '%term%' searches
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- GET /admin/users pages by (created_at, id) newest first, optionally by role
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_created_at_id
+ON users(created_at DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_role_created_at_id
+ON users(role, created_at DESC, id DESC);
+
+-- GET /admin/users?q= searches full name and email
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_full_name_trgm
+ON users USING gin (full_name gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_trgm
+ON users USING gin (email gin_trgm_ops);
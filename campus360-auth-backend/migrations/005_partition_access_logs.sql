@@ -0,0 +1,72 @@
+-- Migration: Partition access_logs by month
+-- Date: 2026-10-18
+--
+-- The existing table is kept as-is and attached as one partition holding
+-- everything before the first monthly partition, so no rows are copied.
+-- New months get their own partitions (see app/services/log_partitions.py).
+--
+-- After applying this migration:
+--   * set ACCESS_LOG_PARTITIONING=true so the app keeps future partitions created
+--   * set SKIP_DB_PUSH=true in Render: `prisma db push` cannot manage partitioned tables
+
+BEGIN;
+
+-- Free the canonical names for the partitioned parent
+ALTER TABLE access_logs RENAME TO access_logs_legacy;
+ALTER INDEX IF EXISTS access_logs_pkey RENAME TO access_logs_legacy_pkey;
+ALTER INDEX IF EXISTS idx_access_logs_location_id RENAME TO idx_access_logs_legacy_location_id;
+ALTER INDEX IF EXISTS idx_access_logs_status RENAME TO idx_access_logs_legacy_status;
+ALTER INDEX IF EXISTS idx_access_logs_timestamp RENAME TO idx_access_logs_legacy_timestamp;
+ALTER INDEX IF EXISTS idx_access_logs_user_timestamp RENAME TO idx_access_logs_legacy_user_timestamp;
+
+-- Foreign keys are re-created on the parent below
+ALTER TABLE access_logs_legacy DROP CONSTRAINT IF EXISTS access_logs_user_id_fkey;
+ALTER TABLE access_logs_legacy DROP CONSTRAINT IF EXISTS access_logs_location_id_fkey;
+ALTER TABLE access_logs_legacy DROP CONSTRAINT IF EXISTS fk_access_logs_location;
+
+-- The partition key must be part of every unique constraint
+ALTER TABLE access_logs_legacy DROP CONSTRAINT access_logs_legacy_pkey;
+ALTER TABLE access_logs_legacy ADD CONSTRAINT access_logs_legacy_pkey PRIMARY KEY (id, "timestamp");
+
+-- Copy the columns from the legacy table so their types match whichever
+-- migration path created it (001 uses UUID/VARCHAR, prisma db push TEXT)
+CREATE TABLE access_logs (LIKE access_logs_legacy INCLUDING DEFAULTS)
+    PARTITION BY RANGE ("timestamp");
+
+ALTER TABLE access_logs ADD CONSTRAINT access_logs_pkey PRIMARY KEY (id, "timestamp");
+ALTER TABLE access_logs ADD CONSTRAINT access_logs_user_id_fkey FOREIGN KEY (user_id)
+    REFERENCES users(id) ON DELETE CASCADE ON UPDATE CASCADE;
+ALTER TABLE access_logs ADD CONSTRAINT access_logs_location_id_fkey FOREIGN KEY (location_id)
+    REFERENCES locations(id) ON DELETE SET NULL ON UPDATE CASCADE;
+
+ALTER SEQUENCE access_logs_id_seq OWNED BY access_logs.id;
+
+-- Everything before next month stays in the legacy table. The CHECK
+-- constraint (with the bound as a literal, so the planner can prove it)
+-- lets ATTACH skip its validation scan.
+DO $$
+DECLARE
+    upper_bound DATE := (date_trunc('month', CURRENT_DATE) + INTERVAL '1 month')::date;
+BEGIN
+    EXECUTE format(
+        'ALTER TABLE access_logs_legacy ADD CONSTRAINT access_logs_legacy_range CHECK ("timestamp" < %L)',
+        upper_bound
+    );
+    EXECUTE format(
+        'ALTER TABLE access_logs ATTACH PARTITION access_logs_legacy FOR VALUES FROM (MINVALUE) TO (%L)',
+        upper_bound
+    );
+END $$;
+
+ALTER TABLE access_logs_legacy DROP CONSTRAINT access_logs_legacy_range;
+
+-- Indexes on the parent reuse the matching legacy indexes
+CREATE INDEX IF NOT EXISTS idx_access_logs_location_id ON access_logs(location_id);
+CREATE INDEX IF NOT EXISTS idx_access_logs_status ON access_logs(status);
+CREATE INDEX IF NOT EXISTS idx_access_logs_timestamp ON access_logs("timestamp");
+CREATE INDEX IF NOT EXISTS idx_access_logs_user_timestamp ON access_logs(user_id, "timestamp" DESC, id DESC);
+
+-- Catch-all for rows outside every monthly partition
+CREATE TABLE IF NOT EXISTS access_logs_default PARTITION OF access_logs DEFAULT;
+
+COMMIT;
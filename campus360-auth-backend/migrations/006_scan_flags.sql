@@ -0,0 +1,23 @@
+-- Migration: Add review table for scans flagged by GPS spoofing detection
+-- Date: 2026-10-18
+
+-- access_logs is partitioned, so flags reference (access_log_id, scan_time)
+-- without a foreign key and survive archiving of the original scan
+CREATE TABLE IF NOT EXISTS scan_flags (
+    id SERIAL PRIMARY KEY,
+    access_log_id INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    score DOUBLE PRECISION NOT NULL,
+    scan_time TIMESTAMP(3) NOT NULL,
+    details JSONB,
+    review_status TEXT DEFAULT 'PENDING' NOT NULL,
+    reviewed_by TEXT,
+    reviewed_at TIMESTAMP(3),
+    created_at TIMESTAMP(3) DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    UNIQUE (access_log_id, reason),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_scan_flags_review_status ON scan_flags(review_status, scan_time DESC);
+CREATE INDEX IF NOT EXISTS idx_scan_flags_user_id ON scan_flags(user_id);
@@ -0,0 +1,14 @@
+-- Migration: Add enrollments linking students to the locations they must attend
+-- Date: 2026-10-18
+
+CREATE TABLE IF NOT EXISTS enrollments (
+    id SERIAL PRIMARY KEY,
+    location_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    created_at TIMESTAMP(3) DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    UNIQUE (location_id, user_id),
+    FOREIGN KEY (location_id) REFERENCES locations(id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS enrollments_user_id_idx ON enrollments(user_id);
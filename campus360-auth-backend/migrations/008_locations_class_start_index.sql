@@ -0,0 +1,6 @@
+-- Migration: Index locations by class start for the catalogue and "active now" queries
+-- Date: 2026-10-18
+
+-- Keyset pagination orders by (class_start, id); creator filters keep using
+-- idx_locations_created_by from 001_add_geolocation.sql
+CREATE INDEX IF NOT EXISTS idx_locations_class_start_id ON locations(class_start, id);
@@ -0,0 +1,24 @@
+-- Migration: Soft-delete users and purge their data in background jobs
+-- Date: 2026-10-18
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP(3);
+
+CREATE TABLE IF NOT EXISTS purge_jobs (
+    id SERIAL PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    requested_by TEXT NOT NULL,
+    status TEXT DEFAULT 'PENDING' NOT NULL,
+    phase TEXT,
+    deleted_logs INTEGER DEFAULT 0 NOT NULL,
+    detached_logs INTEGER DEFAULT 0 NOT NULL,
+    deleted_locations INTEGER DEFAULT 0 NOT NULL,
+    error TEXT,
+    created_at TIMESTAMP(3) DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP(3) DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    finished_at TIMESTAMP(3)
+);
+
+CREATE INDEX IF NOT EXISTS purge_jobs_status_idx ON purge_jobs(status);
+
+-- The purge detaches a location's scans in chunks by location_id
+CREATE INDEX IF NOT EXISTS idx_access_logs_location_id ON access_logs(location_id);
@@ -0,0 +1,24 @@
+-- Migration: Add transactional outbox for events sent to other CAMPUS360 modules
+-- Date: 2026-10-19
+
+-- Rows are written in the same transaction as the change they describe and
+-- delivered by the dispatcher in app/services/outbox.py
+CREATE TABLE IF NOT EXISTS outbox_events (
+    id BIGSERIAL PRIMARY KEY,
+    topic TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload JSONB NOT NULL,
+    attempts INTEGER DEFAULT 0 NOT NULL,
+    next_attempt_at TIMESTAMP(3) DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    last_error TEXT,
+    created_at TIMESTAMP(3) DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    delivered_at TIMESTAMP(3),
+    dead_at TIMESTAMP(3)
+);
+
+-- Only undelivered events are indexed: the claim walks them in id order and
+-- checks for an earlier pending event with the same key
+CREATE INDEX IF NOT EXISTS idx_outbox_events_pending
+    ON outbox_events(id) WHERE delivered_at IS NULL AND dead_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_outbox_events_pending_key
+    ON outbox_events(key, id) WHERE delivered_at IS NULL AND dead_at IS NULL;
@@ -0,0 +1,17 @@
+-- Migration: Add per-scan deltas for the daily attendance rollups
+-- Date: 2026-10-19
+
+-- With ROLLUP_DELTAS=true each scan inserts a row here instead of updating
+-- its (day, location_id, status) rollup row, which every scan of a lecture
+-- start would otherwise wait on. app/services/attendance_rollup.py folds
+-- the deltas into attendance_daily_rollups every few seconds.
+CREATE TABLE IF NOT EXISTS attendance_rollup_deltas (
+    id BIGSERIAL PRIMARY KEY,
+    day DATE NOT NULL,
+    location_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    scans INTEGER NOT NULL,
+    FOREIGN KEY (location_id) REFERENCES locations(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS attendance_rollup_deltas_location_id_idx ON attendance_rollup_deltas(location_id);
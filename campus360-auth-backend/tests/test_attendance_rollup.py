@@ -0,0 +1,61 @@
+"""
+Rollup deltas under concurrent scans
+Requires a PostgreSQL database with the CAMPUS360 schema (including
+migrations/011_attendance_rollup_deltas.sql) in TEST_DATABASE_URL
+"""
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.services import attendance_rollup
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL,
+    reason="TEST_DATABASE_URL not set"
+)
+
+
+def test_concurrent_scans_are_folded_into_one_rollup_row(monkeypatch):
+    from prisma import Prisma
+
+    monkeypatch.setattr(settings, "ROLLUP_DELTAS", True)
+    run = uuid.uuid4().hex[:8]
+
+    async def check():
+        db = Prisma(datasource={"url": TEST_DATABASE_URL})
+        await db.connect()
+        teacher = await db.user.create(data={
+            "email": f"rollup-{run}@campus360.test", "password_hash": "x", "full_name": "Rollup Teacher",
+        })
+        now = datetime.now(timezone.utc)
+        location = await db.location.create(data={
+            "location_code": f"ROLLUP-{run}", "latitude": 0, "longitude": 0,
+            "class_start": now, "class_end": now + timedelta(hours=1), "created_by": teacher.id,
+        })
+        scan = SimpleNamespace(location_id=location.id, status="ON_TIME", timestamp=now)
+        try:
+            await asyncio.gather(*(attendance_rollup.record_scan(db, scan) for _ in range(50)))
+            pending = await attendance_rollup.get_location_totals(db, location.id)
+            while await attendance_rollup.compact_deltas(db):
+                pass
+            rows = await db.query_raw(
+                "SELECT scans FROM attendance_daily_rollups WHERE location_id = $1", location.id
+            )
+            compacted = await attendance_rollup.get_location_totals(db, location.id)
+        finally:
+            await db.user.delete(where={"id": teacher.id})
+            await db.disconnect()
+        return pending, rows, compacted
+
+    pending, rows, compacted = asyncio.run(check())
+
+    assert pending["on_time"] == 50
+    assert rows == [{"scans": 50}]
+    assert compacted["on_time"] == 50
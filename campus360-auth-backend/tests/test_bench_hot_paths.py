@@ -0,0 +1,17 @@
+from benchmarks.bench_hot_paths import compare, time_case
+
+
+def test_time_case_calibrates_loops_to_min_time():
+    result = time_case(lambda: sum(range(100)), repeats=3, min_time=0.01)
+
+    assert result["loops"] > 1
+    assert 0 < result["best_us"] <= result["median_us"]
+
+
+def test_compare_flags_cases_over_threshold():
+    baseline = {"cases": {"jwt.verify_token": {"best_us": 40.0}, "geo.haversine_distance": {"best_us": 1.0}}}
+    results = {"cases": {"jwt.verify_token": {"best_us": 52.0}, "geo.haversine_distance": {"best_us": 1.1}}}
+
+    assert compare(results, baseline, threshold=0.2) == [
+        "jwt.verify_token: 52.0 us (baseline 40.0 us, +30%)"
+    ]
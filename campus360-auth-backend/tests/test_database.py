@@ -0,0 +1,112 @@
+import asyncio
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from prisma.engine.errors import EngineConnectionError
+from prisma.errors import DataError
+
+from app.utils.database import ReplicaPrisma, build_database_url
+from app.utils.metrics import InstrumentedPrisma
+
+
+def query_of(url):
+    return parse_qs(urlsplit(url).query)
+
+
+def test_database_url_gets_pool_parameters():
+    url = build_database_url(
+        "postgresql://u:p@db:5432/campus?sslmode=require&connection_limit=3",
+        connection_limit=10, pool_timeout=5, statement_timeout_ms=15000
+    )
+
+    assert query_of(url) == {
+        "sslmode": ["require"],
+        "connection_limit": ["3"],
+        "pool_timeout": ["5"],
+        "options": ["-c statement_timeout=15000"],
+    }
+    assert build_database_url("postgresql://db/campus") == "postgresql://db/campus"
+
+
+class FakePrimary:
+    def __init__(self):
+        self.calls = []
+
+    async def _execute(self, *, method, arguments, model=None, root_selection=None):
+        self.calls.append(method)
+        return "primary"
+
+
+def test_replica_falls_back_to_primary_while_unreachable(monkeypatch):
+    replica_calls = []
+
+    async def unreachable(self, *, method, **kwargs):
+        replica_calls.append(method)
+        raise EngineConnectionError("connection refused")
+
+    monkeypatch.setattr(InstrumentedPrisma, "_execute", unreachable)
+    monkeypatch.setattr(ReplicaPrisma, "is_connected", lambda self: True)
+    primary = FakePrimary()
+    replica = ReplicaPrisma(primary=primary, retry_seconds=60)
+
+    results = [
+        asyncio.run(replica._execute(method="query_raw", arguments={}))
+        for _ in range(3)
+    ]
+
+    assert results == ["primary"] * 3
+    assert replica_calls == ["query_raw"]
+    assert not replica.available
+
+
+def data_error(code):
+    """DataError as raised for a query engine error response"""
+    payload = {"user_facing_error": {"error_code": code, "message": code}}
+    error = DataError(payload)
+    error.data = payload
+    return error
+
+
+def test_replica_database_down_falls_back_and_bad_queries_do_not(monkeypatch):
+    async def failing(self, *, method, **kwargs):
+        # P1001: database server unreachable; P2010: the query itself failed
+        raise data_error("P1001" if method == "query_raw" else "P2010")
+
+    monkeypatch.setattr(InstrumentedPrisma, "_execute", failing)
+    monkeypatch.setattr(ReplicaPrisma, "is_connected", lambda self: True)
+    replica = ReplicaPrisma(primary=FakePrimary(), retry_seconds=60)
+
+    with pytest.raises(DataError):
+        asyncio.run(replica._execute(method="find_many", arguments={}))
+    assert replica.available
+
+    assert asyncio.run(replica._execute(method="query_raw", arguments={})) == "primary"
+    assert not replica.available
+
+
+def test_replica_reconnects_after_failed_startup(monkeypatch):
+    state = {"connected": False, "attempts": 0}
+
+    async def connect(self, *args, **kwargs):
+        state["attempts"] += 1
+        if state["attempts"] == 1:
+            raise EngineConnectionError("connection refused")
+        state["connected"] = True
+
+    async def replica_execute(self, *, method, **kwargs):
+        return "replica"
+
+    monkeypatch.setattr(InstrumentedPrisma, "connect", connect)
+    monkeypatch.setattr(InstrumentedPrisma, "_execute", replica_execute)
+    monkeypatch.setattr(ReplicaPrisma, "is_connected", lambda self: state["connected"])
+    replica = ReplicaPrisma(primary=FakePrimary(), retry_seconds=60)
+
+    asyncio.run(replica.connect())
+    while_down = asyncio.run(replica._execute(method="query_raw", arguments={}))
+    replica._down_until = 0.0  # retry_seconds have passed
+    after_retry = asyncio.run(replica._execute(method="query_raw", arguments={}))
+
+    assert while_down == "primary"
+    assert after_retry == "replica"
+    assert state["attempts"] == 2
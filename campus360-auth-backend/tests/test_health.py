@@ -1,5 +1,9 @@
+import asyncio
+from types import SimpleNamespace
+
 from fastapi.testclient import TestClient
 from app.main import app
+from app.services.readiness import check_database, get_pool_stats
 
 client = TestClient(app)
 
@@ -7,3 +11,48 @@ def test_health_check():
     response = client.get("/health/")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+class FakeDatabase:
+    """Minimal stand-in for the Prisma client used by the readiness checks"""
+
+    def __init__(self, delay=0.0, gauges=None):
+        self.delay = delay
+        self.gauges = gauges
+
+    def is_connected(self):
+        return True
+
+    async def query_raw(self, query):
+        await asyncio.sleep(self.delay)
+        return [{"ok": 1}]
+
+    async def get_metrics(self):
+        if self.gauges is None:
+            raise RuntimeError("metrics preview feature disabled")
+        return SimpleNamespace(gauges=[
+            SimpleNamespace(key=key, value=value) for key, value in self.gauges.items()
+        ])
+
+
+def test_database_check_is_bounded_by_timeout():
+    reachable, latency_ms, error = asyncio.run(check_database(FakeDatabase(delay=1), 0.05))
+
+    assert not reachable
+    assert latency_ms == 50
+    assert "0.05s" in error
+
+
+def test_pool_stats_report_saturation_and_queue_depth():
+    db = FakeDatabase(gauges={
+        "prisma_pool_connections_open": 10,
+        "prisma_pool_connections_busy": 9,
+        "prisma_pool_connections_idle": 1,
+        "prisma_client_queries_wait": 4,
+    })
+
+    stats = asyncio.run(get_pool_stats(db))
+
+    assert stats["waiting_queries"] == 4
+    assert stats["saturation"] == 0.9
+    assert asyncio.run(get_pool_stats(FakeDatabase())) is None
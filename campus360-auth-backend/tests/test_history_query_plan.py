@@ -0,0 +1,75 @@
+"""
+Query plan check for /qr/history
+Requires a PostgreSQL database with the CAMPUS360 schema in TEST_DATABASE_URL
+"""
+import asyncio
+import json
+import os
+
+import pytest
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL,
+    reason="TEST_DATABASE_URL not set"
+)
+
+
+def _plan_nodes(plan: dict):
+    """Yield every node of an EXPLAIN (FORMAT JSON) plan tree"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+async def _explain_history_query() -> tuple[dict, set]:
+    from prisma import Prisma
+
+    prisma = Prisma(datasource={"url": TEST_DATABASE_URL})
+    await prisma.connect()
+    try:
+        # On a partitioned table (migration 005) each partition has its own
+        # child of the parent index, named after the partition
+        index_rows = await prisma.query_raw(
+            """
+            SELECT 'idx_access_logs_user_timestamp' AS name
+            UNION
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass('idx_access_logs_user_timestamp')
+            """
+        )
+        rows = await prisma.query_raw(
+            """
+            EXPLAIN (FORMAT JSON)
+            SELECT * FROM access_logs
+            WHERE user_id = 'query-plan-user'
+              AND "timestamp" < '2030-01-01'
+            ORDER BY "timestamp" DESC, id DESC
+            LIMIT 10
+            """
+        )
+    finally:
+        await prisma.disconnect()
+
+    plan = rows[0]["QUERY PLAN"]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"], {row["name"] for row in index_rows}
+
+
+def test_history_query_uses_user_timestamp_index():
+    plan, user_timestamp_indexes = asyncio.run(_explain_history_query())
+    nodes = list(_plan_nodes(plan))
+
+    index_scans = [
+        node for node in nodes
+        if node["Node Type"] in ("Index Scan", "Index Only Scan")
+        and node.get("Relation Name", "").startswith("access_logs")
+    ]
+    assert index_scans
+    assert all(node.get("Index Name") in user_timestamp_indexes for node in index_scans)
+
+    # The index already delivers rows in the requested order
+    assert not any(node["Node Type"] == "Sort" for node in nodes)
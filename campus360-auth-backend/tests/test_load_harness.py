@@ -0,0 +1,33 @@
+import asyncio
+
+from benchmarks.load_scan_storm import compare, run_round
+from app.dependencies import get_storage
+from app.main import app
+
+
+class Args:
+    storage = "memory"
+    students = 5
+    concurrency = 5
+    logins = 1
+
+
+def test_scan_storm_runs_end_to_end_on_memory_storage():
+    phases = asyncio.run(run_round(Args))
+
+    assert set(phases) == {"login", "scan_advanced", "history", "qr_image"}
+    assert all(phase["errors"] == 0 for phase in phases.values())
+    assert phases["scan_advanced"]["requests"] == 5
+
+
+def test_memory_storage_override_is_removed_after_the_run():
+    asyncio.run(run_round(Args))
+
+    assert get_storage not in app.dependency_overrides
+
+
+def test_baseline_comparison_flags_slower_endpoints():
+    baseline = {"phases": {"history": {"errors": 0, "p95_ms": 2.0, "throughput_rps": 500.0}}}
+    current = {"phases": {"history": {"errors": 0, "p95_ms": 3.0, "throughput_rps": 480.0}}}
+
+    assert compare(current, baseline, tolerance=0.25) == ["history: p95 3.0 ms (baseline 2.0 ms)"]
@@ -0,0 +1,43 @@
+import asyncio
+import gzip
+import json
+
+from app.services.log_archive import archive_partition
+
+
+class FakeDatabase:
+    """Serves a partition the way prisma-client-py returns raw rows (timestamps as str)"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    async def query_raw(self, query, *args):
+        if "WHERE" in query:
+            return []
+        return self.rows
+
+    async def query_first(self, query):
+        return {"rows": len(self.rows)}
+
+    async def execute_raw(self, query):
+        self.executed.append(query)
+
+
+def test_archive_writes_manifest_and_drops_partition(tmp_path):
+    rows = [
+        {"id": n, "user_id": "u1", "location_id": None, "location_code": "LAB-101",
+         "timestamp": f"2025-03-0{n}T08:00:00+00:00", "status": None}
+        for n in (1, 2, 3)
+    ]
+    db = FakeDatabase(rows)
+
+    manifest = asyncio.run(archive_partition(db, "access_logs_y2025m03", str(tmp_path)))
+
+    assert manifest["rows"] == 3
+    assert manifest["first_timestamp"] == "2025-03-01T08:00:00+00:00"
+    assert manifest["last_timestamp"] == "2025-03-03T08:00:00+00:00"
+    assert json.loads((tmp_path / "access_logs_y2025m03.manifest.json").read_text()) == manifest
+    with gzip.open(tmp_path / "access_logs_y2025m03.jsonl.gz", "rt") as f:
+        assert [json.loads(line)["id"] for line in f] == [1, 2, 3]
+    assert db.executed[-1] == "DROP TABLE access_logs_y2025m03"
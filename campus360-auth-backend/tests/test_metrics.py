@@ -0,0 +1,13 @@
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_metrics_label_requests_by_route_template():
+    client.get("/admin/users/some-user-id")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert 'route="/admin/users/{user_id}",status="401"' in response.text
+    assert "some-user-id" not in response.text
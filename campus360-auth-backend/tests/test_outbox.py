@@ -0,0 +1,188 @@
+"""
+Outbox delivery against a local webhook stand-in
+
+The claim ordering test needs a PostgreSQL database with the CAMPUS360
+schema (including migrations/010_event_outbox.sql) in TEST_DATABASE_URL.
+"""
+import asyncio
+import json
+import os
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services import outbox
+from app.utils.metrics import OUTBOX_EVENTS
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+class WebhookStandIn:
+    """Local HTTP server answering POSTs with scripted status codes"""
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.requests = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/events"
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests.append({"headers": headers, "body": body})
+                status = self.statuses.pop(0) if self.statuses else 200
+                writer.write(f"HTTP/1.1 {status} Scripted\r\nContent-Length: 0\r\n\r\n".encode())
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        writer.close()
+
+
+class FakeOutboxEvents:
+    def __init__(self):
+        self.updates = []
+
+    async def update_many(self, where, data):
+        self.updates.append((sorted(where["id"]["in"]), data))
+        return len(where["id"]["in"])
+
+
+class FakeDatabase:
+    """Returns pre-set events from the claim and records the updates"""
+
+    def __init__(self, events):
+        self.events = events
+        self.outboxevent = FakeOutboxEvents()
+
+    @asynccontextmanager
+    async def tx(self):
+        yield self
+
+    async def query_first(self, query, lock_key):
+        return {"locked": True}
+
+    async def query_raw(self, query, limit, lease_seconds):
+        claimed, self.events = self.events[:limit], self.events[limit:]
+        return list(reversed(claimed))
+
+
+def make_event(event_id, key="u1", attempts=0):
+    return {
+        "id": event_id, "topic": outbox.ACCESS_LOG_CREATED, "key": key,
+        "payload": {"id": event_id, "user_id": key}, "attempts": attempts,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def dispatch(db, statuses):
+    async def run():
+        webhook = WebhookStandIn(statuses)
+        url = await webhook.start()
+        async with httpx.AsyncClient(timeout=5) as client:
+            claimed = await outbox.dispatch_once(db, client, [url])
+        webhook.server.close()
+        return claimed, webhook.requests
+    return asyncio.run(run())
+
+
+def test_batch_is_signed_and_marked_delivered(monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_WEBHOOK_SECRET", "shared-secret")
+    delivered_before = OUTBOX_EVENTS.labels(outbox.ACCESS_LOG_CREATED, "delivered")._value.get()
+    db = FakeDatabase([make_event(1), make_event(2), make_event(3, key="u2")])
+
+    claimed, requests = dispatch(db, [200])
+
+    body = requests[0]["body"]
+    assert claimed == 3
+    assert [event["id"] for event in json.loads(body)["events"]] == [1, 2, 3]
+    assert requests[0]["headers"][outbox.SIGNATURE_HEADER.lower()] == outbox.sign(body, "shared-secret")
+    assert db.outboxevent.updates[0][0] == [1, 2, 3]
+    assert "delivered_at" in db.outboxevent.updates[0][1]
+    assert OUTBOX_EVENTS.labels(outbox.ACCESS_LOG_CREATED, "delivered")._value.get() == delivered_before + 3
+
+
+def test_failed_batch_is_retried_with_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_BACKOFF_SECONDS", 2.0)
+    monkeypatch.setattr(settings, "OUTBOX_MAX_BACKOFF_SECONDS", 60.0)
+    monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 5)
+    db = FakeDatabase([make_event(1, attempts=0), make_event(2, attempts=3), make_event(3, attempts=4)])
+
+    started = datetime.utcnow()
+    dispatch(db, [503])
+
+    updates = {tuple(ids): data for ids, data in db.outboxevent.updates}
+    assert "HTTP 503" in updates[(1,)]["last_error"]
+    assert updates[(1,)]["attempts"] == {"increment": 1}
+    assert 1.5 < (updates[(1,)]["next_attempt_at"] - started).total_seconds() < 3
+    assert 15 < (updates[(2,)]["next_attempt_at"] - started).total_seconds() < 17
+    assert "dead_at" not in updates[(2,)]
+    assert "dead_at" in updates[(3,)]
+    assert [outbox.backoff_seconds(n) for n in (0, 1, 5, 10)] == [2.0, 4.0, 60.0, 60.0]
+
+
+def test_unreachable_webhook_counts_as_failure():
+    db = FakeDatabase([make_event(1)])
+
+    async def run():
+        async with httpx.AsyncClient(timeout=1) as client:
+            return await outbox.deliver(client, ["http://127.0.0.1:9/events"], db.events)
+
+    assert asyncio.run(run()).startswith("http://127.0.0.1:9/events")
+
+
+def test_events_are_only_written_when_enabled(monkeypatch):
+    class RecordingDatabase:
+        def __init__(self):
+            self.calls = []
+
+        async def execute_raw(self, query, *args):
+            self.calls.append(args)
+
+    db = RecordingDatabase()
+    asyncio.run(outbox.enqueue(db, outbox.USER_CREATED, "u1", {"id": "u1"}))
+    monkeypatch.setattr(settings, "OUTBOX_ENABLED", True)
+    asyncio.run(outbox.enqueue(db, outbox.USER_CREATED, "u1", {"id": "u1", "at": datetime(2026, 1, 1)}))
+
+    assert db.calls == [(outbox.USER_CREATED, "u1", '{"id": "u1", "at": "2026-01-01T00:00:00"}')]
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+def test_claim_returns_events_in_order_and_leases_them():
+    from prisma import Prisma
+
+    async def run():
+        db = Prisma(datasource={"url": TEST_DATABASE_URL})
+        await db.connect()
+        key, other = f"order-{uuid.uuid4().hex[:8]}", f"order-{uuid.uuid4().hex[:8]}"
+        try:
+            for event_key in (key, key, other):
+                await db.execute_raw(
+                    "INSERT INTO outbox_events (topic, key, payload) VALUES ('test', $1, '{}'::jsonb)",
+                    event_key
+                )
+            first = [e for e in await outbox.claim_events(db, 100, 60) if e["key"] in (key, other)]
+            # Everything is leased now, so nothing is claimed twice
+            second = [e for e in await outbox.claim_events(db, 100, 60) if e["key"] in (key, other)]
+            return first, second
+        finally:
+            await db.execute_raw("DELETE FROM outbox_events WHERE key IN ($1, $2)", key, other)
+            await db.disconnect()
+
+    first, second = asyncio.run(run())
+
+    assert [e["key"] for e in first] == [key, key, other]
+    assert second == []
@@ -0,0 +1,42 @@
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.utils.profiling import ProfilerMiddleware, list_profiles, profile_path
+
+
+def make_client():
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.add_middleware(ProfilerMiddleware)
+    return TestClient(app)
+
+
+def test_sampled_request_saves_speedscope_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(settings, "PROFILING_KEEP", 2)
+    client = make_client()
+
+    names = [client.get("/ping").headers["x-profile-id"] for _ in range(3)]
+
+    assert [p["name"] for p in list_profiles(str(tmp_path))] == names[:0:-1]
+    assert profile_path(str(tmp_path), names[-1]) == os.path.join(str(tmp_path), names[-1])
+    assert profile_path(str(tmp_path), "../secrets.speedscope.json") is None
+
+
+def test_profile_header_requires_admin_token(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+    client = make_client()
+
+    response = client.get("/ping", headers={"X-Profile": "1", "Authorization": "Bearer nope"})
+
+    assert "x-profile-id" not in response.headers
+    assert list_profiles(str(tmp_path)) == []
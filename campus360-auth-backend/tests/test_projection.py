@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+from typing import ClassVar
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from app.schemas.schemas import UserResponse
+from app.utils.projection import parse_fields, partial_model, trimmed_model
+
+
+class BaseUser(BaseModel):
+    """Stand-in for the generated prisma.bases.BaseUser"""
+    __prisma_model__: ClassVar[str] = "User"
+
+
+def test_parse_fields_keeps_model_order():
+    assert parse_fields("role, id", UserResponse) == ("id", "role")
+    assert parse_fields(None, UserResponse) is None
+
+
+@pytest.mark.parametrize("fields", ["", "id,password_hash"])
+def test_parse_fields_rejects_unknown(fields):
+    with pytest.raises(HTTPException) as exc:
+        parse_fields(fields, UserResponse)
+    assert exc.value.status_code == 400
+
+
+def test_partial_model_adds_required_columns():
+    model = partial_model(BaseUser, UserResponse, ("full_name",), always=("id", "created_at"))
+    assert issubclass(model, BaseUser)
+    assert list(model.model_fields) == ["id", "full_name", "created_at"]
+
+
+def test_trimmed_model_dumps_only_requested_fields():
+    user = UserResponse(
+        id="u1", email="a@b.c", full_name="Ana", role="student",
+        created_at=datetime(2026, 1, 1, tzinfo=timezone.utc)
+    )
+    model = trimmed_model(UserResponse, ("id", "full_name"))
+    assert model.model_validate(user, from_attributes=True).model_dump() == {"id": "u1", "full_name": "Ana"}
@@ -0,0 +1,149 @@
+"""
+Query budget accounting and per-endpoint query counts
+
+The endpoint budgets need a PostgreSQL database with the CAMPUS360 schema:
+run with DATABASE_URL and TEST_DATABASE_URL both pointing at it.
+"""
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from prisma import Prisma
+
+from app.config import settings
+from app.utils.metrics import InstrumentedPrisma
+from app.utils.query_budget import QueryBudgetMiddleware, current_query_log, query_shape
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+# Most queries each endpoint may issue, including get_current_user's lookup
+ENDPOINT_QUERY_BUDGETS = {
+    "login": 1,
+    "me": 1,
+    "history": 1 + 1,
+    "scan_advanced": 1 + 3,
+    "create_user": 1 + 1,
+    "update_user": 1 + 1,
+}
+
+
+def max_queries(response: httpx.Response, limit: int) -> int:
+    """Assert a response was served with at most limit queries"""
+    count = int(response.headers["X-Query-Count"])
+    assert count <= limit, f"{response.request.method} {response.request.url.path}: {count} queries > {limit}"
+    return count
+
+
+def test_query_shape_ignores_values():
+    first = query_shape("user", "find_unique", {"where": {"id": "a"}})
+    second = query_shape("user", "find_unique", {"where": {"id": "b"}})
+    other = query_shape("user", "find_unique", {"where": {"email": "a@b.c"}})
+    raw = query_shape("raw", "query_raw", {"query": "SELECT 1\n   FROM  x", "parameters": [1]})
+
+    assert first == second != other
+    assert raw == "raw.query_raw(SELECT 1 FROM x)"
+
+
+def test_middleware_counts_queries_and_flags_repeats(monkeypatch, capsys):
+    async def fake_execute(self, *, method, arguments, model=None, root_selection=None):
+        return None
+
+    monkeypatch.setattr(Prisma, "_execute", fake_execute)
+    monkeypatch.setattr(settings, "QUERY_STATS_HEADER", True)
+    monkeypatch.setattr(settings, "QUERY_BUDGET", 3)
+    monkeypatch.setattr(settings, "QUERY_REPEAT_THRESHOLD", 3)
+    db = InstrumentedPrisma()
+
+    async def endpoint(scope, receive, send):
+        # The N+1 pattern: one lookup per item
+        for user_id in ("a", "b", "c", "d"):
+            await db._execute(method="find_unique", arguments={"where": {"id": user_id}})
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def call():
+        transport = httpx.ASGITransport(app=QueryBudgetMiddleware(endpoint))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/users")
+
+    response = asyncio.run(call())
+    output = capsys.readouterr().out
+
+    assert response.headers["X-Query-Count"] == "4"
+    assert "issued 4 queries" in output
+    assert "Possible N+1" in output and "ran 4 times" in output
+    assert current_query_log() is None
+
+
+@pytest.mark.skipif(
+    not TEST_DATABASE_URL or settings.DATABASE_URL != TEST_DATABASE_URL,
+    reason="DATABASE_URL and TEST_DATABASE_URL must point at the test database"
+)
+def test_endpoints_stay_within_query_budgets(monkeypatch):
+    from app.main import app
+    from app.utils.auth_utils import create_access_token, hash_password, prisma
+
+    monkeypatch.setattr(settings, "QUERY_STATS_HEADER", True)
+    run = uuid.uuid4().hex[:8]
+
+    async def check():
+        await prisma.connect()
+        admin = await prisma.user.create(data={
+            "email": f"budget-{run}-admin@campus360.test", "password_hash": hash_password("secret"),
+            "full_name": "Budget Admin", "role": "admin",
+        })
+        student = await prisma.user.create(data={
+            "email": f"budget-{run}-student@campus360.test", "password_hash": hash_password("secret"),
+            "full_name": "Budget Student", "role": "student",
+        })
+        now = datetime.now(timezone.utc)
+        location = await prisma.location.create(data={
+            "location_code": f"BUDGET-{run}", "latitude": -12.0464, "longitude": -77.0428,
+            "class_start": now - timedelta(minutes=5), "class_end": now + timedelta(hours=1),
+            "created_by": admin.id,
+        })
+        student_auth = {"Authorization": "Bearer " + create_access_token({"sub": student.id, "role": "student"})}
+        admin_auth = {"Authorization": "Bearer " + create_access_token({"sub": admin.id, "role": "admin"})}
+
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                responses = {
+                    "login": await client.post("/auth/login", data={
+                        "username": student.email, "password": "secret",
+                    }),
+                    "me": await client.get("/qr/me", headers=student_auth),
+                    "scan_advanced": await client.post("/qr/scan-advanced", headers=student_auth, json={
+                        "location_id": location.id, "user_latitude": -12.0464, "user_longitude": -77.0428,
+                    }),
+                    "history": await client.get("/qr/history", headers=student_auth),
+                    "create_user": await client.post("/admin/users", headers=admin_auth, json={
+                        "email": f"budget-{run}-created@campus360.test", "password": "secret",
+                        "full_name": "Budget Created", "role": "student",
+                    }),
+                    "update_user": await client.put(f"/admin/users/{student.id}", headers=admin_auth, json={
+                        "email": f"budget-{run}-renamed@campus360.test",
+                    }),
+                }
+                duplicate = await client.post("/admin/users", headers=admin_auth, json={
+                    "email": admin.email, "password": "secret", "full_name": "Duplicate", "role": "student",
+                })
+        finally:
+            await prisma.execute_raw(
+                "DELETE FROM attendance_daily_rollups WHERE location_id = $1", location.id
+            )
+            await prisma.location.delete(where={"id": location.id})
+            await prisma.user.delete_many(where={"email": {"startswith": f"budget-{run}-"}})
+            await prisma.disconnect()
+        return responses, duplicate
+
+    responses, duplicate = asyncio.run(check())
+
+    assert duplicate.status_code == 400
+
+    for name, response in responses.items():
+        assert response.status_code < 400, (name, response.text)
+        max_queries(response, ENDPOINT_QUERY_BUDGETS[name])
@@ -0,0 +1,120 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.dependencies import get_storage
+from app.main import app
+from app.repositories import DuplicateKeyError, create_memory_storage
+from app.utils.auth_utils import create_access_token, hash_password
+
+T0 = datetime(2025, 3, 10, 8, 0, tzinfo=timezone.utc)
+
+
+def make_logs(storage, user_id, count):
+    """count logs one minute apart, oldest first"""
+    async def create():
+        return [
+            await storage.access_logs.create({
+                "user_id": user_id, "location_code": "LAB-101",
+                "timestamp": T0 + timedelta(minutes=n), "status": "LATE" if n % 2 else "ON_TIME",
+            })
+            for n in range(count)
+        ]
+    return asyncio.run(create())
+
+
+def test_unique_columns_raise_duplicate_key():
+    storage = create_memory_storage()
+    data = {"email": "ana@campus360.test", "password_hash": "x", "full_name": "Ana"}
+
+    async def create_twice():
+        await storage.users.create(data)
+        await storage.users.create(data)
+
+    with pytest.raises(DuplicateKeyError):
+        asyncio.run(create_twice())
+
+
+def test_history_pages_walk_backwards_and_forwards():
+    storage = create_memory_storage()
+    logs = make_logs(storage, "u1", 7)
+    make_logs(storage, "u2", 3)
+    history = storage.access_logs.list_for_user
+
+    first = asyncio.run(history("u1", 3))
+    older = asyncio.run(history("u1", 3, before=(first[-1].timestamp, first[-1].id)))
+    newer = asyncio.run(history("u1", 3, after=(older[0].timestamp, older[0].id)))
+
+    assert [log.id for log in first] == [logs[n].id for n in (6, 5, 4)]
+    assert [log.id for log in older] == [logs[n].id for n in (3, 2, 1)]
+    assert [log.id for log in newer] == [logs[n].id for n in (6, 5, 4)]
+
+
+def test_history_filters_by_window_and_status():
+    storage = create_memory_storage()
+    logs = make_logs(storage, "u1", 6)
+
+    page = asyncio.run(storage.access_logs.list_for_user(
+        "u1", 10, date_from=T0 + timedelta(minutes=1), date_to=T0 + timedelta(minutes=5), status="LATE"
+    ))
+
+    assert [log.id for log in page] == [logs[3].id, logs[1].id]
+
+
+def test_endpoints_run_on_overridden_memory_storage():
+    storage = create_memory_storage()
+    user = asyncio.run(storage.users.create({
+        "email": "ana@campus360.test", "password_hash": hash_password("secret"), "full_name": "Ana",
+    }))
+    make_logs(storage, user.id, 3)
+    app.dependency_overrides[get_storage] = lambda: storage
+    try:
+        client = TestClient(app)
+        login = client.post("/auth/login", data={"username": user.email, "password": "secret"})
+        token = create_access_token({"sub": user.id, "role": user.role})
+        history = client.get("/qr/history?limit=2", headers={"Authorization": f"Bearer {token}"})
+    finally:
+        app.dependency_overrides.pop(get_storage, None)
+
+    assert login.status_code == 200
+    assert history.status_code == 200
+    assert len(history.json()) == 2
+    assert "X-Next-Cursor" in history.headers
+
+
+def test_locations_created_through_qr_are_listed_and_deleted(monkeypatch):
+    storage = create_memory_storage()
+    teacher = asyncio.run(storage.users.create({
+        "email": "profe@campus360.test", "password_hash": "x", "full_name": "Profe", "role": "teacher",
+    }))
+    app.dependency_overrides[get_storage] = lambda: storage
+    try:
+        client = TestClient(app)
+        client.headers["Authorization"] = "Bearer " + create_access_token({"sub": teacher.id, "role": "teacher"})
+        for n in range(3):
+            created = client.post("/admin/qr/generate-location-advanced", json={
+                "location_code": f"LAB-10{n}", "latitude": -12.0, "longitude": -77.0,
+                "class_start": (T0 + timedelta(hours=n)).isoformat(),
+                "class_end": (T0 + timedelta(hours=n + 1)).isoformat(),
+            })
+            assert created.status_code == 200
+        first = client.get("/admin/locations?limit=2")
+        second = client.get(f"/admin/locations?limit=2&cursor={first.headers['X-Next-Cursor']}")
+        log = asyncio.run(storage.access_logs.record_scan({
+            "user_id": teacher.id, "location_id": created.json()["id"], "location_code": "LAB-102",
+            "status": "ON_TIME",
+        }))
+        deleted = client.delete(f"/admin/locations/{created.json()['id']}")
+        monkeypatch.setattr(settings, "STORAGE_BACKEND", "memory")
+        users = client.get("/admin/users")
+    finally:
+        app.dependency_overrides.pop(get_storage, None)
+
+    assert [location["location_code"] for location in first.json()] == ["LAB-100", "LAB-101"]
+    assert [location["location_code"] for location in second.json()] == ["LAB-102"]
+    assert deleted.status_code == 204
+    assert log.location_id is None and not storage.access_logs.rollups
+    assert users.status_code == 503
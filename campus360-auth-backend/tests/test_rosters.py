@@ -0,0 +1,26 @@
+from app.services.rosters import RosterIndex, build_roster, iter_bits, to_bitset
+
+
+def test_bitset_round_trip():
+    assert list(iter_bits(to_bitset([0, 3, 64, 499]))) == [0, 3, 64, 499]
+    assert list(iter_bits(0)) == []
+
+
+def test_roster_sets():
+    index = RosterIndex.build("loc", ["s1", "s2", "s3", "s4"])
+    roster = build_roster(index, on_time_ids=["s1", "s2", "x"], late_ids=["s2", "s3"])
+
+    # s2 has an ON_TIME scan, so it is not late
+    assert roster.ids(roster.on_time & roster.expected) == ["s1", "s2"]
+    assert roster.ids(roster.late) == ["s3"]
+    assert roster.ids(roster.missing) == ["s4"]
+    assert roster.ids(roster.unexpected) == ["x"]
+
+
+def test_large_lecture():
+    students = [f"s{n:03d}" for n in range(500)]
+    index = RosterIndex.build("loc", students)
+    roster = build_roster(index, on_time_ids=students[:400], late_ids=students[400:450])
+
+    assert roster.missing.bit_count() == 50
+    assert roster.ids(roster.missing) == students[450:]
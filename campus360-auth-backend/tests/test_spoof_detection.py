@@ -0,0 +1,79 @@
+import time
+
+import numpy as np
+
+from app.services.spoof_detection import FlagReason, ScanWindow, detect_spoofing
+
+BASE = 1_760_000_000.0
+
+
+def _window(rows):
+    """Build a ScanWindow from (id, user_id, seconds, lat, lon, distance) tuples"""
+    ids, users, seconds, lats, lons, distances = zip(*rows)
+    return ScanWindow(
+        ids=np.array(ids, dtype=np.int64),
+        user_ids=np.array(users, dtype=object),
+        timestamps=BASE + np.array(seconds, dtype=np.float64),
+        latitudes=np.array(lats, dtype=np.float64),
+        longitudes=np.array(lons, dtype=np.float64),
+        distances=np.array(distances, dtype=np.float64),
+    )
+
+
+def _reasons(flags):
+    return {(flag["access_log_id"], flag["reason"]) for flag in flags}
+
+
+def test_impossible_travel_flags_second_scan():
+    # About 11 km in two minutes, then a plausible walk back an hour later
+    flags = detect_spoofing(_window([
+        (1, "a", 0, -12.046374, -77.042793, 5.2),
+        (2, "a", 120, -12.146374, -77.042793, 7.9),
+        (3, "a", 3720, -12.046871, -77.042111, 3.1),
+    ]))
+    travel = [flag for flag in flags if flag["reason"] == FlagReason.IMPOSSIBLE_TRAVEL]
+    assert [flag["access_log_id"] for flag in travel] == [2]
+    assert travel[0]["details"]["previous_access_log_id"] == 1
+    assert travel[0]["score"] > 50
+
+
+def test_travel_is_computed_per_student():
+    # Different students far apart at the same time are not travel
+    flags = detect_spoofing(_window([
+        (1, "a", 0, -12.046374, -77.042793, 5.2),
+        (2, "b", 10, -12.146374, -77.042793, 7.9),
+    ]))
+    assert not any(flag["reason"] == FlagReason.IMPOSSIBLE_TRAVEL for flag in flags)
+
+
+def test_shared_coordinates_coarse_and_exact_location():
+    flags = detect_spoofing(_window([
+        (1, "a", 0, -12.046374, -77.042793, 5.2),
+        (2, "b", 5, -12.046374, -77.042793, 5.2),
+        (3, "c", 9, -12.046374, -77.042793, 5.2),
+        (4, "d", 30, -12.0464, -77.0428, 4.1),
+        (5, "e", 40, -12.046313, -77.042731, 0.0),
+    ]))
+    assert _reasons(flags) == {
+        (1, FlagReason.SHARED_COORDINATES),
+        (2, FlagReason.SHARED_COORDINATES),
+        (3, FlagReason.SHARED_COORDINATES),
+        (4, FlagReason.LOW_PRECISION),
+        (5, FlagReason.EXACT_LOCATION),
+    }
+
+
+def test_semester_of_scans_runs_in_seconds():
+    rng = np.random.default_rng(0)
+    size = 1_000_000
+    window = ScanWindow(
+        ids=np.arange(size, dtype=np.int64),
+        user_ids=np.array([f"user-{n}" for n in rng.integers(0, 5000, size)], dtype=object),
+        timestamps=BASE + rng.uniform(0, 120 * 86400, size),
+        latitudes=-12.05 + rng.uniform(-0.002, 0.002, size),
+        longitudes=-77.04 + rng.uniform(-0.002, 0.002, size),
+        distances=rng.uniform(0, 100, size),
+    )
+    started = time.perf_counter()
+    detect_spoofing(window)
+    assert time.perf_counter() - started < 10
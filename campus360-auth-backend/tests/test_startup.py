@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.utils.startup import StartupGateMiddleware, startup_state
+
+# Cumulative import time of app.main, in milliseconds (override in slow CI)
+IMPORT_BUDGET_MS = int(os.getenv("IMPORT_BUDGET_MS", "1500"))
+
+# Loaded on first use, never at startup
+LAZY_MODULES = ("qrcode", "PIL", "numpy", "jose", "bcrypt", "pyinstrument")
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_app_main():
+    script = (
+        "import sys, app.main; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+
+
+def test_startup_imports_stay_within_budget():
+    result = import_app_main()
+
+    assert result.stdout.strip() == ""
+
+    # -X importtime lines: "import time: self [us] | cumulative | module"
+    cumulative_us = next(
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.split("|")[-1].strip() == "app.main"
+    )
+    assert cumulative_us / 1000 < IMPORT_BUDGET_MS
+
+
+def test_gate_serves_health_and_rejects_other_paths_until_ready(monkeypatch):
+    monkeypatch.setattr(startup_state, "ready", False)
+    app = FastAPI()
+
+    @app.get("/health/")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/auth/me")
+    async def me():
+        return {}
+
+    app.add_middleware(StartupGateMiddleware)
+    client = TestClient(app)
+
+    assert client.get("/health/").status_code == 200
+    response = client.get("/auth/me")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "2"
+
+    startup_state.mark_ready()
+    assert client.get("/auth/me").status_code == 200
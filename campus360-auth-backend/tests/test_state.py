@@ -0,0 +1,158 @@
+import asyncio
+import time
+
+import pytest
+
+from app.utils.state.memory import MemoryBackend
+from app.utils.state.resp import RESPBackend, encode_command
+from app.utils.state.shm import SharedMemoryBackend
+
+
+class RESPStandIn:
+    """Local stand-in for a Redis server, implementing the commands RESPBackend sends"""
+
+    def __init__(self):
+        self.values = {}
+        self.subscribers = {}
+
+    def _live(self, key):
+        value, expires_at = self.values.get(key, (None, None))
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self.values[key]
+            return None
+        return value
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                count = int((await reader.readline())[1:])
+                args = []
+                for _ in range(count):
+                    length = int((await reader.readline())[1:])
+                    args.append((await reader.readexactly(length + 2))[:-2].decode())
+                writer.write(self.run(args, writer))
+                await writer.drain()
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    def run(self, args, writer):
+        command, *rest = args
+        command = command.upper()
+        if command == "GET":
+            value = self._live(rest[0])
+            return b"$-1\r\n" if value is None else encode_command(value)[4:]
+        if command == "SET":
+            key, value, *options = rest
+            options = [option.upper() for option in options]
+            if "NX" in options and self._live(key) is not None:
+                return b"$-1\r\n"
+            expires_at = None
+            if "PX" in options:
+                expires_at = time.monotonic() + int(options[options.index("PX") + 1]) / 1000
+            self.values[key] = (value, expires_at)
+            return b"+OK\r\n"
+        if command == "DEL":
+            return b":%d\r\n" % (self.values.pop(rest[0], None) is not None)
+        if command == "INCR":
+            value = int(self._live(rest[0]) or 0) + 1
+            self.values[rest[0]] = (str(value), self.values.get(rest[0], (None, None))[1])
+            return b":%d\r\n" % value
+        if command == "PEXPIRE":
+            value = self._live(rest[0])
+            self.values[rest[0]] = (value, time.monotonic() + int(rest[1]) / 1000)
+            return b":1\r\n"
+        if command == "PUBLISH":
+            receivers = self.subscribers.get(rest[0], set())
+            for subscriber in receivers:
+                subscriber.write(encode_command("message", rest[0], rest[1]))
+            return b":%d\r\n" % len(receivers)
+        if command == "SUBSCRIBE":
+            self.subscribers.setdefault(rest[0], set()).add(writer)
+            return encode_command("subscribe", rest[0])
+        return b"-ERR unknown command\r\n"
+
+
+@pytest.fixture(params=["memory", "shm", "redis"])
+def make_backend(request, tmp_path):
+    async def factory():
+        if request.param == "memory":
+            return MemoryBackend()
+        if request.param == "shm":
+            return SharedMemoryBackend(str(tmp_path / "state.db"))
+        port = await RESPStandIn().start()
+        return RESPBackend(f"redis://127.0.0.1:{port}/0")
+    return factory
+
+
+def test_key_values_expire(make_backend):
+    async def scenario():
+        state = await make_backend()
+        await state.set("a", "1", ttl=0.05)
+        await state.set("b", "2")
+        assert await state.get("a") == "1"
+        await asyncio.sleep(0.1)
+        assert await state.get("a") is None
+        assert await state.get("b") == "2"
+        await state.delete("b")
+        assert await state.get("b") is None
+        await state.close()
+
+    asyncio.run(scenario())
+
+
+def test_set_if_absent_and_counters_are_windowed(make_backend):
+    async def scenario():
+        state = await make_backend()
+        assert await state.set_if_absent("scan", "1", ttl=0.05)
+        assert not await state.set_if_absent("scan", "1", ttl=0.05)
+        assert [await state.incr("hits", ttl=0.05) for _ in range(3)] == [1, 2, 3]
+        await asyncio.sleep(0.1)
+        assert await state.set_if_absent("scan", "1", ttl=0.05)
+        assert await state.incr("hits", ttl=0.05) == 1
+        await state.close()
+
+    asyncio.run(scenario())
+
+
+def test_publish_reaches_subscribers(make_backend):
+    async def scenario():
+        state = await make_backend()
+        received = []
+
+        async def listen():
+            async for message in state.subscribe("events"):
+                received.append(message)
+                if len(received) == 2:
+                    return
+
+        listener = asyncio.create_task(listen())
+        await asyncio.sleep(0.05)
+        await state.publish("events", "roster_index:loc-1")
+        await state.publish("other", "ignored")
+        await state.publish("events", "active_locations:")
+        await asyncio.wait_for(listener, 2)
+
+        assert received == ["roster_index:loc-1", "active_locations:"]
+        await state.close()
+
+    asyncio.run(scenario())
+
+
+def test_shared_memory_backend_is_shared_between_instances(tmp_path):
+    async def scenario():
+        path = str(tmp_path / "state.db")
+        worker_a, worker_b = SharedMemoryBackend(path), SharedMemoryBackend(path)
+
+        await worker_a.incr("login-failures:x", ttl=60)
+        assert await worker_b.incr("login-failures:x", ttl=60) == 2
+        assert await worker_a.set_if_absent("scan:u:l", "1", ttl=60)
+        assert not await worker_b.set_if_absent("scan:u:l", "1", ttl=60)
+
+        await worker_a.close()
+        await worker_b.close()
+
+    asyncio.run(scenario())
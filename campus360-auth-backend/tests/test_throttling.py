@@ -0,0 +1,76 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.dependencies import get_storage
+from app.main import app
+from app.repositories import create_memory_storage
+from app.utils.auth_utils import create_access_token
+
+
+def scan_client(monkeypatch):
+    """Client on memory storage with a student, an open class and dedup on"""
+    monkeypatch.setattr(settings, "SCAN_DEDUP_SECONDS", 60)
+    storage = create_memory_storage()
+    now = datetime.now(timezone.utc)
+
+    async def seed():
+        student = await storage.users.create({
+            "email": "dedup@campus360.test", "password_hash": "x", "full_name": "Dedup",
+        })
+        location = await storage.locations.create({
+            "location_code": "DEDUP-101", "latitude": -12.0464, "longitude": -77.0428,
+            "class_start": now - timedelta(minutes=5), "class_end": now + timedelta(hours=1),
+            "created_by": student.id,
+        })
+        return student, location
+
+    student, location = asyncio.run(seed())
+    app.dependency_overrides[get_storage] = lambda: storage
+    client = TestClient(app)
+    client.headers["Authorization"] = "Bearer " + create_access_token({"sub": student.id, "role": "student"})
+    return client, storage, location
+
+
+def test_out_of_range_scan_can_be_retried(monkeypatch):
+    client, _, location = scan_client(monkeypatch)
+    try:
+        far = client.post("/qr/scan-advanced", json={
+            "location_id": location.id, "user_latitude": -12.1, "user_longitude": -77.1,
+        })
+        near = client.post("/qr/scan-advanced", json={
+            "location_id": location.id, "user_latitude": -12.0464, "user_longitude": -77.0428,
+        })
+        # Both endpoints share one key per location code
+        legacy = client.post("/qr/scan", json={"location_code": location.location_code})
+    finally:
+        app.dependency_overrides.pop(get_storage, None)
+
+    assert far.json()["status"] == "INVALID_LOCATION"
+    assert near.status_code == 200
+    assert legacy.status_code == 409
+
+
+def test_failed_write_releases_the_claim(monkeypatch):
+    client, storage, location = scan_client(monkeypatch)
+    create = storage.access_logs.create
+
+    async def failing_create(data):
+        raise RuntimeError("database unavailable")
+
+    try:
+        monkeypatch.setattr(storage.access_logs, "create", failing_create)
+        failed = client.post("/qr/scan-advanced", json={
+            "location_id": location.id, "user_latitude": -12.0464, "user_longitude": -77.0428,
+        })
+        monkeypatch.setattr(storage.access_logs, "create", create)
+        retried = client.post("/qr/scan-advanced", json={
+            "location_id": location.id, "user_latitude": -12.0464, "user_longitude": -77.0428,
+        })
+    finally:
+        app.dependency_overrides.pop(get_storage, None)
+
+    assert failed.status_code == 500
+    assert retried.status_code == 200
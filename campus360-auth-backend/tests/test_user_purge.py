@@ -0,0 +1,74 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.services import user_purge
+
+
+class FakePurgeJobs:
+    def __init__(self, job):
+        self.job = job
+
+    async def find_unique(self, where):
+        return self.job
+
+    async def find_many(self, where):
+        return [self.job] if self.job.status in where["status"]["in"] else []
+
+    async def update(self, where, data):
+        for key, value in data.items():
+            setattr(self.job, key, value)
+        return self.job
+
+
+class FakeDatabase:
+    """Purge job table plus a user with logs; chunk deletes wait on `gate`"""
+
+    def __init__(self, logs):
+        self.logs = logs
+        self.gate = asyncio.Event()
+        self.purgejob = FakePurgeJobs(SimpleNamespace(
+            id=1, user_id="u1", status="PENDING", deleted_logs=0, detached_logs=0, deleted_locations=0,
+        ))
+        self.location = SimpleNamespace(find_many=self.no_locations)
+        self.user = SimpleNamespace(delete_many=self.delete_user)
+
+    async def execute_raw(self, query, job_id, stale_seconds):
+        # _claim: a PENDING job is free; a RUNNING one here is still fresh
+        if self.purgejob.job.status != "PENDING":
+            return 0
+        self.purgejob.job.status = "RUNNING"
+        return 1
+
+    async def query_first(self, query, user_id, chunk_size):
+        await self.gate.wait()
+        removed, self.logs = min(self.logs, chunk_size), max(0, self.logs - chunk_size)
+        return {"removed": removed}
+
+    async def no_locations(self, where, take):
+        return []
+
+    async def delete_user(self, where):
+        return 1
+
+
+def test_job_cancelled_by_shutdown_is_resumed_on_restart():
+    db = FakeDatabase(logs=5)
+
+    async def run():
+        user_purge.start_purge(db, 1)
+        await asyncio.sleep(0.01)
+        await user_purge.stop_purge_jobs()
+        released = db.purgejob.job.status
+
+        # Restart: the new process resumes the job right away
+        db.gate.set()
+        resumed = await user_purge.resume_purge_jobs(db)
+        await asyncio.gather(*user_purge._tasks)
+        return released, resumed
+
+    released, resumed = asyncio.run(run())
+
+    assert released == "PENDING"
+    assert resumed == 1
+    assert db.purgejob.job.status == "DONE"
+    assert db.logs == 0